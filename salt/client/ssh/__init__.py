@@ -2,8 +2,10 @@
 Create ssh executor system
 """
 
+import asyncio
 import base64
 import binascii
+import concurrent.futures
 import copy
 import datetime
 import getpass
@@ -11,11 +13,13 @@ import hashlib
 import logging
 import multiprocessing
 import os
+import queue
 import re
 import subprocess
 import sys
 import tarfile
 import tempfile
+import threading
 import time
 import uuid
 
@@ -520,6 +524,12 @@ class SSH:
         """
         Run the routine in a "Thread", put a dict on the queue
         """
+        que.put(self._run_routine(opts, host, target, mine=mine))
+
+    def _run_routine(self, opts, host, target, mine=False):
+        """
+        Run a Single for the host and return a dict with its id and return
+        """
         opts = copy.deepcopy(opts)
         single = Single(
             opts,
@@ -531,9 +541,15 @@ class SSH:
             mine=mine,
             **target
         )
-        ret = {"id": single.id}
         stdout, stderr, retcode = single.run()
-        # This job is done, yield
+        return self._format_routine_ret(single.id, stdout, stderr, retcode)
+
+    @staticmethod
+    def _format_routine_ret(id_, stdout, stderr, retcode):
+        """
+        Build the return dict for a routine from the output of the ssh call
+        """
+        ret = {"id": id_}
         try:
             data = salt.utils.json.find_json(stdout)
             if len(data) < 2 and "local" in data:
@@ -550,13 +566,39 @@ class SSH:
                 "stderr": stderr,
                 "retcode": retcode,
             }
-        que.put(ret)
+        return ret
+
+    def _prep_target(self, host):
+        """
+        Apply the defaults to a target. If the target cannot be handled,
+        return the return data to report for it instead.
+        """
+        for default in self.defaults:
+            if default not in self.targets[host]:
+                self.targets[host][default] = self.defaults[default]
+        if "host" not in self.targets[host]:
+            self.targets[host]["host"] = host
+        if self.targets[host].get("winrm") and not HAS_WINSHELL:
+            log_msg = "Please contact sales@saltstack.com for access to the enterprise saltwinshell module."
+            log.debug(log_msg)
+            return {
+                "fun_args": [],
+                "jid": None,
+                "return": log_msg,
+                "retcode": 1,
+                "fun": "",
+                "id": host,
+            }
+        return None
 
     def handle_ssh(self, mine=False):
         """
         Spin up the needed threads or processes and execute the subsequent
         routines
         """
+        if self.opts.get("ssh_executor", "process") == "asyncio":
+            yield from self._handle_ssh_async(mine=mine)
+            return
         que = multiprocessing.Queue()
         running = {}
         target_iter = self.targets.__iter__()
@@ -573,24 +615,10 @@ class SSH:
                 except StopIteration:
                     init = True
                     continue
-                for default in self.defaults:
-                    if default not in self.targets[host]:
-                        self.targets[host][default] = self.defaults[default]
-                if "host" not in self.targets[host]:
-                    self.targets[host]["host"] = host
-                if self.targets[host].get("winrm") and not HAS_WINSHELL:
+                no_ret = self._prep_target(host)
+                if no_ret is not None:
                     returned.add(host)
                     rets.add(host)
-                    log_msg = "Please contact sales@saltstack.com for access to the enterprise saltwinshell module."
-                    log.debug(log_msg)
-                    no_ret = {
-                        "fun_args": [],
-                        "jid": None,
-                        "return": log_msg,
-                        "retcode": 1,
-                        "fun": "",
-                        "id": host,
-                    }
                     yield {host: no_ret}
                     continue
                 args = (
@@ -651,6 +679,138 @@ class SSH:
             ) >= len(running):
                 time.sleep(0.1)
 
+    def _handle_ssh_async(self, mine=False):
+        """
+        Drive the routines from an asyncio event loop running in a separate
+        thread, yielding the returns as they arrive.
+
+        Raw shell calls (``salt-ssh -r``) to targets which do not need
+        password authentication are run as non-blocking ``ssh`` subprocesses
+        directly on the event loop, so thousands of them can be in flight at
+        once (see :conf_master:`ssh_async_max_sessions`). All other routines
+        need to deploy the thin tarball and/or run wrapper functions, so they
+        are run on a pool of ``ssh_max_procs`` threads instead of forking a
+        process per target.
+        """
+        if not self.targets:
+            log.error("No matching targets found in roster.")
+            return
+        que = queue.Queue()
+        hosts = []
+        for host in self.targets:
+            no_ret = self._prep_target(host)
+            if no_ret is not None:
+                yield {host: no_ret}
+            else:
+                hosts.append(host)
+        if not hosts:
+            return
+
+        loop = asyncio.new_event_loop()
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.opts.get("ssh_max_procs", 25)
+        )
+
+        def _run_loop():
+            try:
+                asyncio.set_event_loop(loop)
+                loop.run_until_complete(
+                    self._async_routines(loop, executor, que, hosts, mine)
+                )
+            finally:
+                executor.shutdown(wait=True)
+                loop.close()
+                # Let the consumer know that all of the routines are done
+                que.put(None)
+
+        thread = threading.Thread(target=_run_loop, name="salt-ssh-asyncio")
+        thread.daemon = True
+        thread.start()
+        while True:
+            ret = que.get()
+            if ret is None:
+                break
+            yield {ret["id"]: ret["ret"]}
+        thread.join()
+
+    async def _async_routines(self, loop, executor, que, hosts, mine=False):
+        """
+        Run the routines for all of the hosts concurrently
+        """
+        semaphore = asyncio.Semaphore(self.opts.get("ssh_async_max_sessions", 1000))
+
+        async def _routine(host):
+            target = self.targets[host]
+            try:
+                async with semaphore:
+                    if (
+                        self.opts.get("raw_shell", False)
+                        and not mine
+                        and not target.get("passwd")
+                        and not target.get("priv_passwd")
+                        and not self.opts.get("ssh_pre_flight")
+                        and not target.get("ssh_pre_flight")
+                    ):
+                        ret = await self._async_raw_routine(host, target)
+                    else:
+                        ret = await loop.run_in_executor(
+                            executor, self._run_routine, self.opts, host, target, mine
+                        )
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error(
+                    "Error running routine for target '%s': %s",
+                    host,
+                    exc,
+                    exc_info=True,
+                )
+                ret = {
+                    "id": host,
+                    "ret": (
+                        "Target '{}' did not return any data, "
+                        "probably due to an error."
+                    ).format(host),
+                }
+            que.put(ret)
+
+        await asyncio.gather(*[_routine(host) for host in hosts])
+
+    async def _async_raw_routine(self, host, target):
+        """
+        Execute a raw shell command on a host using a non-blocking ssh
+        subprocess
+        """
+        # Single sets the thin_dir in the opts, a shallow copy is enough to
+        # keep that from leaking between targets.
+        opts = copy.copy(self.opts)
+        single = Single(
+            opts,
+            opts["argv"],
+            host,
+            mods=self.mods,
+            fsclient=self.fsclient,
+            thin=self.thin,
+            **target
+        )
+        cmd_str = " ".join([single._escape_arg(arg) for arg in single.argv])
+        cmd = single.shell._cmd_str(cmd_str)
+        log.debug("Executing non-blocking command: %s", cmd)
+        # Unlike Shell._run_cmd() nothing answers host key, passphrase or
+        # password prompts here. BatchMode makes ssh fail instead of prompting,
+        # and a new session keeps it from falling back to the controlling tty.
+        argv = single.shell._split_cmd(cmd)
+        argv[1:1] = ["-o", "BatchMode=yes"]
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+        stdout, stderr = await proc.communicate()
+        stdout = salt.utils.stringutils.to_unicode(stdout)
+        stderr = salt.utils.stringutils.to_unicode(stderr)
+        return self._format_routine_ret(single.id, stdout, stderr, proc.returncode)
+
     def run_iter(self, mine=False, jid=None):
         """
         Execute and yield returns as they come in, do not print to the display
@@ -53,6 +53,9 @@ class SSHClient:
             ("ssh_remote_port_forwards", str),
             ("ssh_options", list),
             ("ssh_max_procs", int),
+            ("ssh_executor", str),
+            ("ssh_async_max_sessions", int),
+            ("ssh_control_persist", str),
             ("ssh_askpass", bool),
             ("ssh_key_deploy", bool),
             ("ssh_update_roster", bool),
@@ -85,8 +88,13 @@ class SSHClient:
         for name, kind in roster_vals:
             if name not in kwargs:
                 continue
+            val = kwargs[name]
+            if name == "ssh_control_persist" and isinstance(val, (bool, int)):
+                # ControlPersist takes yes/no or a time, casting a bool to
+                # str would give "True" or "False"
+                val = "yes" if val is True else "no" if not val else val
             try:
-                val = kind(kwargs[name])
+                val = kind(val)
             except ValueError:
                 log.warning("Unable to cast kwarg %s", name)
                 continue
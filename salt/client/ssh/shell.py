@@ -2,6 +2,7 @@
 Manage transport commands via ssh
 """
 
+import hashlib
 import logging
 import os
 import re
@@ -147,9 +148,9 @@ class Shell:
         """
         Return options to pass to ssh
         """
-        # TODO ControlMaster does not work without ControlPath
-        # user could take advantage of it if they set ControlPath in their
-        # ssh config.  Also, ControlPersist not widely available.
+        # ControlMaster does not work without ControlPath, which is only set
+        # when ssh_control_persist is enabled (see _control_opts()), unless
+        # the user has set ControlPath in their ssh config.
         options = [
             "ControlMaster=auto",
             "StrictHostKeyChecking=no",
@@ -189,6 +190,61 @@ class Shell:
     def _ssh_opts(self):
         return " ".join(["-o {}".format(opt) for opt in self.ssh_options])
 
+    def _control_path(self):
+        """
+        Return the path of the ControlMaster socket for this host. The name is
+        a hash of the connection details, which keeps it well under the
+        maximum length of a unix socket path.
+
+        Returns None if the directory for the sockets is not owned by the
+        current user or can be accessed by other users, anyone who can reach
+        a socket can use the connection behind it.
+        """
+        control_dir = self.opts.get("ssh_control_path_dir") or os.path.join(
+            self.opts["cachedir"], "ssh_control"
+        )
+        if not os.path.isdir(control_dir):
+            os.makedirs(control_dir, 0o700)
+        dir_stat = os.stat(control_dir)
+        if dir_stat.st_uid != os.getuid() or dir_stat.st_mode & 0o077:
+            log.error(
+                "Not reusing ssh connections, %s must be owned by the current "
+                "user and not be accessible by other users",
+                control_dir,
+            )
+            return None
+        conn_id = "{}@{}:{}".format(self.user, self.host, self.port)
+        return os.path.join(
+            control_dir, hashlib.sha256(conn_id.encode("utf-8")).hexdigest()[:24]
+        )
+
+    def _control_opts(self):
+        """
+        Return the options to reuse a single connection to the host for all
+        ssh/scp calls, and to keep it open for subsequent salt-ssh runs.
+        """
+        persist = self.opts.get("ssh_control_persist")
+        if isinstance(persist, str) and persist.strip().lower() in (
+            "false",
+            "no",
+            "off",
+            "0",
+        ):
+            persist = False
+        if not persist:
+            return ""
+        if persist is True or str(persist).strip().lower() == "true":
+            persist = "yes"
+        control_path = self._control_path()
+        if control_path is None:
+            return ""
+        options = [
+            "ControlMaster=auto",
+            "ControlPath={}".format(control_path),
+            "ControlPersist={}".format(persist),
+        ]
+        return " ".join(["-o {}".format(option) for option in options])
+
     def _copy_id_str_old(self):
         """
         Return the string to execute ssh-copy-id
@@ -250,6 +306,9 @@ class Shell:
             command.append("-t -t")
         if self.passwd or self.priv:
             command.append(self.priv and self._key_opts() or self._passwd_opts())
+        control_opts = self._control_opts()
+        if control_opts:
+            command.append(control_opts)
         if ssh != "scp" and self.remote_port_forwards:
             command.append(
                 " ".join(
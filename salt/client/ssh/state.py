@@ -5,6 +5,7 @@ Create ssh executor system
 from __future__ import absolute_import, print_function
 
 # Import python libs
+import gzip
 import logging
 import os
 import shutil
@@ -175,6 +176,16 @@ def salt_refs(data, ret=None):
     return ret
 
 
+def _normalize_tarinfo(tarinfo):
+    """
+    Strip the ownership and timestamp from a member of the state tarball
+    """
+    tarinfo.mtime = 0
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    return tarinfo
+
+
 def prep_trans_tar(
     file_client, chunks, file_refs, pillar=None, id_=None, roster_grains=None
 ):
@@ -256,11 +267,20 @@ def prep_trans_tar(
     except OSError:
         cwd = None
     os.chdir(gendir)
-    with closing(tarfile.open(trans_tar, "w:gz")) as tfp:
-        for root, dirs, files in salt.utils.path.os_walk(gendir):
-            for name in files:
-                full = os.path.join(root, name)
-                tfp.add(full[len(gendir) :].lstrip(os.sep))
+    names = []
+    for root, dirs, files in salt.utils.path.os_walk(gendir):
+        for name in files:
+            full = os.path.join(root, name)
+            names.append(full[len(gendir) :].lstrip(os.sep))
+    # Fix the order of the members, their ownership and timestamps, and the
+    # gzip header, so that the hash of the tarball only changes when its
+    # contents do. This allows targets to cache the tarball.
+    with salt.utils.files.fopen(trans_tar, "wb") as fp_:
+        with closing(
+            gzip.GzipFile(filename="", mode="wb", fileobj=fp_, mtime=0)
+        ) as gzfp, closing(tarfile.open(fileobj=gzfp, mode="w")) as tfp:
+            for name in sorted(names):
+                tfp.add(name, filter=_normalize_tarinfo)
     if cwd:
         os.chdir(cwd)
     shutil.rmtree(gendir)
@@ -28,6 +28,50 @@ __func_alias__ = {"apply_": "apply"}
 log = logging.getLogger(__name__)
 
 
+def _trans_tar_path(opts, trans_tar_sum):
+    """
+    Return the path on the target to send the state tarball to. When
+    ``ssh_state_tarball_cache`` is enabled the path includes the hash of the
+    tarball, so that an identical tarball from a previous run can be reused.
+    """
+    if opts.get("ssh_state_tarball_cache"):
+        return "{}/salt_state_{}.tgz".format(opts["thin_dir"], trans_tar_sum)
+    return "{}/salt_state.tgz".format(opts["thin_dir"])
+
+
+def _send_trans_tar(single, trans_tar, trans_tar_path, opts):
+    """
+    Send the state tarball to the target, unless it is cached there already
+    """
+    if opts.get("ssh_state_tarball_cache"):
+        # Remove the tarballs from previous runs if this one is not among
+        # them, so that only the most recent one is kept on the target.
+        _, _, retcode = single.shell.exec_cmd(
+            "test -f {0} || {{ rm -f {1}/salt_state_*.tgz; exit 1; }}".format(
+                trans_tar_path, opts["thin_dir"]
+            )
+        )
+        if retcode == 0:
+            log.debug(
+                "State tarball %s is already present on the target, not sending it",
+                trans_tar_path,
+            )
+            return
+        # Send to a temporary name and move it into place, an interrupted
+        # transfer must not leave a truncated tarball under the cached name.
+        tmp_path = "{}.part.tgz".format(trans_tar_path[: -len(".tgz")])
+        single.shell.send(trans_tar, tmp_path)
+        _, stderr, retcode = single.shell.exec_cmd(
+            "mv -f {} {}".format(tmp_path, trans_tar_path)
+        )
+        if retcode != 0:
+            log.error(
+                "Unable to move state tarball into place on the target: %s", stderr
+            )
+        return
+    single.shell.send(trans_tar, trans_tar_path)
+
+
 def _ssh_state(chunks, st_kwargs, kwargs, test=False):
     """
     Function to run a state with the given chunk via salt-ssh
@@ -47,8 +91,9 @@ def _ssh_state(chunks, st_kwargs, kwargs, test=False):
         st_kwargs["id_"],
     )
     trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, __opts__["hash_type"])
-    cmd = "state.pkg {}/salt_state.tgz test={} pkg_sum={} hash_type={}".format(
-        __opts__["thin_dir"], test, trans_tar_sum, __opts__["hash_type"]
+    trans_tar_path = _trans_tar_path(__opts__, trans_tar_sum)
+    cmd = "state.pkg {} test={} pkg_sum={} hash_type={}".format(
+        trans_tar_path, test, trans_tar_sum, __opts__["hash_type"]
     )
     single = salt.client.ssh.Single(
         __opts__,
@@ -57,7 +102,7 @@ def _ssh_state(chunks, st_kwargs, kwargs, test=False):
         minion_opts=__salt__.minion_opts,
         **st_kwargs
     )
-    single.shell.send(trans_tar, "{}/salt_state.tgz".format(__opts__["thin_dir"]))
+    _send_trans_tar(single, trans_tar, trans_tar_path, __opts__)
     stdout, stderr, _ = single.cmd_block()
 
     # Clean up our tar
@@ -224,8 +269,9 @@ def sls(mods, saltenv="base", test=None, exclude=None, **kwargs):
         roster_grains,
     )
     trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts["hash_type"])
-    cmd = "state.pkg {}/salt_state.tgz test={} pkg_sum={} hash_type={}".format(
-        opts["thin_dir"], test, trans_tar_sum, opts["hash_type"]
+    trans_tar_path = _trans_tar_path(opts, trans_tar_sum)
+    cmd = "state.pkg {} test={} pkg_sum={} hash_type={}".format(
+        trans_tar_path, test, trans_tar_sum, opts["hash_type"]
     )
     single = salt.client.ssh.Single(
         opts,
@@ -234,7 +280,7 @@ def sls(mods, saltenv="base", test=None, exclude=None, **kwargs):
         minion_opts=__salt__.minion_opts,
         **st_kwargs
     )
-    single.shell.send(trans_tar, "{}/salt_state.tgz".format(opts["thin_dir"]))
+    _send_trans_tar(single, trans_tar, trans_tar_path, opts)
     stdout, stderr, _ = single.cmd_block()
 
     # Clean up our tar
@@ -366,8 +412,9 @@ def low(data, **kwargs):
         roster_grains,
     )
     trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, __opts__["hash_type"])
-    cmd = "state.pkg {}/salt_state.tgz pkg_sum={} hash_type={}".format(
-        __opts__["thin_dir"], trans_tar_sum, __opts__["hash_type"]
+    trans_tar_path = _trans_tar_path(__opts__, trans_tar_sum)
+    cmd = "state.pkg {} pkg_sum={} hash_type={}".format(
+        trans_tar_path, trans_tar_sum, __opts__["hash_type"]
     )
     single = salt.client.ssh.Single(
         __opts__,
@@ -376,7 +423,7 @@ def low(data, **kwargs):
         minion_opts=__salt__.minion_opts,
         **st_kwargs
     )
-    single.shell.send(trans_tar, "{}/salt_state.tgz".format(__opts__["thin_dir"]))
+    _send_trans_tar(single, trans_tar, trans_tar_path, __opts__)
     stdout, stderr, _ = single.cmd_block()
 
     # Clean up our tar
@@ -452,8 +499,9 @@ def high(data, **kwargs):
         roster_grains,
     )
     trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts["hash_type"])
-    cmd = "state.pkg {}/salt_state.tgz pkg_sum={} hash_type={}".format(
-        opts["thin_dir"], trans_tar_sum, opts["hash_type"]
+    trans_tar_path = _trans_tar_path(opts, trans_tar_sum)
+    cmd = "state.pkg {} pkg_sum={} hash_type={}".format(
+        trans_tar_path, trans_tar_sum, opts["hash_type"]
     )
     single = salt.client.ssh.Single(
         opts,
@@ -462,7 +510,7 @@ def high(data, **kwargs):
         minion_opts=__salt__.minion_opts,
         **st_kwargs
     )
-    single.shell.send(trans_tar, "{}/salt_state.tgz".format(opts["thin_dir"]))
+    _send_trans_tar(single, trans_tar, trans_tar_path, opts)
     stdout, stderr, _ = single.cmd_block()
 
     # Clean up our tar
@@ -693,8 +741,9 @@ def highstate(test=None, **kwargs):
         roster_grains,
     )
     trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts["hash_type"])
-    cmd = "state.pkg {}/salt_state.tgz test={} pkg_sum={} hash_type={}".format(
-        opts["thin_dir"], test, trans_tar_sum, opts["hash_type"]
+    trans_tar_path = _trans_tar_path(opts, trans_tar_sum)
+    cmd = "state.pkg {} test={} pkg_sum={} hash_type={}".format(
+        trans_tar_path, test, trans_tar_sum, opts["hash_type"]
     )
     single = salt.client.ssh.Single(
         opts,
@@ -703,7 +752,7 @@ def highstate(test=None, **kwargs):
         minion_opts=__salt__.minion_opts,
         **st_kwargs
     )
-    single.shell.send(trans_tar, "{}/salt_state.tgz".format(opts["thin_dir"]))
+    _send_trans_tar(single, trans_tar, trans_tar_path, opts)
     stdout, stderr, _ = single.cmd_block()
 
     # Clean up our tar
@@ -770,8 +819,9 @@ def top(topfn, test=None, **kwargs):
         roster_grains,
     )
     trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts["hash_type"])
-    cmd = "state.pkg {}/salt_state.tgz test={} pkg_sum={} hash_type={}".format(
-        opts["thin_dir"], test, trans_tar_sum, opts["hash_type"]
+    trans_tar_path = _trans_tar_path(opts, trans_tar_sum)
+    cmd = "state.pkg {} test={} pkg_sum={} hash_type={}".format(
+        trans_tar_path, test, trans_tar_sum, opts["hash_type"]
     )
     single = salt.client.ssh.Single(
         opts,
@@ -780,7 +830,7 @@ def top(topfn, test=None, **kwargs):
         minion_opts=__salt__.minion_opts,
         **st_kwargs
     )
-    single.shell.send(trans_tar, "{}/salt_state.tgz".format(opts["thin_dir"]))
+    _send_trans_tar(single, trans_tar, trans_tar_path, opts)
     stdout, stderr, _ = single.cmd_block()
 
     # Clean up our tar
@@ -1112,10 +1162,11 @@ def single(fun, name, test=None, **kwargs):
 
     # Create a hash so we can verify the tar on the target system
     trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts["hash_type"])
+    trans_tar_path = _trans_tar_path(opts, trans_tar_sum)
 
     # We use state.pkg to execute the "state package"
-    cmd = "state.pkg {}/salt_state.tgz test={} pkg_sum={} hash_type={}".format(
-        opts["thin_dir"], test, trans_tar_sum, opts["hash_type"]
+    cmd = "state.pkg {} test={} pkg_sum={} hash_type={}".format(
+        trans_tar_path, test, trans_tar_sum, opts["hash_type"]
     )
 
     # Create a salt-ssh Single object to actually do the ssh work
@@ -1128,7 +1179,7 @@ def single(fun, name, test=None, **kwargs):
     )
 
     # Copy the tar down
-    single.shell.send(trans_tar, "{}/salt_state.tgz".format(opts["thin_dir"]))
+    _send_trans_tar(single, trans_tar, trans_tar_path, opts)
 
     # Run the state.pkg command on the target
     stdout, stderr, _ = single.cmd_block()
@@ -292,6 +292,10 @@ VALID_OPTS = immutabletypes.freeze(
         "multiprocessing": bool,
         # Maximum number of concurrently active processes at any given point in time
         "process_count_max": int,
+        # Number of pre-forked processes which run the minion's jobs, 0 disables the pool
+        "job_worker_pool_size": int,
+        # Number of jobs after which a pooled job worker is replaced, 0 for no limit
+        "job_worker_max_jobs": int,
         # Whether or not the salt minion should run scheduled mine updates
         "mine_enabled": bool,
         # Whether or not scheduled mine updates should be accompanied by a job return for the job cache
@@ -482,6 +486,8 @@ VALID_OPTS = immutabletypes.freeze(
         # The number of MWorker processes for a master to startup. This number needs to scale up as
         # the number of connected minions increases.
         "worker_threads": int,
+        # Pools of MWorkers serving selected request commands
+        "mworker_pools": dict,
         # The port for the master to listen to returns on. The minion needs to connect to this port
         # to send returns.
         "ret_port": int,
@@ -529,6 +535,9 @@ VALID_OPTS = immutabletypes.freeze(
         "minionfs_update_interval": int,
         "s3fs_update_interval": int,
         "svnfs_update_interval": int,
+        # Number of remotes to fetch concurrently
+        "gitfs_fetch_workers": int,
+        "git_pillar_fetch_workers": int,
         # NOTE: git_pillar_base, git_pillar_fallback, git_pillar_branch,
         # git_pillar_env, and git_pillar_root omitted here because their values
         # could conceivably be loaded as non-string types, which is OK because
@@ -583,6 +592,12 @@ VALID_OPTS = immutabletypes.freeze(
         "minionfs_blacklist": list,
         # Specify a list of external pillar systems to use
         "ext_pillar": list,
+        # The number of threads running the ext_pillars of a pillar compilation
+        "ext_pillar_parallel_workers": int,
+        # The ext_pillars which read the data of the ext_pillars before them
+        "ext_pillar_serial": list,
+        # The TTL and cache key of the ext_pillars whose data is cached
+        "ext_pillar_cache": dict,
         # Reserved for future use to version the pillar structure
         "pillar_version": int,
         # Whether or not a copy of the master opts dict should be rendered into minion pillars
@@ -593,12 +608,19 @@ VALID_OPTS = immutabletypes.freeze(
         "pillar_cache_ttl": int,
         # Pillar cache backend. Defaults to `disk` which stores caches in the master cache
         "pillar_cache_backend": str,
+        # Share the rendered pillar SLS files between minions whose renders read
+        # the same values
+        "pillar_render_cache": bool,
+        # The number of pillar SLS renders kept by each master worker
+        "pillar_render_cache_size": int,
         # Cache the GPG data to avoid having to pass through the gpg renderer
         "gpg_cache": bool,
         # GPG data cache TTL, in seconds. Has no effect unless `gpg_cache` is True
         "gpg_cache_ttl": int,
         # GPG data cache backend. Defaults to `disk` which stores caches in the master cache
         "gpg_cache_backend": str,
+        # The number of gpg processes run at a time by the gpg renderer
+        "gpg_decrypt_workers": int,
         "pillar_safe_render_error": bool,
         # When creating a pillar, there are several strategies to choose from when
         # encountering duplicate values
@@ -693,6 +715,10 @@ VALID_OPTS = immutabletypes.freeze(
         "reactor_worker_threads": int,
         # The queue size for workers in the reactor
         "reactor_worker_hwm": int,
+        # The number of threads which run scheduled jobs with run_mode thread
+        "schedule_worker_threads": int,
+        # The queue size for the threads which run scheduled jobs
+        "schedule_worker_hwm": int,
         # Defines engines. See https://docs.saltstack.com/en/latest/topics/engines/
         "engines": list,
         # Whether or not to store runner returns in the job cache
@@ -745,6 +771,12 @@ VALID_OPTS = immutabletypes.freeze(
         "grains_blacklist": list,
         # The number of minutes between the minion refreshing its cache of grains
         "grains_refresh_every": int,
+        # Seconds for which the results of grains functions matching the globs are reused
+        "grains_func_ttl": dict,
+        # Number of threads which run grains functions concurrently
+        "grains_parallel_workers": int,
+        # Seconds to wait for a grains function run by one of these threads
+        "grains_func_timeout": (int, float),
         # Use lspci to gather system data for grains on a minion
         "enable_lspci": bool,
         # The number of seconds for the salt client to wait for additional syndics to
@@ -759,6 +791,8 @@ VALID_OPTS = immutabletypes.freeze(
         "jinja_lstrip_blocks": bool,
         # If this is set to True the first newline after a Jinja block is removed
         "jinja_trim_blocks": bool,
+        # Cache the compiled Jinja templates in the cachedir
+        "jinja_bytecode_cache": bool,
         # Cache minion ID to file
         "minion_id_caching": bool,
         # Always generate minion id in lowercase.
@@ -771,6 +805,10 @@ VALID_OPTS = immutabletypes.freeze(
         "keysize": int,
         # The transport system for this daemon. (i.e. zeromq, tcp, detect, etc)
         "transport": str,
+        # Compression algorithms to negotiate for transport payloads, in order of preference
+        "transport_compression": list,
+        # Only compress transport payloads larger than this many bytes
+        "transport_compression_threshold": int,
         # The number of seconds to wait when the client is requesting information about running jobs
         "gather_job_timeout": int,
         # The number of seconds to wait before timing out an authentication request
@@ -795,6 +833,12 @@ VALID_OPTS = immutabletypes.freeze(
         "syndic_event_forward_timeout": float,
         # The length that the syndic event queue must hit before events are popped off and forwarded
         "syndic_jid_forward_cache_hwm": int,
+        # The maximum number of minion returns a syndic forwards to its master in one message
+        "syndic_forward_batch_size": int,
+        # The approximate maximum size in bytes of the returns a syndic forwards in one message
+        "syndic_forward_max_bytes": int,
+        # Compress the returns a syndic forwards to its master
+        "syndic_forward_compress": bool,
         # Salt SSH configuration
         "ssh_passwd": str,
         "ssh_port": str,
@@ -809,6 +853,15 @@ VALID_OPTS = immutabletypes.freeze(
         "ssh_config_file": str,
         "ssh_merge_pillar": bool,
         "ssh_run_pre_flight": bool,
+        # How salt-ssh runs the routines for each target, "process" or "asyncio"
+        "ssh_executor": str,
+        # Max number of concurrent raw ssh sessions with the asyncio executor
+        "ssh_async_max_sessions": int,
+        # Keep ssh connections to targets open with ControlPersist
+        "ssh_control_persist": (bool, int, str),
+        "ssh_control_path_dir": (type(None), str),
+        # Cache state tarballs on salt-ssh targets by their checksum
+        "ssh_state_tarball_cache": bool,
         "cluster_mode": bool,
         "sqlite_queue_dir": str,
         "queue_dirs": list,
@@ -876,6 +929,10 @@ VALID_OPTS = immutabletypes.freeze(
         "memcache_full_cleanup": bool,
         # Enable collecting the memcache stats and log it on `debug` log level.
         "memcache_debug": bool,
+        # The number of idle connections kept by each pool of SQL connections
+        "sql_pool_size": int,
+        # The seconds an idle SQL connection is kept in its pool
+        "sql_pool_max_idle": int,
         # Thin and minimal Salt extra modules
         "thin_extra_mods": str,
         "min_extra_mods": str,
@@ -989,12 +1046,16 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "grains_blacklist": [],
         "grains_cache": False,
         "grains_cache_expiration": 300,
+        "grains_func_ttl": {},
+        "grains_parallel_workers": 1,
+        "grains_func_timeout": 0,
         "grains_deep_merge": False,
         "conf_file": os.path.join(salt.syspaths.CONFIG_DIR, "minion"),
         "sock_dir": os.path.join(salt.syspaths.SOCK_DIR, "minion"),
         "sock_pool_size": 1,
         "backup_mode": "",
         "renderer": "jinja|yaml",
+        "jinja_bytecode_cache": True,
         "renderer_whitelist": [],
         "renderer_blacklist": [],
         "random_startup_delay": 0,
@@ -1017,6 +1078,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "gpg_cache": False,
         "gpg_cache_ttl": 86400,
         "gpg_cache_backend": "disk",
+        "gpg_decrypt_workers": 1,
         "extension_modules": os.path.join(salt.syspaths.CACHE_DIR, "minion", "extmods"),
         "state_top": "top.sls",
         "state_top_saltenv": None,
@@ -1062,6 +1124,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "minionfs_update_interval": DEFAULT_INTERVAL,
         "s3fs_update_interval": DEFAULT_INTERVAL,
         "svnfs_update_interval": DEFAULT_INTERVAL,
+        "gitfs_fetch_workers": 1,
+        "git_pillar_fetch_workers": 1,
         "git_pillar_base": "master",
         "git_pillar_branch": "master",
         "git_pillar_env": "",
@@ -1118,6 +1182,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "autosign_timeout": 120,
         "multiprocessing": True,
         "process_count_max": -1,
+        "job_worker_pool_size": 0,
+        "job_worker_max_jobs": 100,
         "mine_enabled": True,
         "mine_return_job": False,
         "mine_interval": 60,
@@ -1202,6 +1268,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "reactor_refresh_interval": 60,
         "reactor_worker_threads": 10,
         "reactor_worker_hwm": 10000,
+        "schedule_worker_threads": 4,
+        "schedule_worker_hwm": 100,
         "engines": [],
         "tcp_keepalive": True,
         "tcp_keepalive_idle": 300,
@@ -1214,6 +1282,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "minion_id_remove_domain": False,
         "keysize": 2048,
         "transport": "zeromq",
+        "transport_compression": ["zstd", "lz4", "zlib"],
+        "transport_compression_threshold": 32768,
         "auth_timeout": 5,
         "auth_tries": 7,
         "master_tries": _MASTER_TRIES,
@@ -1246,6 +1316,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "beacons_before_connect": False,
         "scheduler_before_connect": False,
         "cache": "localfs",
+        "sql_pool_size": 5,
+        "sql_pool_max_idle": 300,
         "salt_cp_chunk_size": 65536,
         "extmod_whitelist": {},
         "extmod_blacklist": {},
@@ -1268,6 +1340,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "auth_mode": 1,
         "user": _MASTER_USER,
         "worker_threads": 5,
+        "mworker_pools": {},
         "sock_dir": os.path.join(salt.syspaths.SOCK_DIR, "master"),
         "sock_pool_size": 1,
         "ret_port": 4506,
@@ -1311,6 +1384,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "minionfs_update_interval": DEFAULT_INTERVAL,
         "s3fs_update_interval": DEFAULT_INTERVAL,
         "svnfs_update_interval": DEFAULT_INTERVAL,
+        "gitfs_fetch_workers": 1,
+        "git_pillar_fetch_workers": 1,
         "git_pillar_base": "master",
         "git_pillar_branch": "master",
         "git_pillar_env": "",
@@ -1372,6 +1447,9 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "minionfs_whitelist": [],
         "minionfs_blacklist": [],
         "ext_pillar": [],
+        "ext_pillar_parallel_workers": 1,
+        "ext_pillar_serial": [],
+        "ext_pillar_cache": {},
         "pillar_version": 2,
         "pillar_opts": False,
         "pillar_safe_render_error": True,
@@ -1381,9 +1459,12 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "pillar_cache": False,
         "pillar_cache_ttl": 3600,
         "pillar_cache_backend": "disk",
+        "pillar_render_cache": False,
+        "pillar_render_cache_size": 1000,
         "gpg_cache": False,
         "gpg_cache_ttl": 86400,
         "gpg_cache_backend": "disk",
+        "gpg_decrypt_workers": 1,
         "ping_on_rotate": False,
         "peer": {},
         "preserve_minion_cache": False,
@@ -1474,6 +1555,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "reactor_refresh_interval": 60,
         "reactor_worker_threads": 10,
         "reactor_worker_hwm": 10000,
+        "schedule_worker_threads": 4,
+        "schedule_worker_hwm": 100,
         "engines": [],
         "event_return": "",
         "event_return_queue": 0,
@@ -1526,6 +1609,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "jinja_sls_env": {},
         "jinja_lstrip_blocks": False,
         "jinja_trim_blocks": False,
+        "jinja_bytecode_cache": True,
         "tcp_keepalive": True,
         "tcp_keepalive_idle": 300,
         "tcp_keepalive_cnt": -1,
@@ -1533,9 +1617,14 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "sign_pub_messages": True,
         "keysize": 2048,
         "transport": "zeromq",
+        "transport_compression": [],
+        "transport_compression_threshold": 32768,
         "gather_job_timeout": 10,
         "syndic_event_forward_timeout": 0.5,
         "syndic_jid_forward_cache_hwm": 100,
+        "syndic_forward_batch_size": 1000,
+        "syndic_forward_max_bytes": 10485760,
+        "syndic_forward_compress": False,
         "regen_thin": False,
         "ssh_passwd": "",
         "ssh_priv_passwd": "",
@@ -1549,6 +1638,11 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "ssh_identities_only": False,
         "ssh_log_file": os.path.join(salt.syspaths.LOGS_DIR, "ssh"),
         "ssh_config_file": os.path.join(salt.syspaths.HOME_DIR, ".ssh", "config"),
+        "ssh_executor": "process",
+        "ssh_async_max_sessions": 1000,
+        "ssh_control_persist": False,
+        "ssh_control_path_dir": None,
+        "ssh_state_tarball_cache": False,
         "cluster_mode": False,
         "sqlite_queue_dir": os.path.join(salt.syspaths.CACHE_DIR, "master", "queues"),
         "queue_dirs": [],
@@ -1574,6 +1668,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "memcache_max_items": 1024,
         "memcache_full_cleanup": False,
         "memcache_debug": False,
+        "sql_pool_size": 5,
+        "sql_pool_max_idle": 300,
         "thin_extra_mods": "",
         "min_extra_mods": "",
         "ssl": None,
@@ -24,6 +24,7 @@ import salt.ext.tornado.gen
 import salt.payload
 import salt.transport.client
 import salt.transport.frame
+import salt.utils.compression
 import salt.utils.crypt
 import salt.utils.decorators
 import salt.utils.event
@@ -837,6 +838,8 @@ class AsyncAuth:
                 ):
                     self._finger_fail(self.opts["master_finger"], m_pub_fn)
         auth["publish_port"] = payload["publish_port"]
+        auth["compression"] = payload.get("compression", [])
+        auth["syndic_return_gz"] = payload.get("syndic_return_gz", False)
         raise salt.ext.tornado.gen.Return(auth)
 
     def get_keys(self):
@@ -885,6 +888,9 @@ class AsyncAuth:
         payload = {}
         payload["cmd"] = "_auth"
         payload["id"] = self.opts["id"]
+        compression = salt.utils.compression.enabled(self.opts)
+        if compression:
+            payload["compression"] = compression
         if "autosign_grains" in self.opts:
             autosign_grains = {}
             for grain in self.opts["autosign_grains"]:
@@ -1442,6 +1448,8 @@ class SAuth(AsyncAuth):
                 ):
                     self._finger_fail(self.opts["master_finger"], m_pub_fn)
         auth["publish_port"] = payload["publish_port"]
+        auth["compression"] = payload.get("compression", [])
+        auth["syndic_return_gz"] = payload.get("syndic_return_gz", False)
         return auth
 
 
@@ -1531,11 +1539,23 @@ class Crypticle:
             data = cypher.decrypt(data)
         return data[: -data[-1]]
 
-    def dumps(self, obj):
+    def dumps(self, obj, compression=None, threshold=0):
         """
         Serialize and encrypt a python object
+
+        The serialized object is compressed with the ``compression`` algorithm
+        when it is larger than ``threshold`` bytes. Only pass an algorithm the
+        receiving side has agreed to, see :py:mod:`salt.utils.compression`.
         """
-        return self.encrypt(self.PICKLE_PAD + self.serial.dumps(obj))
+        return self.dumps_serialized(self.serial.dumps(obj), compression, threshold)
+
+    def dumps_serialized(self, data, compression=None, threshold=0):
+        """
+        Encrypt an already serialized python object, see :py:meth:`dumps`
+        """
+        if compression and len(data) > threshold:
+            return self.encrypt(salt.utils.compression.pack(data, compression))
+        return self.encrypt(self.PICKLE_PAD + data)
 
     def loads(self, data, raw=False):
         """
@@ -1543,7 +1563,11 @@ class Crypticle:
         """
         data = self.decrypt(data)
         # simple integrity check to verify that we got meaningful data
-        if not data.startswith(self.PICKLE_PAD):
-            return {}
-        load = self.serial.loads(data[len(self.PICKLE_PAD) :], raw=raw)
+        if data.startswith(self.PICKLE_PAD):
+            data = data[len(self.PICKLE_PAD) :]
+        else:
+            data = salt.utils.compression.unpack(data)
+            if data is None:
+                return {}
+        load = self.serial.loads(data, raw=raw)
         return load
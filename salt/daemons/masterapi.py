@@ -749,6 +749,8 @@ class RemoteFuncs:
             self.mminion.functions,
             pillar_override=load.get("pillar_override", {}),
         )
+        if load.get("profile"):
+            return pillar.profile_pillar()
         data = pillar.compile_pillar()
         if self.opts.get("minion_data_cache", False):
             self.cache.store(
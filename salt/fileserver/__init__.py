@@ -498,6 +498,19 @@ class Fileserver:
                 ret[fsb] = self.servers[fstr]()
         return ret
 
+    def fetch_durations(self, back=None):
+        """
+        Return the durations of the most recent fetch of each remote for all
+        of the enabled fileserver backends which record them.
+        """
+        back = self.backends(back)
+        ret = {}
+        for fsb in back:
+            fstr = "{}.fetch_durations".format(fsb)
+            if fstr in self.servers:
+                ret[fsb] = self.servers[fstr]()
+        return ret
+
     def envs(self, back=None, sources=False):
         """
         Return the environments for the named backend or all backends
@@ -150,6 +150,13 @@ def update_intervals():
     return _gitfs().update_intervals()
 
 
+def fetch_durations():
+    """
+    Return the durations of the most recent fetch of each remote
+    """
+    return _gitfs(init_remotes=False).read_fetch_durations()
+
+
 def envs(ignore_cache=False):
     """
     Return a list of refs that can be used as environments
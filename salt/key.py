@@ -17,6 +17,7 @@ import salt.daemons.masterapi
 import salt.exceptions
 import salt.minion
 import salt.utils.args
+import salt.utils.compression
 import salt.utils.crypt
 import salt.utils.data
 import salt.utils.event
@@ -469,6 +470,9 @@ class Key:
                 for minion in clist:
                     if minion not in minions and minion not in preserve_minions:
                         cache.flush("{}/{}".format(self.ACC, minion))
+            for minion in cache.list(salt.utils.compression.MINIONS_BANK) or []:
+                if minion not in minions and minion not in preserve_minions:
+                    salt.utils.compression.forget_minion(cache, minion)
 
     def check_master(self):
         """
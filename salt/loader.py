@@ -4,8 +4,10 @@ directories for python loadable code and organizes the code into the
 plugin interfaces used by Salt.
 """
 
+import concurrent.futures
 import contextvars
 import copy
+import fnmatch
 import functools
 import importlib
 import importlib.machinery  # pylint: disable=no-name-in-module,import-error
@@ -13,6 +15,7 @@ import importlib.util  # pylint: disable=no-name-in-module,import-error
 import inspect
 import logging
 import os
+import queue
 import re
 import sys
 import tempfile
@@ -30,11 +33,14 @@ import salt.defaults.exitcodes
 import salt.loader_context
 import salt.syspaths
 import salt.utils.args
+import salt.utils.atomicfile
 import salt.utils.context
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.event
 import salt.utils.files
+import salt.utils.hashutils
+import salt.utils.json
 import salt.utils.lazy
 import salt.utils.odict
 import salt.utils.platform
@@ -809,7 +815,269 @@ def _load_cached_grains(opts, cfn):
         return None
 
 
-def grains(opts, force_refresh=False, proxy=None, context=None):
+def _grains_func_ttl(opts, key):
+    """
+    Return how many seconds the result of the grains function ``key`` may be
+    reused for, as configured in ``grains_func_ttl``
+    """
+    for pattern, ttl in opts.get("grains_func_ttl", {}).items():
+        if fnmatch.fnmatch(key, pattern):
+            return ttl
+    return 0
+
+
+def _grains_checksum(grains_data):
+    """
+    Return a checksum of the grains passed to a grains function
+    """
+    return salt.utils.hashutils.sha256_digest(
+        salt.utils.json.dumps(grains_data, sort_keys=True, default=str)
+    )
+
+
+def _read_grains_func_cache(opts):
+    """
+    Return the results and execution times of the grains functions which were
+    saved by the last grains refresh
+    """
+    cfn = os.path.join(opts["cachedir"], "grains.funcs.p")
+    if not os.path.isfile(cfn):
+        return {}
+    try:
+        serial = salt.payload.Serial(opts)
+        with salt.utils.files.fopen(cfn, "rb") as fp_:
+            func_cache = serial.load(fp_)
+    except Exception:  # pylint: disable=broad-except
+        log.debug("Unable to read grains function cache %s", cfn, exc_info=True)
+        return {}
+    if not isinstance(func_cache, dict):
+        return {}
+    return func_cache
+
+
+def _write_grains_func_cache(opts, func_cache):
+    cfn = os.path.join(opts["cachedir"], "grains.funcs.p")
+    with salt.utils.files.set_umask(0o077):
+        try:
+            if not os.path.isdir(opts["cachedir"]):
+                os.makedirs(opts["cachedir"])
+            serial = salt.payload.Serial(opts)
+            with salt.utils.atomicfile.atomic_open(cfn, "w+b") as fp_:
+                serial.dump(func_cache, fp_)
+        except Exception as exc:  # pylint: disable=broad-except
+            # The cache is an optimization, e.g. salt-call run by an
+            # unprivileged user just does without it
+            log.debug("Unable to write grains function cache %s: %s", cfn, exc)
+
+
+def grains_func_timings(opts):
+    """
+    Return how long each grains function took when it was last run, how many
+    seconds ago that was and the TTL configured for it
+    """
+    now = time.time()
+    ret = {}
+    for key, entry in _read_grains_func_cache(opts).items():
+        ret[key] = {
+            "duration": entry["duration"],
+            "age": int(now - entry["timestamp"]),
+            "ttl": _grains_func_ttl(opts, key),
+        }
+    return ret
+
+
+def expire_grains_funcs(opts, refresh_funcs):
+    """
+    Forget the cached results of the grains functions matched by the globs in
+    ``refresh_funcs``, so that the next grains refresh runs them again. Their
+    timings are kept.
+    """
+    func_cache = _read_grains_func_cache(opts)
+    expired = False
+    for key, entry in func_cache.items():
+        if "ret" in entry and any(
+            fnmatch.fnmatch(key, pattern) for pattern in refresh_funcs
+        ):
+            entry.pop("ret")
+            entry.pop("grains_checksum", None)
+            expired = True
+    if expired:
+        _write_grains_func_cache(opts, func_cache)
+
+
+def _grains_func_cache_fresh(opts, func_cache, key, refresh_funcs):
+    """
+    Return whether the cached result of the grains function ``key`` is within
+    its TTL and was not asked to be refreshed
+    """
+    ttl = _grains_func_ttl(opts, key)
+    if ttl <= 0:
+        return False
+    if any(fnmatch.fnmatch(key, pattern) for pattern in refresh_funcs):
+        return False
+    entry = func_cache.get(key)
+    if not entry or entry.get("ret") is None:
+        return False
+    return time.time() - entry["timestamp"] < ttl
+
+
+def _cached_grains_func(opts, func_cache, key, refresh_funcs, grains_data=None):
+    """
+    Return a copy of the cached result of the grains function ``key`` if it is
+    still fresh, otherwise None. A result which was computed from the grains
+    passed to the function is only reused if those grains did not change.
+    """
+    if not _grains_func_cache_fresh(opts, func_cache, key, refresh_funcs):
+        return None
+    entry = func_cache[key]
+    if entry.get("grains_checksum") is not None:
+        if grains_data is None or entry["grains_checksum"] != _grains_checksum(
+            grains_data
+        ):
+            return None
+    log.trace("Using cached result of %s grain", key)
+    return _format_cached_grains(copy.deepcopy(entry["ret"]))
+
+
+def _run_grains_func(opts, key, func, kwargs):
+    """
+    Run the grains function ``key``. Returns its result and the entry of the
+    grains function cache recording its execution time, and its result if a
+    TTL is configured for it. The entry is only stored by the main thread,
+    see :py:func:`_grains_func_result`.
+    """
+    start = time.time()
+    ret = func(**kwargs)
+    duration = time.time() - start
+    log.trace("Grains function %s took %.3f seconds", key, duration)
+    entry = {"duration": duration, "timestamp": start}
+    if isinstance(ret, dict) and _grains_func_ttl(opts, key) > 0:
+        entry["ret"] = copy.deepcopy(ret)
+        if "grains" in kwargs:
+            entry["grains_checksum"] = _grains_checksum(kwargs["grains"])
+    return ret, entry
+
+
+def _call_grains_func(opts, func_cache, key, func, kwargs):
+    """
+    Run the grains function ``key`` in the current thread and record its
+    entry in ``func_cache``
+    """
+    ret, func_cache[key] = _run_grains_func(opts, key, func, kwargs)
+    return ret
+
+
+class _GrainsFuncExecutor:
+    """
+    Runs grains functions in daemon threads. Unlike the threads of a
+    ``concurrent.futures.ThreadPoolExecutor``, a thread stuck in a grains
+    function which timed out does not keep the process from exiting.
+    """
+
+    def __init__(self, max_workers):
+        self._queue = queue.Queue()
+        self._threads = []
+        for idx in range(max_workers):
+            thread = threading.Thread(
+                target=self._work, name="GrainsFunc-{}".format(idx)
+            )
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, func, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as exc:  # pylint: disable=broad-except
+                future.set_exception(exc)
+
+    def submit(self, func, *args):
+        future = concurrent.futures.Future()
+        self._queue.put((future, func, args))
+        return future
+
+    def shutdown(self):
+        """
+        Stop the threads once they are done with the functions they run,
+        without waiting for them
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+
+
+def _grains_func_kwargs(func, proxy, grains_data):
+    """
+    Return the arguments a grains function is called with
+    """
+    parameters = salt.utils.args.get_function_argspec(func).args
+    kwargs = {}
+    if "proxy" in parameters:
+        kwargs["proxy"] = proxy
+    if "grains" in parameters:
+        kwargs["grains"] = grains_data
+    return kwargs
+
+
+def _start_grains_funcs(
+    opts, executor, func_cache, funcs, keys, refresh_funcs, proxy=None, core=False
+):
+    """
+    Submit the grains functions ``keys`` which are passed neither the grains
+    nor the proxy module and have no fresh cached result to ``executor``.
+    Returns a dict mapping the submitted functions to their futures.
+    """
+    futures = {}
+    if executor is None:
+        return futures
+    for key in keys:
+        if core:
+            # Core grains functions are always called without arguments
+            kwargs = {}
+        else:
+            try:
+                kwargs = _grains_func_kwargs(funcs[key], proxy, None)
+            except Exception:  # pylint: disable=broad-except
+                # Leave it to the sequential path to report the error
+                continue
+            if kwargs:
+                # Functions passed the grains need the grains gathered so
+                # far, the proxy module is not safe to use from threads
+                continue
+        if _grains_func_cache_fresh(opts, func_cache, key, refresh_funcs):
+            continue
+        futures[key] = executor.submit(_run_grains_func, opts, key, funcs[key], kwargs)
+    return futures
+
+
+def _grains_func_result(opts, func_cache, key, future):
+    """
+    Wait for the result of a grains function run by the executor, for at
+    most ``grains_func_timeout`` seconds, and record its entry in
+    ``func_cache``. The result of a function which did not return in time is
+    never looked at, even once it returns.
+    """
+    timeout = opts.get("grains_func_timeout", 0) or None
+    try:
+        ret, entry = future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        log.critical(
+            "Grains function %s did not return within %s seconds, skipping it",
+            key,
+            timeout,
+        )
+        return None
+    func_cache[key] = entry
+    return ret
+
+
+def grains(opts, force_refresh=False, proxy=None, context=None, refresh_funcs=None):
     """
     Return the functions for the dynamic grains and the values for the static
     grains.
@@ -827,6 +1095,10 @@ def grains(opts, force_refresh=False, proxy=None, context=None):
         __opts__ = salt.config.minion_config('/etc/salt/minion')
         __grains__ = salt.loader.grains(__opts__)
         print __grains__['id']
+
+    The results of the grains functions matched by ``grains_func_ttl`` are
+    reused until their TTL expires, unless ``force_refresh`` is set or they
+    are matched by one of the globs in ``refresh_funcs``.
     """
     # Need to re-import salt.config, somehow it got lost when a minion is starting
     import salt.config
@@ -874,12 +1146,36 @@ def grains(opts, force_refresh=False, proxy=None, context=None):
     funcs = grain_funcs(opts, proxy=proxy, context=context or {})
     if force_refresh:  # if we refresh, lets reload grain modules
         funcs.clear()
+    # The timings of all grains functions are recorded, their results only
+    # when a TTL is configured for them
+    func_cache = _read_grains_func_cache(opts)
+    if force_refresh:
+        refresh_funcs = ["*"]
+    elif refresh_funcs is None:
+        refresh_funcs = []
+    executor = None
+    if opts.get("grains_parallel_workers", 1) > 1:
+        executor = _GrainsFuncExecutor(opts["grains_parallel_workers"])
     # Run core grains
+    futures = _start_grains_funcs(
+        opts,
+        executor,
+        func_cache,
+        funcs,
+        [key for key in funcs if key.startswith("core.")],
+        refresh_funcs,
+        core=True,
+    )
     for key in funcs:
         if not key.startswith("core."):
             continue
         log.trace("Loading %s grain", key)
-        ret = funcs[key]()
+        if key in futures:
+            ret = _grains_func_result(opts, func_cache, key, futures.pop(key))
+        else:
+            ret = _cached_grains_func(opts, func_cache, key, refresh_funcs)
+            if ret is None:
+                ret = _call_grains_func(opts, func_cache, key, funcs[key], {})
         if not isinstance(ret, dict):
             continue
         if blist:
@@ -895,7 +1191,17 @@ def grains(opts, force_refresh=False, proxy=None, context=None):
         else:
             grains_data.update(ret)
 
-    # Run the rest of the grains
+    # Run the rest of the grains. Only the functions which are not passed the
+    # grains can run ahead, the others see the grains merged in order.
+    futures = _start_grains_funcs(
+        opts,
+        executor,
+        func_cache,
+        funcs,
+        [key for key in funcs if not key.startswith("core.") and key != "_errors"],
+        refresh_funcs,
+        proxy,
+    )
     for key in funcs:
         if key.startswith("core.") or key == "_errors":
             continue
@@ -907,13 +1213,15 @@ def grains(opts, force_refresh=False, proxy=None, context=None):
             # proxymodule for retrieving information from the connected
             # device.
             log.trace("Loading %s grain", key)
-            parameters = salt.utils.args.get_function_argspec(funcs[key]).args
-            kwargs = {}
-            if "proxy" in parameters:
-                kwargs["proxy"] = proxy
-            if "grains" in parameters:
-                kwargs["grains"] = grains_data
-            ret = funcs[key](**kwargs)
+            if key in futures:
+                ret = _grains_func_result(opts, func_cache, key, futures.pop(key))
+            else:
+                kwargs = _grains_func_kwargs(funcs[key], proxy, grains_data)
+                ret = _cached_grains_func(
+                    opts, func_cache, key, refresh_funcs, kwargs.get("grains")
+                )
+                if ret is None:
+                    ret = _call_grains_func(opts, func_cache, key, funcs[key], kwargs)
         except Exception:  # pylint: disable=broad-except
             if salt.utils.platform.is_proxy():
                 log.info(
@@ -941,6 +1249,9 @@ def grains(opts, force_refresh=False, proxy=None, context=None):
             salt.utils.dictupdate.update(grains_data, ret)
         else:
             grains_data.update(ret)
+    if executor is not None:
+        # Do not wait for functions which timed out
+        executor.shutdown()
 
     if opts.get("proxy_merge_grains_in_module", True) and proxy:
         try:
@@ -964,6 +1275,13 @@ def grains(opts, force_refresh=False, proxy=None, context=None):
         except KeyError:
             pass
 
+    # Drop the functions which are gone, e.g. after a grains module was
+    # removed
+    for key in list(func_cache):
+        if key not in funcs:
+            del func_cache[key]
+    _write_grains_func_cache(opts, func_cache)
+
     grains_data.update(opts["grains"])
     # Write cache if enabled
     if opts.get("grains_cache", False):
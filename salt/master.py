@@ -922,15 +922,33 @@ class ReqServer(salt.utils.process.SignalHandlingProcess):
         # Reset signals to default ones before adding processes to the process
         # manager. We don't want the processes being started to inherit those
         # signal handlers
+        pools = salt.utils.master.mworker_pools(self.opts)
         with salt.utils.process.default_signals(signal.SIGINT, signal.SIGTERM):
-            for ind in range(int(self.opts["worker_threads"])):
-                name = "MWorker-{}".format(ind)
-                self.process_manager.add_process(
-                    MWorker,
-                    args=(self.opts, self.master_key, self.key, req_channels, name),
-                    kwargs=kwargs,
-                    name=name,
-                )
+            if pools:
+                for pool, settings in pools.items():
+                    for ind in range(settings["workers"]):
+                        name = "MWorker-{}-{}".format(pool, ind)
+                        self.process_manager.add_process(
+                            MWorker,
+                            args=(
+                                self.opts,
+                                self.master_key,
+                                self.key,
+                                req_channels,
+                                name,
+                            ),
+                            kwargs=dict(kwargs, pool=pool),
+                            name=name,
+                        )
+            else:
+                for ind in range(int(self.opts["worker_threads"])):
+                    name = "MWorker-{}".format(ind)
+                    self.process_manager.add_process(
+                        MWorker,
+                        args=(self.opts, self.master_key, self.key, req_channels, name),
+                        kwargs=kwargs,
+                        name=name,
+                    )
         self.process_manager.run()
 
     def run(self):
@@ -958,13 +976,14 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
     salt master.
     """
 
-    def __init__(self, opts, mkey, key, req_channels, name, **kwargs):
+    def __init__(self, opts, mkey, key, req_channels, name, pool=None, **kwargs):
         """
         Create a salt master worker process
 
         :param dict opts: The salt options
         :param dict mkey: The user running the salt master and the AES key
         :param dict key: The user running the salt master and the RSA key
+        :param str pool: The pool of ``mworker_pools`` the worker belongs to
 
         :rtype: MWorker
         :return: Master worker
@@ -974,6 +993,7 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         super().__init__(**kwargs)
         self.opts = opts
         self.req_channels = req_channels
+        self.pool = pool
 
         self.mkey = mkey
         self.key = key
@@ -992,6 +1012,7 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         )
         self.opts = state["opts"]
         self.req_channels = state["req_channels"]
+        self.pool = state["pool"]
         self.mkey = state["mkey"]
         self.key = state["key"]
         self.k_mtime = state["k_mtime"]
@@ -1001,6 +1022,7 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         return {
             "opts": self.opts,
             "req_channels": self.req_channels,
+            "pool": self.pool,
             "mkey": self.mkey,
             "key": self.key,
             "k_mtime": self.k_mtime,
@@ -1024,6 +1046,9 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         self.io_loop = ZMQDefaultLoop()
         self.io_loop.make_current()
         for req_channel in self.req_channels:
+            if self.pool is not None:
+                # Only the zeromq transport has pools of workers
+                req_channel.worker_pool = self.pool
             req_channel.post_fork(
                 self._handle_payload, io_loop=self.io_loop
             )  # TODO: cleaner? Maybe lazily?
@@ -1071,14 +1096,15 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         ) / self.stats[cmd]["runs"]
         if end - self.stat_clock > self.opts["master_stats_event_iter"]:
             # Fire the event with the stats and wipe the tracker
-            self.aes_funcs.event.fire_event(
-                {
-                    "time": end - self.stat_clock,
-                    "worker": self.name,
-                    "stats": self.stats,
-                },
-                tagify(self.name, "stats"),
-            )
+            data = {
+                "time": end - self.stat_clock,
+                "worker": self.name,
+                "stats": self.stats,
+            }
+            render_cache = salt.pillar.render_cache(self.opts)
+            if render_cache is not None:
+                data["pillar_render_cache"] = render_cache.stats(reset=True)
+            self.aes_funcs.event.fire_event(data, tagify(self.name, "stats"))
             self.stats = collections.defaultdict(lambda: {"mean": 0, "runs": 0})
             self.stat_clock = end
 
@@ -1629,6 +1655,8 @@ class AESFuncs(TransportMethods):
             pillarenv=load.get("pillarenv"),
             extra_minion_data=load.get("extra_minion_data"),
         )
+        if load.get("profile"):
+            return pillar.profile_pillar()
         data = pillar.compile_pillar()
         self.fs_.update_opts()
         if self.opts.get("minion_data_cache", False):
@@ -1742,6 +1770,11 @@ class AESFuncs(TransportMethods):
 
         :param dict load: The minion payload
         """
+        if "load_gz" in load:
+            # Compressed by a syndic with syndic_forward_compress enabled
+            load["load"] = salt.serializers.msgpack.deserialize(
+                salt.utils.gzip_util.uncompress(load.pop("load_gz"))
+            )
         loads = load.get("load")
         if not isinstance(loads, list):
             loads = [load]  # support old syndics not aggregating returns
@@ -18,13 +18,17 @@ except ImportError:
 log = logging.getLogger(__name__)
 
 
-def match(tgt, opts=None, minion_id=None):
+def match(tgt, opts=None, minion_id=None, nodegroups=None):
     """
     Runs the compound target check
+
+    The nodegroups are expanded from ``nodegroups``, the ``nodegroups`` option
+    by default.
     """
     if not opts:
         opts = __opts__
-    nodegroups = opts.get("nodegroups", {})
+    if nodegroups is None:
+        nodegroups = opts.get("nodegroups", {})
     matchers = salt.loader.matchers(opts)
     if not minion_id:
         minion_id = opts.get("id")
@@ -39,79 +43,52 @@ def match(tgt, opts=None, minion_id=None):
         "I": "pillar",
         "J": "pillar_pcre",
         "L": "list",
-        "N": None,  # Nodegroups should already be expanded
         "S": "ipcidr",
         "E": "pcre",
     }
     if HAS_RANGE:
         ref["R"] = "range"
 
-    results = []
-    opers = ["and", "or", "not", "(", ")"]
-
-    if isinstance(tgt, str):
-        words = tgt.split()
-    else:
-        # we make a shallow copy in order to not affect the passed in arg
-        words = tgt[:]
-
-    while words:
-        word = words.pop(0)
-        target_info = salt.utils.minions.parse_target(word)
-
-        # Easy check first
-        if word in opers:
-            if results:
-                if results[-1] == "(" and word in ("and", "or"):
-                    log.error('Invalid beginning operator after "(": %s', word)
-                    return False
-                if word == "not":
-                    if not results[-1] in ("and", "or", "("):
-                        results.append("and")
-                results.append(word)
-            else:
-                # seq start with binary oper, fail
-                if word not in ["(", "not"]:
-                    log.error("Invalid beginning operator: %s", word)
-                    return False
-                results.append(word)
-
-        elif target_info and target_info["engine"]:
-            if "N" == target_info["engine"]:
-                # if we encounter a node group, just evaluate it in-place
-                decomposed = salt.utils.minions.nodegroup_comp(
-                    target_info["pattern"], nodegroups
-                )
-                if decomposed:
-                    words = decomposed + words
-                continue
-
-            engine = ref.get(target_info["engine"])
-            if not engine:
-                # If an unknown engine is called at any time, fail out
-                log.error(
-                    'Unrecognized target engine "%s" for target expression "%s"',
-                    target_info["engine"],
-                    word,
-                )
-                return False
+    # The parsed target is cached, only the matches depend on the minion
+    words = salt.utils.minions.parse_compound(tgt, nodegroups)
+    if words is None:
+        return False
 
-            engine_args = [target_info["pattern"]]
-            engine_kwargs = {"opts": opts, "minion_id": minion_id}
-            if target_info["delimiter"]:
-                engine_kwargs["delimiter"] = target_info["delimiter"]
+    results = []
+    for word in words:
+        if isinstance(word, str):
+            # An operator
+            results.append(word)
+            continue
 
+        if word["engine"] is None:
+            # The match is not explicitly defined, evaluate it as a glob
             results.append(
-                str(
-                    matchers["{}_match.match".format(engine)](
-                        *engine_args, **engine_kwargs
-                    )
-                )
+                str(matchers["glob_match.match"](word["pattern"], opts, minion_id))
+            )
+            continue
+
+        engine = ref.get(word["engine"])
+        if not engine:
+            # If an unknown engine is called at any time, fail out
+            log.error(
+                'Unrecognized target engine "%s" for target expression "%s"',
+                word["engine"],
+                "{}@{}".format(word["engine"], word["pattern"]),
             )
+            return False
 
-        else:
-            # The match is not explicitly defined, evaluate it as a glob
-            results.append(str(matchers["glob_match.match"](word, opts, minion_id)))
+        engine_kwargs = {"opts": opts, "minion_id": minion_id}
+        if word["delimiter"]:
+            engine_kwargs["delimiter"] = word["delimiter"]
+
+        results.append(
+            str(
+                matchers["{}_match.match".format(engine)](
+                    word["pattern"], **engine_kwargs
+                )
+            )
+        )
 
     results = " ".join(results)
     log.debug('compound_match %s ? "%s" => "%s"', minion_id, tgt, results)
@@ -5,7 +5,6 @@ This is the default nodegroup matcher.
 import logging
 
 import salt.loader
-import salt.utils.minions
 
 log = logging.getLogger(__name__)
 
@@ -23,7 +22,8 @@ def match(tgt, nodegroups=None, opts=None, minion_id=None):
         return False
     if tgt in nodegroups:
         matchers = salt.loader.matchers(opts)
+        # The compound matcher caches the expansion of the nodegroup
         return matchers["compound_match.match"](
-            salt.utils.minions.nodegroup_comp(tgt, nodegroups)
+            "N@{}".format(tgt), nodegroups=nodegroups
         )
     return False
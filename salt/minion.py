@@ -2,6 +2,7 @@
 Routines to set up a minion
 """
 
+import collections
 import contextlib
 import copy
 import functools
@@ -30,6 +31,7 @@ import salt.engines
 import salt.ext.tornado
 import salt.ext.tornado.gen
 import salt.ext.tornado.ioloop
+import salt.ext.tornado.locks
 import salt.loader
 import salt.log.setup
 import salt.payload
@@ -46,6 +48,7 @@ import salt.utils.dictupdate
 import salt.utils.error
 import salt.utils.event
 import salt.utils.files
+import salt.utils.gzip_util
 import salt.utils.jid
 import salt.utils.minion
 import salt.utils.minions
@@ -1243,6 +1246,16 @@ class Minion(MinionBase):
         self.ready = False
         self.jid_queue = [] if jid_queue is None else jid_queue
         self.periodic_callbacks = {}
+        self.job_pool = None
+        # The running jobs, mapped from jid to their process. Jobs which
+        # outlived the previous minion process are read from the proc dir.
+        self.running_jobs = {}
+        # The sentinels of the job processes watched by the io_loop
+        self._job_sentinels = {}
+        self._job_finished = salt.ext.tornado.locks.Condition()
+        if self.opts.get("process_count_max", -1) > 0:
+            for job in salt.utils.minion.running(self.opts):
+                self.running_jobs[job["jid"]] = salt.utils.minion.RunningJob(job)
 
         if io_loop is None:
             install_zmq()
@@ -1707,17 +1720,24 @@ class Minion(MinionBase):
                 ) = self._load_modules()
                 self.schedule.functions = self.functions
                 self.schedule.returners = self.returners
+                self._recycle_job_pool()
+
+        job_pool = self._get_job_pool()
+        if job_pool is not None:
+            # The size of the pool bounds the number of running jobs
+            yield job_pool.dispatch(data, self.connected)
+            return
 
         process_count_max = self.opts.get("process_count_max")
         if process_count_max > 0:
-            process_count = len(salt.utils.minion.running(self.opts))
-            while process_count >= process_count_max:
+            while self._running_job_count() >= process_count_max:
                 log.warning(
                     "Maximum number of processes reached while executing jid %s, waiting...",
                     data["jid"],
                 )
-                yield salt.ext.tornado.gen.sleep(10)
-                process_count = len(salt.utils.minion.running(self.opts))
+                # Job processes wake us up when they exit, threads and
+                # Windows processes are checked on the timeout
+                yield self._job_finished.wait(timeout=self.io_loop.time() + 1)
 
         # We stash an instance references to allow for the socket
         # communication in Windows. You can't pickle functions, and thus
@@ -1755,6 +1775,88 @@ class Minion(MinionBase):
             process.start()
         process.name = "{}-Job-{}".format(process.name, data["jid"])
         self.subprocess_list.add(process)
+        self._track_job(data["jid"], process)
+
+    def _track_job(self, jid, process):
+        """
+        Add a started job to the registry of running jobs
+        """
+        self.running_jobs[jid] = process
+        if isinstance(process, threading.Thread) or salt.utils.platform.is_windows():
+            return
+        try:
+            sentinel = process.sentinel
+        except ValueError:
+            # The process was not started
+            return
+        self.io_loop.add_handler(
+            sentinel, functools.partial(self._job_exited, jid), self.io_loop.READ
+        )
+        self._job_sentinels[jid] = sentinel
+
+    def _forget_job(self, jid):
+        """
+        Drop a finished job from the registry of running jobs
+        """
+        self.running_jobs.pop(jid, None)
+        sentinel = self._job_sentinels.pop(jid, None)
+        if sentinel is not None:
+            self.io_loop.remove_handler(sentinel)
+
+    def _job_exited(self, jid, fd, events):
+        """
+        Called by the io_loop when the process of a job exits
+        """
+        self._forget_job(jid)
+        self.subprocess_list.cleanup()
+        self._job_finished.notify()
+
+    def _running_job_count(self):
+        """
+        Return the number of running jobs, scheduled ones included, dropping
+        finished ones from the registry
+        """
+        for jid, process in list(self.running_jobs.items()):
+            if not process.is_alive():
+                self._forget_job(jid)
+        count = len(self.running_jobs)
+        if getattr(self, "schedule", None) is not None:
+            count += self.schedule.running_job_count()
+        return count
+
+    def _get_job_pool(self):
+        """
+        Return the pool of pre-forked job workers, starting it on first use.
+        Returns None when jobs get a process of their own.
+        """
+        if self.job_pool is not None:
+            return self.job_pool
+        size = self.opts.get("job_worker_pool_size", 0)
+        if size <= 0 or not self.opts.get("multiprocessing", True):
+            return None
+        if salt.utils.platform.is_windows():
+            # Workers are forked with the loaded modules, which is not
+            # possible on Windows
+            return None
+        process_count_max = self.opts.get("process_count_max")
+        if process_count_max > 0:
+            size = min(size, process_count_max)
+        self.job_pool = salt.utils.minion.JobWorkerPool(
+            self.opts,
+            self._target,
+            self,
+            self.io_loop,
+            size,
+            max_jobs=self.opts.get("job_worker_max_jobs", 0),
+        )
+        return self.job_pool
+
+    def _recycle_job_pool(self):
+        """
+        Replace the job workers so they pick up refreshed modules and pillar
+        """
+        if self.job_pool is not None:
+            self.job_pool.recycle()
 
     def ctx(self):
         """
@@ -1868,7 +1970,8 @@ class Minion(MinionBase):
         This method should be used as a threading target, start the actual
         minion side execution.
         """
-        minion_instance.gen_modules()
+        if not getattr(minion_instance, "_job_worker", False):
+            minion_instance.gen_modules()
         fn_ = os.path.join(minion_instance.proc_dir, data["jid"])
 
         salt.utils.process.appendproctitle(
@@ -2058,7 +2161,8 @@ class Minion(MinionBase):
         This method should be used as a threading target, start the actual
         minion side execution.
         """
-        minion_instance.gen_modules()
+        if not getattr(minion_instance, "_job_worker", False):
+            minion_instance.gen_modules()
         fn_ = os.path.join(minion_instance.proc_dir, data["jid"])
 
         salt.utils.process.appendproctitle(
@@ -2297,6 +2401,17 @@ class Minion(MinionBase):
                 salt.utils.minion.cache_jobs(self.opts, load["jid"], ret)
 
         load = {"cmd": ret_cmd, "load": list(jids.values())}
+        if (
+            ret_cmd == "_syndic_return"
+            and self.opts.get("syndic_forward_compress")
+            and self._master_reads_compressed_returns()
+        ):
+            load = {
+                "cmd": ret_cmd,
+                "load_gz": salt.utils.gzip_util.compress(
+                    salt.serializers.msgpack.serialize(load["load"])
+                ),
+            }
 
         def timeout_handler(*_):
             log.warning(
@@ -2325,6 +2440,24 @@ class Minion(MinionBase):
         log.trace("ret_val = %s", ret_val)  # pylint: disable=no-member
         return ret_val
 
+    def _master_reads_compressed_returns(self):
+        """
+        Return whether the master announced in its auth reply that it reads
+        compressed syndic returns. Older masters would drop them.
+        """
+        auth = getattr(getattr(self, "pub_channel", None), "auth", None)
+        creds = getattr(auth, "creds", None) or {}
+        if creds.get("syndic_return_gz"):
+            return True
+        if not getattr(self, "_warned_return_gz", False):
+            self._warned_return_gz = True
+            log.warning(
+                "syndic_forward_compress is enabled, but the master does not "
+                "announce that it reads compressed returns. Sending them "
+                "uncompressed."
+            )
+        return False
+
     def _state_run(self):
         """
         Execute a state run based on information set in the minion config file
@@ -2403,6 +2536,7 @@ class Minion(MinionBase):
 
         self.schedule.functions = self.functions
         self.schedule.returners = self.returners
+        self._recycle_job_pool()
 
     def beacons_refresh(self):
         """
@@ -2486,6 +2620,7 @@ class Minion(MinionBase):
                 self.opts["pillar"] = new_pillar
             finally:
                 async_pillar.destroy()
+        self._recycle_job_pool()
         self.matchers_refresh()
         self.beacons_refresh()
         with salt.utils.event.get_event("minion", opts=self.opts, listen=False) as evt:
@@ -3182,6 +3317,9 @@ class Minion(MinionBase):
         if hasattr(self, "periodic_callbacks"):
             for cb in self.periodic_callbacks.values():
                 cb.stop()
+        if getattr(self, "job_pool", None) is not None:
+            self.job_pool.stop()
+            self.job_pool = None
 
     # pylint: disable=W1701
     def __del__(self):
@@ -3206,7 +3344,7 @@ class Syndic(Minion):
         opts["loop_interval"] = 1
         super().__init__(opts, **kwargs)
         self.mminion = salt.minion.MasterMinion(opts)
-        self.jid_forward_cache = set()
+        self.jid_forward_cache = collections.OrderedDict()
         self.jids = {}
         self.raw_events = []
         self.pub_future = None
@@ -3368,7 +3506,8 @@ class SyndicManager(MinionBase):
         self.max_auth_wait = self.opts["acceptance_wait_time_max"]
 
         self._has_master = threading.Event()
-        self.jid_forward_cache = set()
+        # Ordered so that the oldest jid can be dropped without sorting
+        self.jid_forward_cache = collections.OrderedDict()
 
         if io_loop is None:
             install_zmq()
@@ -3383,6 +3522,8 @@ class SyndicManager(MinionBase):
         # List of delayed job_rets which was unable to send for some reason and will be resend to
         # any available master
         self.delayed = []
+        # Batches of job_rets waiting to be forwarded: {master_id: deque([[job_ret, ...], ...])}
+        self.pending_rets = {}
         # Active pub futures: {master_id: (future, [job_ret, ...]), ...}
         self.pub_futures = {}
 
@@ -3526,6 +3667,9 @@ class SyndicManager(MinionBase):
                 values, "_syndic_return", timeout=self._return_retry_timer(), sync=False
             )
             self.pub_futures[master] = (future, values)
+            # Send the next pending batch as soon as this one is delivered
+            # instead of waiting for the next forward interval
+            self.io_loop.add_future(future, lambda future: self._forward_job_rets())
             return True
         # Loop done and didn't exit: wasn't sent, try again later
         return False
@@ -3621,15 +3765,13 @@ class SyndicManager(MinionBase):
                 # for every minion return!
                 if data["jid"] not in self.jid_forward_cache:
                     jdict["__load__"].update(self.mminion.returners[fstr](data["jid"]))
-                    self.jid_forward_cache.add(data["jid"])
+                    self.jid_forward_cache[data["jid"]] = None
                     if (
                         len(self.jid_forward_cache)
                         > self.opts["syndic_jid_forward_cache_hwm"]
                     ):
                         # Pop the oldest jid from the cache
-                        tmp = sorted(list(self.jid_forward_cache))
-                        tmp.pop(0)
-                        self.jid_forward_cache = set(tmp)
+                        self.jid_forward_cache.popitem(last=False)
             if master is not None:
                 # __'s to make sure it doesn't print out on the master cli
                 jdict["__master_id__"] = master
@@ -3662,14 +3804,75 @@ class SyndicManager(MinionBase):
                 },
             )
         if self.delayed:
-            res = self._return_pub_syndic(self.delayed)
-            if res:
-                self.delayed = []
+            # Delayed returns may go to any available master
+            self.pending_rets.setdefault(None, collections.deque()).extend(
+                self._batch_job_rets(self.delayed)
+            )
+            self.delayed = []
         for master in list(self.job_rets.keys()):
-            values = list(self.job_rets[master].values())
-            res = self._return_pub_syndic(values, master_id=master)
-            if res:
-                del self.job_rets[master]
+            values = list(self.job_rets.pop(master).values())
+            self.pending_rets.setdefault(master, collections.deque()).extend(
+                self._batch_job_rets(values)
+            )
+        self._forward_job_rets()
+
+    def _forward_job_rets(self):
+        """
+        Send the pending job return batches, one batch in flight per master
+        """
+        for master in list(self.pending_rets.keys()):
+            batches = self.pending_rets[master]
+            while batches:
+                if not self._return_pub_syndic(batches[0], master_id=master):
+                    break
+                batches.popleft()
+            if not batches:
+                del self.pending_rets[master]
+
+    def _batch_job_rets(self, values):
+        """
+        Split aggregated job returns into batches holding at most
+        ``syndic_forward_batch_size`` minion returns and about
+        ``syndic_forward_max_bytes`` of serialized return data. A job whose
+        returns span several batches only carries its load in the first one.
+        """
+        max_rets = self.opts["syndic_forward_batch_size"]
+        max_bytes = self.opts["syndic_forward_max_bytes"]
+        batches = []
+        batch = []
+        count = size = 0
+        for jdict in values:
+            header = {}
+            rets = []
+            for key, value in jdict.items():
+                if key.startswith("__"):
+                    header[key] = value
+                else:
+                    rets.append((key, value))
+            chunk = None
+            for minion_id, ret in rets:
+                ret_size = 0
+                if max_bytes:
+                    ret_size = len(salt.serializers.msgpack.serialize(ret))
+                if count and (
+                    (max_rets and count >= max_rets)
+                    or (max_bytes and size + ret_size > max_bytes)
+                ):
+                    batches.append(batch)
+                    batch = []
+                    count = size = 0
+                    if chunk is not None:
+                        chunk = None
+                        header["__load__"] = {}
+                if chunk is None:
+                    chunk = dict(header)
+                    batch.append(chunk)
+                chunk[minion_id] = ret
+                count += 1
+                size += ret_size
+        if batch:
+            batches.append(batch)
+        return batches
 
     def destroy(self):
         if self._closing is True:
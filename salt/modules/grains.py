@@ -19,6 +19,7 @@ import random
 from collections.abc import Mapping
 from functools import reduce  # pylint: disable=redefined-builtin
 
+import salt.loader
 import salt.utils.compat
 import salt.utils.data
 import salt.utils.files
@@ -800,5 +801,23 @@ def equals(key, value):
     return str(value) == str(get(key))
 
 
+def timings():
+    """
+    .. versionadded:: 3004
+
+    Return the execution time of each grains function, in seconds, as of the
+    last time the function was run, together with the age of that result and
+    the TTL configured for the function in :conf_minion:`grains_func_ttl`.
+    This shows which grains functions are worth caching.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' grains.timings
+    """
+    return salt.loader.grains_func_timings(__opts__)
+
+
 # Provide a jinja function call compatible get aliased as fetch
 fetch = get
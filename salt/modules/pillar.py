@@ -15,7 +15,7 @@ import salt.utils.functools
 import salt.utils.odict
 import salt.utils.yaml
 from salt.defaults import DEFAULT_TARGET_DELIM
-from salt.exceptions import CommandExecutionError
+from salt.exceptions import CommandExecutionError, SaltClientError
 
 __proxyenabled__ = ["*"]
 
@@ -280,6 +280,39 @@ def items(*args, **kwargs):
 data = salt.utils.functools.alias_function(items, "data")
 
 
+def profile(pillarenv=None):
+    """
+    .. versionadded:: 3004
+
+    Have the master compile the pillar of this minion, and return how long
+    rendering and merging each pillar SLS file and ext_pillar took, and the
+    serialized size of its data, largest first, instead of the pillar data.
+
+    pillarenv
+        Pass a specific pillar environment from which to compile pillar data,
+        like with :py:func:`items`.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' pillar.profile
+    """
+    if pillarenv is None:
+        if __opts__.get("pillarenv_from_saltenv", False):
+            pillarenv = __opts__["saltenv"]
+        else:
+            pillarenv = __opts__["pillarenv"]
+
+    pillar = salt.pillar.get_pillar(
+        __opts__, dict(__grains__), __opts__["id"], pillarenv=pillarenv,
+    )
+    try:
+        return pillar.profile_pillar()
+    except SaltClientError as exc:
+        raise CommandExecutionError(str(exc))
+
+
 def _obfuscate_inner(var):
     """
     Recursive obfuscation of collection types.
@@ -21,6 +21,7 @@ import salt.client
 import salt.client.ssh.client
 import salt.config
 import salt.defaults.events
+import salt.loader
 import salt.payload
 import salt.runner
 import salt.state
@@ -379,16 +380,32 @@ def refresh_grains(**kwargs):
     refresh_pillar : True
         Set to ``False`` to keep pillar data from being refreshed.
 
+    refresh_funcs
+        .. versionadded:: 3004
+
+        A list of globs matching grains functions, e.g. ``core.ip_interfaces``,
+        whose results are recomputed even though their TTL, as configured in
+        :conf_minion:`grains_func_ttl`, did not expire yet. Grains functions
+        without a TTL are always recomputed.
+
     CLI Examples:
 
     .. code-block:: bash
 
         salt '*' saltutil.refresh_grains
+        salt '*' saltutil.refresh_grains refresh_funcs='["core.fqdns"]'
     """
     kwargs = salt.utils.args.clean_kwargs(**kwargs)
     _refresh_pillar = kwargs.pop("refresh_pillar", True)
+    refresh_funcs = kwargs.pop("refresh_funcs", None)
     if kwargs:
         salt.utils.args.invalid_kwargs(kwargs)
+    if refresh_funcs:
+        if isinstance(refresh_funcs, str):
+            refresh_funcs = refresh_funcs.split(",")
+        # Only forget the cached results here, the grains refresh of the
+        # minion recomputes them
+        salt.loader.expire_grains_funcs(__opts__, refresh_funcs)
     # Modules and pillar need to be refreshed in case grains changes affected
     # them, and the module refresh process reloads the grains and assigns the
     # newly-reloaded grains to each execution module's __grains__ dunder.
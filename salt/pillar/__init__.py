@@ -4,26 +4,35 @@ Render the pillar data
 
 
 import collections
+import concurrent.futures
 import copy
 import fnmatch
+import hashlib
 import inspect
 import logging
 import os
 import sys
+import time
 import traceback
 
+import salt.cache
 import salt.ext.tornado.gen
 import salt.fileclient
 import salt.loader
 import salt.minion
+import salt.payload
 import salt.transport.client
 import salt.utils.args
 import salt.utils.cache
 import salt.utils.crypt
 import salt.utils.data
 import salt.utils.dictupdate
+import salt.utils.hashutils
+import salt.utils.json
+import salt.utils.stringutils
+import salt.utils.templates
 import salt.utils.url
-from salt.exceptions import SaltClientError
+from salt.exceptions import SaltCacheError, SaltClientError
 from salt.ext import six
 from salt.template import compile_template
 
@@ -36,6 +45,11 @@ from salt.version import __version__
 
 log = logging.getLogger(__name__)
 
+# The PillarRenderCache of this process, see render_cache
+RENDER_CACHE = None
+# The keys of what Pillar.profile_pillar returns
+PROFILE_KEYS = ("time", "size", "top_time", "sls", "ext_pillar", "errors")
+
 
 def get_pillar(
     opts,
@@ -310,10 +324,7 @@ class RemotePillar(RemotePillarMixin):
         )
         self._closing = False
 
-    def compile_pillar(self):
-        """
-        Return the pillar data from the master
-        """
+    def _load(self):
         load = {
             "id": self.minion_id,
             "grains": self.grains,
@@ -326,6 +337,13 @@ class RemotePillar(RemotePillarMixin):
         }
         if self.ext:
             load["ext"] = self.ext
+        return load
+
+    def compile_pillar(self):
+        """
+        Return the pillar data from the master
+        """
+        load = self._load()
         ret_pillar = self.channel.crypted_transfer_decode_dictentry(
             load, dictkey="pillar",
         )
@@ -339,6 +357,19 @@ class RemotePillar(RemotePillarMixin):
             return {}
         return ret_pillar
 
+    def profile_pillar(self):
+        """
+        Return the profile of a compilation of the pillar by the master, see
+        :py:meth:`Pillar.profile_pillar`
+        """
+        load = self._load()
+        load["profile"] = True
+        ret = self.channel.crypted_transfer_decode_dictentry(load, dictkey="pillar",)
+        # Older masters ignore the profile flag and send the pillar data
+        if not isinstance(ret, dict) or set(ret) != set(PROFILE_KEYS):
+            raise SaltClientError("The master does not support pillar profiling")
+        return ret
+
     def destroy(self):
         if hasattr(self, "_closing") and self._closing:
             return
@@ -419,7 +450,10 @@ class PillarCache:
         a new pillar.
         """
         log.debug("Pillar cache getting external pillar with ext: %s", self.ext)
-        fresh_pillar = Pillar(
+        return self._pillar().compile_pillar()
+
+    def _pillar(self):
+        return Pillar(
             self.opts,
             self.grains,
             self.minion_id,
@@ -429,7 +463,12 @@ class PillarCache:
             pillar_override=self.pillar_override,
             pillarenv=self.pillarenv,
         )
-        return fresh_pillar.compile_pillar()
+
+    def profile_pillar(self, *args, **kwargs):
+        """
+        Profile a compilation of the pillar, which bypasses the cache
+        """
+        return self._pillar().profile_pillar(*args, **kwargs)
 
     def clear_pillar(self):
         """
@@ -485,6 +524,110 @@ class PillarCache:
             return fresh_pillar
 
 
+class PillarRenderCache:
+    """
+    Keeps rendered pillar SLS files for the other minions whose render would
+    read the same values.
+
+    A render is reused when the grains, pillar and opts keys it read hold the
+    same values for the minion and the template files it read did not
+    change, see :py:class:`salt.utils.templates.TemplateInputs`. Renders
+    calling salt functions or using other renderers are not kept.
+
+    .. versionadded:: 3004
+    """
+
+    # The number of renders kept for the same SLS file and defaults
+    VARIANTS = 16
+
+    def __init__(self, size):
+        self.size = size
+        # key -> list of (TemplateInputs, rendered data), newest last
+        self.entries = collections.OrderedDict()
+        self.count = 0
+        self.hits = self.misses = self.uncacheable = 0
+
+    @staticmethod
+    def key(path, saltenv, sls, defaults):
+        """
+        Return the key of the renders of the SLS file at ``path``, as it is
+        now, with the ``defaults`` of its include, or None if the file can
+        not be read
+        """
+        try:
+            digest = salt.utils.hashutils.get_hash(path)
+        except OSError:
+            return None
+        return (
+            path,
+            digest,
+            saltenv,
+            sls,
+            salt.utils.json.dumps(defaults, sort_keys=True, default=repr),
+        )
+
+    def fetch(self, key, sources):
+        """
+        Return a copy of the data rendered for ``key`` from the same values
+        as the ones in ``sources``, or None
+        """
+        # The hashes of the files read by the renders, computed once
+        digests = {}
+        for inputs, data in reversed(self.entries.get(key, [])):
+            if inputs.matches(sources, digests):
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return copy.deepcopy(data)
+        self.misses += 1
+        return None
+
+    def store(self, key, inputs, data):
+        """
+        Keep the ``data`` rendered for ``key`` if ``inputs`` says it can be
+        reused
+        """
+        if not inputs.reusable or data is None:
+            self.uncacheable += 1
+            return
+        variants = self.entries.pop(key, [])
+        variants.append((inputs, copy.deepcopy(data)))
+        self.count += 1
+        if len(variants) > self.VARIANTS:
+            variants.pop(0)
+            self.count -= 1
+        self.entries[key] = variants
+        while self.count > self.size:
+            _, dropped = self.entries.popitem(last=False)
+            self.count -= len(dropped)
+
+    def stats(self, reset=False):
+        """
+        Return the hits, misses and the renders which could not be kept
+        """
+        ret = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "renders": self.count,
+        }
+        if reset:
+            self.hits = self.misses = self.uncacheable = 0
+        return ret
+
+
+def render_cache(opts):
+    """
+    Return the PillarRenderCache of this process, or None unless
+    ``pillar_render_cache`` is enabled
+    """
+    global RENDER_CACHE  # pylint: disable=global-statement
+    if not opts.get("pillar_render_cache", False):
+        return None
+    if RENDER_CACHE is None:
+        RENDER_CACHE = PillarRenderCache(opts.get("pillar_render_cache_size", 1000))
+    return RENDER_CACHE
+
+
 class Pillar:
     """
     Read over the pillar top files and render the pillar data
@@ -541,6 +684,11 @@ class Pillar:
 
         self.ext_pillars = salt.loader.pillars(ext_pillar_opts, self.functions)
         self.ignored_pillars = {}
+        # The name and the seconds taken of each ext_pillar run by ext_pillar
+        self.ext_pillar_timings = []
+        self._ext_pillar_cache = None
+        # What profile_pillar measured so far, None when not profiling
+        self._profile = None
         self.pillar_override = pillar_override or {}
         if not isinstance(self.pillar_override, dict):
             self.pillar_override = {}
@@ -674,17 +822,7 @@ class Pillar:
             for saltenv in saltenvs:
                 top = self.client.cache_file(self.opts["state_top"], saltenv)
                 if top:
-                    tops[saltenv].append(
-                        compile_template(
-                            top,
-                            self.rend,
-                            self.opts["renderer"],
-                            self.opts["renderer_blacklist"],
-                            self.opts["renderer_whitelist"],
-                            saltenv=saltenv,
-                            _pillar_rend=True,
-                        )
-                    )
+                    tops[saltenv].append(self._compile_template(top, saltenv))
         except Exception as exc:  # pylint: disable=broad-except
             errors.append(
                 "Rendering Primary Top file failed, render error:\n{}".format(exc)
@@ -711,14 +849,9 @@ class Pillar:
                         continue
                     try:
                         tops[saltenv].append(
-                            compile_template(
+                            self._compile_template(
                                 self.client.get_state(sls, saltenv).get("dest", False),
-                                self.rend,
-                                self.opts["renderer"],
-                                self.opts["renderer_blacklist"],
-                                self.opts["renderer_whitelist"],
-                                saltenv=saltenv,
-                                _pillar_rend=True,
+                                saltenv,
                             )
                         )
                     except Exception as exc:  # pylint: disable=broad-except
@@ -830,6 +963,45 @@ class Pillar:
                             env_matches.append(item)
         return matches
 
+    def _compile_template(self, fn_, saltenv, sls="", defaults=None):
+        """
+        Render a single pillar sls or top file, reusing the render of another
+        minion when the pillar render cache is enabled
+        """
+        if defaults is None:
+            defaults = {}
+        cache = render_cache(self.opts)
+        inputs = None
+        key = None
+        if cache is not None and isinstance(fn_, str):
+            key = cache.key(fn_, saltenv, sls, defaults)
+        if key is not None:
+            sources = {
+                "grains": self.opts.get("grains"),
+                "pillar": self.opts.get("pillar"),
+                "opts": self.opts,
+            }
+            state = cache.fetch(key, sources)
+            if state is not None:
+                log.debug("Reusing the render of pillar SLS '%s'", sls)
+                return state
+            inputs = salt.utils.templates.TemplateInputs()
+            defaults = dict(defaults, _render_inputs=inputs)
+        state = compile_template(
+            fn_,
+            self.rend,
+            self.opts["renderer"],
+            self.opts["renderer_blacklist"],
+            self.opts["renderer_whitelist"],
+            saltenv,
+            sls,
+            _pillar_rend=True,
+            **defaults
+        )
+        if inputs is not None:
+            cache.store(key, inputs, state)
+        return state
+
     def render_pstate(self, sls, saltenv, mods, defaults=None):
         """
         Collect a single pillar sls file and render it
@@ -879,18 +1051,9 @@ class Pillar:
                 # return state, mods, errors
                 return None, mods, errors
         state = None
+        start = time.time()
         try:
-            state = compile_template(
-                fn_,
-                self.rend,
-                self.opts["renderer"],
-                self.opts["renderer_blacklist"],
-                self.opts["renderer_whitelist"],
-                saltenv,
-                sls,
-                _pillar_rend=True,
-                **defaults
-            )
+            state = self._compile_template(fn_, saltenv, sls, defaults)
         except Exception as exc:  # pylint: disable=broad-except
             msg = "Rendering SLS '{}' failed, render error:\n{}".format(sls, exc)
             log.critical(msg, exc_info=True)
@@ -901,6 +1064,10 @@ class Pillar:
                 )
             else:
                 errors.append(msg)
+        if self._profile is not None:
+            profile = self._profile_sls(saltenv, sls)
+            profile["render_time"] += time.time() - start
+            profile["size"] = self._data_size(state)
         mods[sls] = state
         nstate = None
         if state:
@@ -970,13 +1137,16 @@ class Pillar:
                                     ):
                                         include_states.append(nstate)
                                     else:
+                                        start = time.time()
                                         state = merge(
                                             state,
                                             nstate,
                                             self.merge_strategy,
                                             self.opts.get("renderer", "yaml"),
                                             self.opts.get("pillar_merge_lists", False),
+                                            shared=True,
                                         )
+                                        self._profile_merge(saltenv, sls, start)
                                 if err:
                                     errors += err
                         if not self.opts.get("pillar_includes_override_sls", False):
@@ -985,6 +1155,7 @@ class Pillar:
                             # authoritative.
                             include_states.append(state)
                             state = None
+                            start = time.time()
                             for s in include_states:
                                 if state is None:
                                     state = s
@@ -995,7 +1166,9 @@ class Pillar:
                                         self.merge_strategy,
                                         self.opts.get("renderer", "yaml"),
                                         self.opts.get("pillar_merge_lists", False),
+                                        shared=True,
                                     )
+                            self._profile_merge(saltenv, sls, start)
         return state, mods, errors
 
     def render_pillar(self, matches, errors=None):
@@ -1042,13 +1215,19 @@ class Pillar:
                             ", ".join(["'{}'".format(e) for e in errors]),
                         )
                         continue
+                    # The rendered SLS files are not modified afterwards, so
+                    # the merged pillar can share their data instead of
+                    # copying it again for each merge
+                    start = time.time()
                     pillar = merge(
                         pillar,
                         pstate,
                         self.merge_strategy,
                         self.opts.get("renderer", "yaml"),
                         self.opts.get("pillar_merge_lists", False),
+                        shared=True,
                     )
+                    self._profile_merge(saltenv, sls, start)
 
         return pillar, errors
 
@@ -1123,7 +1302,6 @@ class Pillar:
             errors.append('The "ext_pillar" option is malformed')
             log.critical(errors[-1])
             return pillar, errors
-        ext = None
         # Bring in CLI pillar data
         if self.pillar_override:
             pillar = merge(
@@ -1134,6 +1312,11 @@ class Pillar:
                 self.opts.get("pillar_merge_lists", False),
             )
 
+        # Consecutive ext_pillars which do not read the data of the previous
+        # ones are run together, each on the pillar as it was before them
+        serial = self.opts.get("ext_pillar_serial") or []
+        workers = self.opts.get("ext_pillar_parallel_workers", 1)
+        batch = []
         for run in self.opts["ext_pillar"]:
             if not isinstance(run, dict):
                 errors.append('The "ext_pillar" option is malformed')
@@ -1147,17 +1330,122 @@ class Pillar:
                         "Specified ext_pillar interface %s is unavailable", key
                     )
                     continue
-                try:
-                    ext = self._external_pillar_data(pillar, val, key)
-                except Exception as exc:  # pylint: disable=broad-except
-                    errors.append(
-                        "Failed to load ext_pillar {}: {}".format(key, exc.__str__(),)
-                    )
-                    log.error(
-                        "Exception caught loading ext_pillar '%s':\n%s",
-                        key,
-                        "".join(traceback.format_tb(sys.exc_info()[2])),
+                if workers <= 1 or key in serial:
+                    pillar = self._run_ext_pillars(pillar, batch, errors, workers)
+                    batch = []
+                    pillar = self._run_ext_pillars(pillar, [(key, val)], errors)
+                else:
+                    batch.append((key, val))
+        return self._run_ext_pillars(pillar, batch, errors, workers), errors
+
+    def _timed_ext_pillar(self, pillar, val, key):
+        """
+        Return the data of an ext_pillar and the seconds it took
+        """
+        start = time.time()
+        try:
+            ext = self._cached_ext_pillar(pillar, val, key)
+        finally:
+            took = time.time() - start
+            self.ext_pillar_timings.append((key, took))
+            log.debug("ext_pillar '%s' took %.3f seconds", key, took)
+        return ext, took
+
+    def _ext_pillar_cache_key(self, key, val, pillar):
+        """
+        Return the cache bank and key holding the data of an ext_pillar and
+        how many seconds this data is used, or None if it is not cached.
+        ``pillar`` is the pillar data the ext_pillar is given.
+        """
+        conf = (self.opts.get("ext_pillar_cache") or {}).get(key)
+        if not conf:
+            return None
+        try:
+            cache_key = conf.get("key", "{minion_id}").format(
+                minion_id=self.minion_id,
+                grains=self.opts.get("grains", {}),
+                pillar=pillar,
+                saltenv=self.saltenv,
+                pillarenv=self.opts.get("pillarenv"),
+            )
+        except (AttributeError, IndexError, KeyError) as exc:
+            log.warning(
+                "Not caching ext_pillar '%s', its cache key failed to render: %s",
+                key,
+                exc,
+            )
+            return None
+        # The same ext_pillar may be configured more than once
+        digest = hashlib.sha256(
+            salt.utils.stringutils.to_bytes(
+                repr((cache_key, self.saltenv, self.opts.get("pillarenv"), val))
+            )
+        ).hexdigest()
+        return "ext_pillar/{}".format(key), digest, conf.get("ttl", 3600)
+
+    def _cached_ext_pillar(self, pillar, val, key):
+        """
+        Return the data of an ext_pillar, from the cache if ext_pillar_cache
+        configures it and its cached data did not expire
+        """
+        cached = self._ext_pillar_cache_key(key, val, pillar)
+        if cached is None:
+            return self._external_pillar_data(pillar, val, key)
+        bank, cache_key, ttl = cached
+        if self._ext_pillar_cache is None:
+            self._ext_pillar_cache = salt.cache.factory(self.opts)
+        try:
+            updated = self._ext_pillar_cache.updated(bank, cache_key)
+            if updated is not None and time.time() - updated < ttl:
+                log.debug("Using the cached data of ext_pillar '%s'", key)
+                return self._ext_pillar_cache.fetch(bank, cache_key)
+        except SaltCacheError as exc:
+            log.warning("Failed to read the cache of ext_pillar '%s': %s", key, exc)
+        ext = self._external_pillar_data(pillar, val, key)
+        try:
+            self._ext_pillar_cache.store(bank, cache_key, ext)
+        except SaltCacheError as exc:
+            log.warning("Failed to cache the data of ext_pillar '%s': %s", key, exc)
+        return ext
+
+    def _run_ext_pillars(self, pillar, batch, errors, workers=1):
+        """
+        Run the ``(key, val)`` ext_pillars in ``batch``, concurrently when there
+        are several of them and more than one worker, and merge their data
+        into ``pillar`` in the configured order
+        """
+        if not batch:
+            return pillar
+        futures = []
+        if len(batch) > 1 and workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(workers, len(batch))
+            ) as executor:
+                for key, val in batch:
+                    futures.append(
+                        executor.submit(
+                            self._timed_ext_pillar, copy.deepcopy(pillar), val, key
+                        )
                     )
+        for idx, (key, val) in enumerate(batch):
+            try:
+                if futures:
+                    ext, took = futures[idx].result()
+                else:
+                    ext, took = self._timed_ext_pillar(pillar, val, key)
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.append(
+                    "Failed to load ext_pillar {}: {}".format(key, exc.__str__(),)
+                )
+                log.error(
+                    "Exception caught loading ext_pillar '%s':\n%s",
+                    key,
+                    "".join(traceback.format_tb(sys.exc_info()[2])),
+                )
+                if self._profile is not None:
+                    self._profile["ext_pillar"].append({"name": key, "error": str(exc)})
+                continue
+            start = time.time()
             if ext:
                 pillar = merge(
                     pillar,
@@ -1166,14 +1454,25 @@ class Pillar:
                     self.opts.get("renderer", "yaml"),
                     self.opts.get("pillar_merge_lists", False),
                 )
-                ext = None
-        return pillar, errors
+            if self._profile is not None:
+                self._profile["ext_pillar"].append(
+                    {
+                        "name": key,
+                        "render_time": took,
+                        "merge_time": time.time() - start,
+                        "size": self._data_size(ext),
+                    }
+                )
+        return pillar
 
     def compile_pillar(self, ext=True):
         """
         Render the pillar data and return
         """
+        start = time.time()
         top, top_errors = self.get_top()
+        if self._profile is not None:
+            self._profile["top_time"] = time.time() - start
         if ext:
             if self.opts.get("ext_pillar_first", False):
                 self.opts["pillar"], errors = self.ext_pillar(self.pillar_override)
@@ -1228,6 +1527,58 @@ class Pillar:
             pillar.setdefault("_errors", []).extend(decrypt_errors)
         return pillar
 
+    def _data_size(self, data):
+        """
+        Return the size of ``data`` once serialized for the minion
+        """
+        try:
+            return len(salt.payload.Serial(self.opts).dumps(data))
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+    def _profile_sls(self, saltenv, sls):
+        """
+        Return what profile_pillar measured for an SLS file
+        """
+        return self._profile["sls"].setdefault(
+            (saltenv, sls),
+            {
+                "saltenv": saltenv,
+                "sls": sls,
+                "render_time": 0.0,
+                "merge_time": 0.0,
+                "size": None,
+            },
+        )
+
+    def _profile_merge(self, saltenv, sls, start):
+        """
+        Count the time since ``start`` as time spent merging an SLS file
+        """
+        if self._profile is not None:
+            self._profile_sls(saltenv, sls)["merge_time"] += time.time() - start
+
+    def profile_pillar(self, ext=True):
+        """
+        Compile the pillar like compile_pillar, but return how long rendering
+        and merging each SLS file and ext_pillar took and the serialized size
+        of its data, largest first, instead of the pillar data
+        """
+        self._profile = {"top_time": 0.0, "sls": {}, "ext_pillar": []}
+        start = time.time()
+        try:
+            pillar = self.compile_pillar(ext=ext)
+        finally:
+            profile, self._profile = self._profile, None
+        profile["time"] = time.time() - start
+        profile["size"] = self._data_size(pillar)
+        profile["errors"] = pillar.get("_errors", [])
+        profile["sls"] = sorted(
+            profile["sls"].values(), key=lambda item: item["size"] or 0, reverse=True
+        )
+        profile["ext_pillar"].sort(key=lambda item: item.get("size") or 0, reverse=True)
+        return profile
+
     def decrypt_pillar(self, pillar):
         """
         Decrypt the specified pillar dictionary items, if configured to do so
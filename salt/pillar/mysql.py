@@ -53,6 +53,7 @@ import logging
 from contextlib import contextmanager
 
 # Import Salt libs
+import salt.utils.sqlpool
 from salt.pillar.sql_base import SqlBaseExtPillar
 
 # Set up logging
@@ -121,7 +122,9 @@ class MySQLExtPillar(SqlBaseExtPillar):
         Yield a MySQL cursor
         """
         _options = self._get_options()
-        conn = MySQLdb.connect(
+        pool = salt.utils.sqlpool.get_pool(
+            __opts__,
+            MySQLdb.connect,
             host=_options["host"],
             user=_options["user"],
             passwd=_options["pass"],
@@ -129,13 +132,14 @@ class MySQLExtPillar(SqlBaseExtPillar):
             port=_options["port"],
             ssl=_options["ssl"],
         )
+        conn = pool.acquire()
         cursor = conn.cursor()
         try:
             yield cursor
         except MySQLdb.DatabaseError as err:
             log.exception("Error in ext_pillar MySQL: %s", err.args)
         finally:
-            conn.close()
+            pool.release(conn)
 
     def extract_queries(self, args, kwargs):  # pylint: disable=useless-super-delegation
         """
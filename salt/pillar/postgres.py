@@ -36,6 +36,7 @@ import logging
 from contextlib import contextmanager
 
 # Import Salt libs
+import salt.utils.sqlpool
 from salt.pillar.sql_base import SqlBaseExtPillar
 
 # Set up logging
@@ -92,13 +93,16 @@ class POSTGRESExtPillar(SqlBaseExtPillar):
         Yield a POSTGRES cursor
         """
         _options = self._get_options()
-        conn = psycopg2.connect(
+        pool = salt.utils.sqlpool.get_pool(
+            __opts__,
+            psycopg2.connect,
             host=_options["host"],
             user=_options["user"],
             password=_options["pass"],
             dbname=_options["db"],
             port=_options["port"],
         )
+        conn = pool.acquire()
         cursor = conn.cursor()
         try:
             yield cursor
@@ -106,7 +110,7 @@ class POSTGRESExtPillar(SqlBaseExtPillar):
         except psycopg2.DatabaseError as err:
             log.exception("Error in ext_pillar POSTGRES: %s", err.args)
         finally:
-            conn.close()
+            pool.release(conn)
 
     def extract_queries(self, args, kwargs):  # pylint: disable=useless-super-delegation
         """
@@ -55,6 +55,7 @@ import sqlite3
 from contextlib import contextmanager
 
 # Import Salt libs
+import salt.utils.sqlpool
 from salt.pillar.sql_base import SqlBaseExtPillar
 
 # Set up logging
@@ -97,16 +98,23 @@ class SQLite3ExtPillar(SqlBaseExtPillar):
         Yield a SQLite3 cursor
         """
         _options = self._get_options()
-        conn = sqlite3.connect(
-            _options.get("database"), timeout=float(_options.get("timeout"))
+        # A pooled connection may be used by another thread than the one
+        # which opened it, but only by one thread at a time
+        pool = salt.utils.sqlpool.get_pool(
+            __opts__,
+            sqlite3.connect,
+            database=_options.get("database"),
+            timeout=float(_options.get("timeout")),
+            check_same_thread=False,
         )
+        conn = pool.acquire()
         cursor = conn.cursor()
         try:
             yield cursor
         except sqlite3.Error as err:
             log.exception("Error in ext_pillar SQLite3: %s", err.args)
         finally:
-            conn.close()
+            pool.release(conn)
 
 
 def ext_pillar(minion_id, pillar, *args, **kwargs):
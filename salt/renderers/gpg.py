@@ -151,6 +151,20 @@ data like so:
       -----END PGP MESSAGE-----
 
 
+Decrypting Concurrently
+-----------------------
+
+.. versionadded:: 3004
+
+Each block of ciphertext is decrypted by running ``gpg``. To render data
+holding many secrets faster, the ``gpg_decrypt_workers`` option of the master,
+or of the minion for masterless minions, sets how many ``gpg`` processes run
+at a time:
+
+.. code-block:: yaml
+
+    gpg_decrypt_workers: 4
+
 .. _encrypted-cli-pillar-data:
 
 Encrypted CLI Pillar Data
@@ -270,6 +284,7 @@ pillar data like so:
 """
 
 
+import concurrent.futures
 import logging
 import os
 import re
@@ -336,50 +351,130 @@ def _get_cache():
     return GPG_CACHE
 
 
-def _decrypt_ciphertext(cipher):
+def _gpg_decrypt(cipher, gpg_exec, key_dir):
     """
-    Given a block of ciphertext as a string, and a gpg object, try to decrypt
-    the cipher and return the decrypted string. If the cipher cannot be
-    decrypted, log the error, and return the ciphertext back out.
+    Run gpg to decrypt ``cipher`` and return what it wrote to its stdout and
+    its stderr. This does not use the dunders, so it can run in a thread.
     """
-    try:
-        cipher = salt.utils.stringutils.to_unicode(cipher).replace(r"\n", "\n")
-    except UnicodeDecodeError:
-        # ciphertext is binary
-        pass
-    cipher = salt.utils.stringutils.to_bytes(cipher)
-    if __opts__.get("gpg_cache"):
-        cache = _get_cache()
-        if cipher in cache:
-            return cache[cipher]
     cmd = [
-        _get_gpg_exec(),
+        gpg_exec,
         "--homedir",
-        _get_key_dir(),
+        key_dir,
         "--status-fd",
         "2",
         "--no-tty",
         "-d",
     ]
     proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=False)
-    decrypted_data, decrypt_error = proc.communicate(input=cipher)
+    return proc.communicate(input=cipher)
+
+
+def _normalize_ciphertext(cipher):
+    try:
+        cipher = salt.utils.stringutils.to_unicode(cipher).replace(r"\n", "\n")
+    except UnicodeDecodeError:
+        # ciphertext is binary
+        pass
+    return salt.utils.stringutils.to_bytes(cipher)
+
+
+def _decrypted(cipher, decrypted_data, decrypt_error, memo=None):
+    """
+    Return what gpg decrypted from ``cipher``, or ``cipher`` if it failed,
+    and remember it in ``memo`` and in the GPG cache
+    """
     if not decrypted_data:
         log.warning("Could not decrypt cipher %r, received: %r", cipher, decrypt_error)
-        return cipher
-    else:
-        if __opts__.get("gpg_cache"):
-            cache[cipher] = decrypted_data
-        return decrypted_data
+        decrypted_data = cipher
+    elif __opts__.get("gpg_cache"):
+        _get_cache()[cipher] = decrypted_data
+    if memo is not None:
+        memo[cipher] = decrypted_data
+    return decrypted_data
+
+
+def _decrypt_ciphertext(cipher, memo=None):
+    """
+    Given a block of ciphertext as a string, and a gpg object, try to decrypt
+    the cipher and return the decrypted string. If the cipher cannot be
+    decrypted, log the error, and return the ciphertext back out.
+    """
+    cipher = _normalize_ciphertext(cipher)
+    if memo is not None and cipher in memo:
+        return memo[cipher]
+    if __opts__.get("gpg_cache"):
+        cache = _get_cache()
+        if cipher in cache:
+            return cache[cipher]
+    decrypted_data, decrypt_error = _gpg_decrypt(
+        cipher, _get_gpg_exec(), _get_key_dir()
+    )
+    return _decrypted(cipher, decrypted_data, decrypt_error, memo)
+
+
+def _find_ciphertexts(obj, translate_newlines=False):
+    """
+    Yield the blocks of ciphertext which _decrypt_object decrypts in ``obj``
+    """
+    if salt.utils.stringio.is_readable(obj):
+        obj = obj.getvalue()
+    if isinstance(obj, (str, bytes)):
+        data = salt.utils.stringutils.to_bytes(obj)
+        if translate_newlines:
+            data = data.replace(
+                salt.utils.stringutils.to_bytes(r"\n"),
+                salt.utils.stringutils.to_bytes("\n"),
+            )
+        for match in GPG_CIPHERTEXT.finditer(data):
+            yield match.group()
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _find_ciphertexts(value, translate_newlines)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _find_ciphertexts(value, translate_newlines)
+
+
+def _prefetch_ciphertexts(obj, translate_newlines, memo):
+    """
+    Decrypt the distinct blocks of ciphertext in ``obj`` into ``memo`` with up
+    to ``gpg_decrypt_workers`` gpg processes at a time
+    """
+    workers = __opts__.get("gpg_decrypt_workers", 1)
+    if workers <= 1:
+        return
+    cache = _get_cache() if __opts__.get("gpg_cache") else {}
+    ciphers = []
+    seen = set()
+    for cipher in _find_ciphertexts(obj, translate_newlines):
+        cipher = _normalize_ciphertext(cipher)
+        if cipher not in memo and cipher not in cache and cipher not in seen:
+            seen.add(cipher)
+            ciphers.append(cipher)
+    if len(ciphers) < 2:
+        return
+    gpg_exec = _get_gpg_exec()
+    key_dir = _get_key_dir()
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(workers, len(ciphers))
+    ) as executor:
+        results = list(
+            executor.map(
+                lambda cipher: _gpg_decrypt(cipher, gpg_exec, key_dir), ciphers
+            )
+        )
+    for cipher, (decrypted_data, decrypt_error) in zip(ciphers, results):
+        _decrypted(cipher, decrypted_data, decrypt_error, memo)
 
 
-def _decrypt_ciphertexts(cipher, translate_newlines=False, encoding=None):
+def _decrypt_ciphertexts(cipher, translate_newlines=False, encoding=None, memo=None):
     to_bytes = salt.utils.stringutils.to_bytes
     cipher = to_bytes(cipher)
     if translate_newlines:
         cipher = cipher.replace(to_bytes(r"\n"), to_bytes("\n"))
 
     def replace(match):
-        result = to_bytes(_decrypt_ciphertext(match.group()))
+        result = to_bytes(_decrypt_ciphertext(match.group(), memo))
         return result
 
     ret, num = GPG_CIPHERTEXT.subn(replace, to_bytes(cipher))
@@ -398,25 +493,29 @@ def _decrypt_ciphertexts(cipher, translate_newlines=False, encoding=None):
     return ret
 
 
-def _decrypt_object(obj, translate_newlines=False, encoding=None):
+def _decrypt_object(obj, translate_newlines=False, encoding=None, memo=None):
     """
     Recursively try to decrypt any object. If the object is a string
     or bytes and it contains a valid GPG header, decrypt it,
     otherwise keep going until a string is found.
     """
     if salt.utils.stringio.is_readable(obj):
-        return _decrypt_object(obj.getvalue(), translate_newlines)
+        return _decrypt_object(obj.getvalue(), translate_newlines, memo=memo)
     if isinstance(obj, (str, bytes)):
         return _decrypt_ciphertexts(
-            obj, translate_newlines=translate_newlines, encoding=encoding
+            obj, translate_newlines=translate_newlines, encoding=encoding, memo=memo
         )
     elif isinstance(obj, dict):
         for key, value in obj.items():
-            obj[key] = _decrypt_object(value, translate_newlines=translate_newlines)
+            obj[key] = _decrypt_object(
+                value, translate_newlines=translate_newlines, memo=memo
+            )
         return obj
     elif isinstance(obj, list):
         for key, value in enumerate(obj):
-            obj[key] = _decrypt_object(value, translate_newlines=translate_newlines)
+            obj[key] = _decrypt_object(
+                value, translate_newlines=translate_newlines, memo=memo
+            )
         return obj
     else:
         return obj
@@ -432,8 +531,12 @@ def render(gpg_data, saltenv="base", sls="", argline="", **kwargs):
     log.debug("Reading GPG keys from: %s", _get_key_dir())
 
     translate_newlines = kwargs.get("translate_newlines", False)
+    # A block of ciphertext found more than once is only decrypted once
+    memo = {}
+    _prefetch_ciphertexts(gpg_data, translate_newlines, memo)
     return _decrypt_object(
         gpg_data,
         translate_newlines=translate_newlines,
         encoding=kwargs.get("encoding", None),
+        memo=memo,
     )
@@ -152,6 +152,7 @@ import salt.exceptions
 import salt.returners
 import salt.utils.jid
 import salt.utils.json
+import salt.utils.sqlpool
 
 # Import 3rd-party libs
 from salt.ext import six
@@ -245,45 +246,32 @@ def _get_serv(ret=None, commit=False):
     """
     _options = _get_options(ret)
 
-    connect = True
-    if __context__ and "mysql_returner_conn" in __context__:
-        try:
-            log.debug("Trying to reuse MySQL connection pool")
-            conn = __context__["mysql_returner_conn"]
-            conn.ping()
-            connect = False
-        except OperationalError as exc:
-            log.debug("OperationalError on ping: %s", exc)
-
-    if connect:
-        log.debug("Generating new MySQL connection pool")
-        try:
-            # An empty ssl_options dictionary passed to MySQLdb.connect will
-            # effectively connect w/o SSL.
-            ssl_options = {}
-            if _options.get("ssl_ca"):
-                ssl_options["ca"] = _options.get("ssl_ca")
-            if _options.get("ssl_cert"):
-                ssl_options["cert"] = _options.get("ssl_cert")
-            if _options.get("ssl_key"):
-                ssl_options["key"] = _options.get("ssl_key")
-            conn = MySQLdb.connect(
-                host=_options.get("host"),
-                user=_options.get("user"),
-                passwd=_options.get("pass"),
-                db=_options.get("db"),
-                port=_options.get("port"),
-                ssl=ssl_options,
-            )
-
-            try:
-                __context__["mysql_returner_conn"] = conn
-            except TypeError:
-                pass
-        except OperationalError as exc:
-            raise salt.exceptions.SaltMasterError(
-                "MySQL returner could not connect to database: {exc}".format(exc=exc)
-            )
+    # An empty ssl_options dictionary passed to MySQLdb.connect will
+    # effectively connect w/o SSL.
+    ssl_options = {}
+    if _options.get("ssl_ca"):
+        ssl_options["ca"] = _options.get("ssl_ca")
+    if _options.get("ssl_cert"):
+        ssl_options["cert"] = _options.get("ssl_cert")
+    if _options.get("ssl_key"):
+        ssl_options["key"] = _options.get("ssl_key")
+    pool = salt.utils.sqlpool.get_pool(
+        __opts__,
+        MySQLdb.connect,
+        check=lambda conn: conn.ping(),
+        host=_options.get("host"),
+        user=_options.get("user"),
+        passwd=_options.get("pass"),
+        db=_options.get("db"),
+        port=_options.get("port"),
+        ssl=ssl_options,
+    )
+    try:
+        conn = pool.acquire()
+    except OperationalError as exc:
+        raise salt.exceptions.SaltMasterError(
+            "MySQL returner could not connect to database: {exc}".format(exc=exc)
+        )
 
     cursor = conn.cursor()
 
@@ -299,6 +287,8 @@ def _get_serv(ret=None, commit=False):
             cursor.execute("COMMIT")
         else:
             cursor.execute("ROLLBACK")
+    finally:
+        pool.release(conn)
 
 
 def returner(ret):
@@ -174,6 +174,7 @@ import salt.exceptions
 # Import salt libs
 import salt.returners
 import salt.utils.jid
+import salt.utils.sqlpool
 from salt.ext import six
 
 # Let's not allow PyLint complain about string substitution
@@ -259,7 +260,9 @@ def _get_serv(ret=None, commit=False):
             for k, v in six.iteritems(_options)
             if k in ["sslmode", "sslcert", "sslkey", "sslrootcert", "sslcrl"]
         }
-        conn = psycopg2.connect(
+        pool = salt.utils.sqlpool.get_pool(
+            __opts__,
+            psycopg2.connect,
             host=_options.get("host"),
             port=_options.get("port"),
             dbname=_options.get("db"),
@@ -267,6 +270,7 @@ def _get_serv(ret=None, commit=False):
             password=_options.get("pass"),
             **ssl_options
         )
+        conn = pool.acquire()
     except psycopg2.OperationalError as exc:
         raise salt.exceptions.SaltMasterError(
             "pgjsonb returner could not connect to database: {exc}".format(exc=exc)
@@ -295,7 +299,7 @@ def _get_serv(ret=None, commit=False):
         else:
             cursor.execute("ROLLBACK")
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 def returner(ret):
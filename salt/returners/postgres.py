@@ -140,6 +140,7 @@ import salt.returners
 # Import Salt libs
 import salt.utils.jid
 import salt.utils.json
+import salt.utils.sqlpool
 
 # Import third party libs
 from salt.ext import six
@@ -202,15 +203,17 @@ def _get_serv(ret=None, commit=False):
     Return a Pg cursor
     """
     _options = _get_options(ret)
+    pool = salt.utils.sqlpool.get_pool(
+        __opts__,
+        psycopg2.connect,
+        host=_options.get("host"),
+        user=_options.get("user"),
+        password=_options.get("passwd"),
+        database=_options.get("db"),
+        port=_options.get("port"),
+    )
     try:
-        conn = psycopg2.connect(
-            host=_options.get("host"),
-            user=_options.get("user"),
-            password=_options.get("passwd"),
-            database=_options.get("db"),
-            port=_options.get("port"),
-        )
-
+        conn = pool.acquire()
     except psycopg2.OperationalError as exc:
         raise salt.exceptions.SaltMasterError(
             "postgres returner could not connect to database: {exc}".format(exc=exc)
@@ -231,7 +234,7 @@ def _get_serv(ret=None, commit=False):
         else:
             cursor.execute("ROLLBACK")
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 def returner(ret):
@@ -354,6 +354,32 @@ def update(backend=None, **kwargs):
     return True
 
 
+def fetch_durations(backend=None):
+    """
+    .. versionadded:: 3004
+
+    Return the duration (in seconds) and start time of the most recent fetch
+    of each remote, for the fileserver backends which track them (currently
+    only :mod:`gitfs <salt.fileserver.gitfs>`). This can be used to find slow
+    remotes, and to tune :conf_master:`gitfs_fetch_workers` and
+    :conf_master:`gitfs_update_interval`.
+
+    backend
+        Narrow fileserver backends to a subset of the enabled ones. If all
+        passed backends start with a minus sign (``-``), then these backends
+        will be excluded from the enabled backends.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run fileserver.fetch_durations
+        salt-run fileserver.fetch_durations backend=git
+    """
+    fileserver = salt.fileserver.Fileserver(__opts__)
+    return fileserver.fetch_durations(back=backend)
+
+
 def clear_cache(backend=None):
     """
     .. versionadded:: 2015.5.0
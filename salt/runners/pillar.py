@@ -100,6 +100,33 @@ def show_pillar(minion="*", **kwargs):
     return compiled_pillar
 
 
+def profile(minion="*", **kwargs):
+    """
+    Compile the pillar of a minion like :py:func:`show_pillar` and return how
+    long rendering and merging each pillar SLS file and ext_pillar took, and
+    the serialized size of its data, largest first. This helps finding what
+    makes the pillar of a minion large or slow to compile.
+
+    .. versionadded:: 3004
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run pillar.profile 'www.example.com'
+        salt-run pillar.profile 'www.example.com' pillarenv=dev
+    """
+    pillarenv = kwargs.pop("pillarenv", None)
+    saltenv = kwargs.pop("saltenv", "base")
+    id_, grains, _ = salt.utils.minions.get_minion_data(minion, __opts__)
+    if grains is None:
+        grains = {"fqdn": minion}
+    grains.update(kwargs)
+
+    pillar = salt.pillar.Pillar(__opts__, grains, id_, saltenv, pillarenv=pillarenv)
+    return pillar.profile_pillar()
+
+
 def clear_pillar_cache(minion="*", **kwargs):
     """
     Clears the cached values when using pillar_cache
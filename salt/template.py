@@ -87,6 +87,8 @@ def compile_template(
 
     input_data = io.StringIO(input_data)
     for render, argline in render_pipe:
+        if kwargs.get("_render_inputs") is not None:
+            kwargs["_render_inputs"].renderer(render.__module__.split(".")[-1])
         if salt.utils.stringio.is_readable(input_data):
             input_data.seek(0)  # pylint: disable=no-member
         render_kwargs = dict(renderers=renderers, tmplpath=template)
@@ -6,11 +6,13 @@ import multiprocessing
 import os
 import shutil
 
+import salt.cache
 import salt.crypt
 import salt.ext.tornado.gen
 import salt.master
 import salt.payload
 import salt.transport.frame
+import salt.utils.compression
 import salt.utils.event
 import salt.utils.files
 import salt.utils.minions
@@ -113,6 +115,10 @@ class AESReqServerMixin:
 
         self.master_key = salt.crypt.MasterKeys(self.opts)
 
+        # Which compression algorithms each minion accepts is recorded in the
+        # cache, the publisher needs to know it
+        self.cache = salt.cache.factory(self.opts)
+
     def _encrypt_private(self, ret, dictkey, target):
         """
         The server equivalent of ReqChannel.crypted_transfer_decode_dictentry
@@ -154,6 +160,15 @@ class AESReqServerMixin:
             return True
         return False
 
+    def _reply_compression(self, payload):
+        """
+        Return the compression algorithm to encrypt the reply to ``payload``
+        with, or None if the sender does not accept compressed replies
+        """
+        return salt.utils.compression.negotiate(
+            salt.utils.compression.enabled(self.opts), [payload.get("compression")]
+        )
+
     def _decode_payload(self, payload):
         # we need to decrypt it
         if payload["enc"] == "aes":
@@ -460,8 +475,24 @@ class AESReqServerMixin:
             "enc": "pub",
             "pub_key": self.master_key.get_pub_str(),
             "publish_port": self.opts["publish_port"],
+            # Syndics may send their returns compressed, see
+            # syndic_forward_compress
+            "syndic_return_gz": True,
         }
 
+        compression = salt.utils.compression.enabled(self.opts)
+        if compression:
+            salt.utils.compression.store_minion_algorithms(
+                self.cache,
+                load["id"],
+                [
+                    algorithm
+                    for algorithm in compression
+                    if algorithm in load.get("compression", [])
+                ],
+            )
+            ret["compression"] = compression
+
         # sign the master's pubkey (if enabled) before it is
         # sent to the minion that was just authenticated
         if self.opts["master_sign_pubkey"]:
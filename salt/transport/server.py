@@ -4,6 +4,12 @@ Encapsulate the different transports available to Salt.
 This includes server side transport, for the ReqServer and the Publisher
 """
 
+import logging
+
+import salt.utils.compression
+
+log = logging.getLogger(__name__)
+
 
 class ReqServerChannel:
     """
@@ -60,6 +66,9 @@ class PubServerChannel:
     Factory class to create subscription channels to the master's Publisher
     """
 
+    # The AES key and the Crypticle used by _publish_crypticle
+    _crypticle = (None, None)
+
     @staticmethod
     def factory(opts, **kwargs):
         # Default to ZeroMQ for now
@@ -100,3 +109,44 @@ class PubServerChannel:
         Publish "load" to minions
         """
         raise NotImplementedError()
+
+    def _publish_crypticle(self):
+        """
+        Return the Crypticle for the current AES key of the master. It is
+        shared by the publisher channels of a process and only made again
+        after the key was rotated.
+        """
+        import salt.crypt
+        import salt.master
+
+        key = salt.master.SMaster.secrets["aes"]["secret"].value
+        cached_key, crypticle = PubServerChannel._crypticle
+        if crypticle is None or cached_key != key:
+            crypticle = salt.crypt.Crypticle(self.opts, key)
+            PubServerChannel._crypticle = (key, crypticle)
+        return crypticle
+
+    def _encrypt_load(self, crypticle, load):
+        """
+        Serialize and encrypt a publish load. Loads larger than
+        ``transport_compression_threshold`` are compressed when every known
+        minion has agreed to a common algorithm.
+        """
+        preferred = salt.utils.compression.enabled(self.opts)
+        if not preferred:
+            return crypticle.dumps(load)
+        data = crypticle.serial.dumps(load)
+        compression = None
+        if len(data) > self.opts["transport_compression_threshold"]:
+            if getattr(self, "_negotiator", None) is None:
+                self._negotiator = salt.utils.compression.PublishNegotiator(
+                    self.ckminions.cache
+                )
+            compression = self._negotiator.algorithm(preferred)
+            log.debug(
+                "Publish of %d bytes for jid %s compressed with %s",
+                len(data),
+                load.get("jid"),
+                compression,
+            )
+        return crypticle.dumps_serialized(data, compression)
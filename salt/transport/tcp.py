@@ -1729,10 +1729,8 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
         """
         payload = {"enc": "aes"}
 
-        crypticle = salt.crypt.Crypticle(
-            self.opts, salt.master.SMaster.secrets["aes"]["secret"].value
-        )
-        payload["load"] = crypticle.dumps(load)
+        crypticle = self._publish_crypticle()
+        payload["load"] = self._encrypt_load(crypticle, load)
         if self.opts["sign_pub_messages"]:
             master_pem_path = os.path.join(self.opts["pki_dir"], "master.pem")
             log.debug("Signing data packet")
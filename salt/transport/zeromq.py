@@ -1,14 +1,17 @@
 """
 Zeromq transport classes
 """
+import collections
 import copy
 import errno
+import fnmatch
 import hashlib
 import logging
 import os
 import signal
 import sys
 import threading
+import time
 import weakref
 from random import randint
 
@@ -23,6 +26,7 @@ import salt.payload
 import salt.transport.client
 import salt.transport.mixins.auth
 import salt.transport.server
+import salt.utils.compression
 import salt.utils.event
 import salt.utils.files
 import salt.utils.minions
@@ -65,6 +69,10 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The key of the reply asking a client to send a shed request again, mapped
+# to the number of seconds to wait
+RETRY_LATER = "__retry_later__"
+
 
 def _get_master_uri(master_ip, master_port, source_ip=None, source_port=None):
     """
@@ -333,11 +341,18 @@ class AsyncZeroMQReqChannel(salt.transport.client.ReqChannel):
         # if we've reached here something is very abnormal
         raise SaltException("ReqChannel: missing master_uri/master_ip in self.opts")
 
-    def _package_load(self, load):
-        return {
+    def _package_load(self, load, cmd=None):
+        package = {
             "enc": self.crypt,
             "load": load,
+            # This client sends a request again when the master asks it to
+            RETRY_LATER: True,
         }
+        if cmd is not None:
+            # Lets the MWorkerQueue route the request to the pool serving its
+            # command without decrypting it
+            package["cmd"] = cmd
+        return package
 
     @salt.ext.tornado.gen.coroutine
     def crypted_transfer_decode_dictentry(
@@ -348,7 +363,7 @@ class AsyncZeroMQReqChannel(salt.transport.client.ReqChannel):
             yield self.auth.authenticate()
         # Return control to the caller. When send() completes, resume by populating ret with the Future.result
         ret = yield self.message_client.send(
-            self._package_load(self.auth.crypticle.dumps(load)),
+            self._package_load(self.auth.crypticle.dumps(load), load.get("cmd")),
             timeout=timeout,
             tries=tries,
         )
@@ -357,7 +372,7 @@ class AsyncZeroMQReqChannel(salt.transport.client.ReqChannel):
             # Reauth in the case our key is deleted on the master side.
             yield self.auth.authenticate()
             ret = yield self.message_client.send(
-                self._package_load(self.auth.crypticle.dumps(load)),
+                self._package_load(self.auth.crypticle.dumps(load), load.get("cmd")),
                 timeout=timeout,
                 tries=tries,
             )
@@ -389,11 +404,26 @@ class AsyncZeroMQReqChannel(salt.transport.client.ReqChannel):
 
         @salt.ext.tornado.gen.coroutine
         def _do_transfer():
+            compression = salt.utils.compression.negotiate(
+                salt.utils.compression.enabled(self.opts),
+                (self.auth.creds or {}).get("compression"),
+            )
+            if compression:
+                package = self._package_load(
+                    self.auth.crypticle.dumps(
+                        load, compression, self.opts["transport_compression_threshold"],
+                    ),
+                    load.get("cmd"),
+                )
+                # Tell the master it may compress its reply
+                package["compression"] = compression
+            else:
+                package = self._package_load(
+                    self.auth.crypticle.dumps(load), load.get("cmd")
+                )
             # Yield control to the caller. When send() completes, resume by populating data with the Future.result
             data = yield self.message_client.send(
-                self._package_load(self.auth.crypticle.dumps(load)),
-                timeout=timeout,
-                tries=tries,
+                package, timeout=timeout, tries=tries,
             )
             # we may not have always data
             # as for example for saltcall ret submission, this is a blind
@@ -671,6 +701,9 @@ class AsyncZeroMQPubChannel(
 class ZeroMQReqServerChannel(
     salt.transport.mixins.auth.AESReqServerMixin, salt.transport.server.ReqServerChannel
 ):
+    # The pool of the MWorker this channel is forked into, for mworker_pools
+    worker_pool = None
+
     def __init__(self, opts):
         salt.transport.server.ReqServerChannel.__init__(self, opts)
         self._closing = False
@@ -701,17 +734,18 @@ class ZeroMQReqServerChannel(
             )
             os.nice(self.opts["mworker_queue_niceness"])
 
-        if self.opts.get("ipc_mode", "") == "tcp":
-            self.w_uri = "tcp://127.0.0.1:{}".format(
-                self.opts.get("tcp_master_workers", 4515)
-            )
-        else:
-            self.w_uri = "ipc://{}".format(
-                os.path.join(self.opts["sock_dir"], "workers.ipc")
-            )
+        self.w_uri = self._worker_uri()
 
         log.info("Setting up the master communication server")
         self.clients.bind(self.uri)
+
+        import salt.utils.master
+
+        pools = salt.utils.master.mworker_pools(self.opts)
+        if pools:
+            self._pool_device(pools)
+            return
+
         self.workers.bind(self.w_uri)
 
         while True:
@@ -726,6 +760,65 @@ class ZeroMQReqServerChannel(
             except (KeyboardInterrupt, SystemExit):
                 break
 
+    def _pool_device(self, pools):
+        """
+        Hand each request to the pool of workers serving its command, for
+        ``mworker_pools``
+        """
+        router = RequestPoolRouter(self.opts, pools)
+        poller = zmq.Poller()
+        poller.register(self.clients, zmq.POLLIN)
+        dealers = {}
+        for pool in pools:
+            dealer = self.context.socket(zmq.DEALER)
+            dealer.bind(self._worker_uri(pool))
+            dealers[pool] = dealer
+            poller.register(dealer, zmq.POLLIN)
+        try:
+            while True:
+                if self.clients.closed:
+                    break
+                try:
+                    events = dict(poller.poll(1000))
+                    if self.clients in events:
+                        frames = self.clients.recv_multipart()
+                        pool, admitted = router.admit(frames)
+                        if admitted:
+                            dealers[pool].send_multipart(frames)
+                        else:
+                            self.clients.send_multipart(
+                                frames[:-1] + [router.retry_reply(pool)]
+                            )
+                    for dealer in dealers.values():
+                        if dealer in events:
+                            frames = dealer.recv_multipart()
+                            router.done(frames)
+                            self.clients.send_multipart(frames)
+                    router.post_stats()
+                except zmq.ZMQError as exc:
+                    if exc.errno == errno.EINTR:
+                        continue
+                    raise
+                except (KeyboardInterrupt, SystemExit):
+                    break
+        finally:
+            for dealer in dealers.values():
+                dealer.close()
+
+    def _worker_uri(self, pool=None):
+        """
+        Return the URI the workers of ``pool`` connect to
+        """
+        if self.opts.get("ipc_mode", "") == "tcp":
+            return "tcp://127.0.0.1:{}".format(
+                self.opts.get("tcp_master_workers", 4515)
+            )
+        if pool is None or pool == "default":
+            name = "workers.ipc"
+        else:
+            name = "workers-{}.ipc".format(pool)
+        return "ipc://{}".format(os.path.join(self.opts["sock_dir"], name))
+
     def close(self):
         """
         Cleanly shutdown the router socket
@@ -792,14 +885,7 @@ class ZeroMQReqServerChannel(
         self._socket = self.context.socket(zmq.REP)
         self._start_zmq_monitor()
 
-        if self.opts.get("ipc_mode", "") == "tcp":
-            self.w_uri = "tcp://127.0.0.1:{}".format(
-                self.opts.get("tcp_master_workers", 4515)
-            )
-        else:
-            self.w_uri = "ipc://{}".format(
-                os.path.join(self.opts["sock_dir"], "workers.ipc")
-            )
+        self.w_uri = self._worker_uri(self.worker_pool)
         log.info("Worker binding to socket %s", self.w_uri)
         self._socket.connect(self.w_uri)
 
@@ -883,7 +969,15 @@ class ZeroMQReqServerChannel(
         if req_fun == "send_clear":
             stream.send(self.serial.dumps(ret))
         elif req_fun == "send":
-            stream.send(self.serial.dumps(self.crypticle.dumps(ret)))
+            stream.send(
+                self.serial.dumps(
+                    self.crypticle.dumps(
+                        ret,
+                        self._reply_compression(payload),
+                        self.opts["transport_compression_threshold"],
+                    )
+                )
+            )
         elif req_fun == "send_private":
             stream.send(
                 self.serial.dumps(
@@ -936,6 +1030,136 @@ def _set_tcp_keepalive(zmq_socket, opts):
             zmq_socket.setsockopt(zmq.TCP_KEEPALIVE_INTVL, opts["tcp_keepalive_intvl"])
 
 
+class RequestPoolRouter:
+    """
+    Bookkeeping of the MWorkerQueue for ``mworker_pools``. Picks the pool
+    serving each request, counts the requests each pool works on or queues,
+    sheds requests for pools whose queue is full and reports the queues in
+    the master stats events.
+
+    The requests are never decrypted here. The command of an AES request is
+    read from the envelope, where the request clients put it, and requests
+    are only shed when their client tells it sends them again when asked to.
+    Requests of older clients go to the default pool and are never shed.
+    """
+
+    # Requests without a reply after this many seconds are not counted
+    # anymore, e.g. when their worker was restarted. Clients give up on a
+    # request after 60 seconds by default.
+    request_timeout = 60
+
+    def __init__(self, opts, pools):
+        self.opts = opts
+        self.pools = pools
+        self.serial = salt.payload.Serial(opts)
+        # The envelope of each request a pool works on, mapped to the pool
+        # and the time the request was received
+        self.pending = {}
+        self.queued = collections.Counter()
+        self.stats = self._new_stats()
+        self.stat_clock = self._expire_clock = time.time()
+        self.event = None
+
+    def _new_stats(self):
+        return {
+            pool: {"requests": 0, "rejected": 0, "max_queued": 0} for pool in self.pools
+        }
+
+    def command(self, data):
+        """
+        Return the command of a serialized request, or None if it can not be
+        read, and whether its client may be asked to send it again. The
+        worker replies to malformed requests.
+        """
+        try:
+            payload = self.serial.loads(data)
+            retry = payload.get(RETRY_LATER) is True
+            if payload["enc"] == "clear":
+                return payload["load"]["cmd"], retry
+            return payload.get("cmd"), retry
+        except Exception:  # pylint: disable=broad-except
+            return None, False
+
+    def pool(self, cmd):
+        """
+        Return the pool serving the request command ``cmd``
+        """
+        if cmd is not None:
+            for name, pool in self.pools.items():
+                for glob in pool["commands"]:
+                    if fnmatch.fnmatch(cmd, glob):
+                        return name
+        return "default"
+
+    def _expire(self, now):
+        if now - self._expire_clock < 5:
+            return
+        self._expire_clock = now
+        for envelope, (pool, received) in list(self.pending.items()):
+            if now - received > self.request_timeout:
+                del self.pending[envelope]
+                self.queued[pool] -= 1
+
+    def admit(self, frames):
+        """
+        Return the pool which serves the request in ``frames`` and whether
+        the pool accepts it
+        """
+        now = time.time()
+        self._expire(now)
+        cmd, retry = self.command(frames[-1])
+        pool = self.pool(cmd)
+        stats = self.stats[pool]
+        stats["requests"] += 1
+        max_queue = self.pools[pool]["max_queue"]
+        if retry and max_queue and self.queued[pool] >= max_queue:
+            stats["rejected"] += 1
+            return pool, False
+        self.done(frames)
+        self.pending[tuple(frames[:-1])] = (pool, now)
+        self.queued[pool] += 1
+        stats["max_queued"] = max(stats["max_queued"], self.queued[pool])
+        return pool, True
+
+    def done(self, frames):
+        """
+        Stop counting the request which ``frames`` reply to
+        """
+        entry = self.pending.pop(tuple(frames[:-1]), None)
+        if entry is not None:
+            self.queued[entry[0]] -= 1
+
+    def retry_reply(self, pool):
+        """
+        Return the reply asking a client to send a shed request again
+        """
+        return self.serial.dumps({RETRY_LATER: self.pools[pool]["retry_delay"]})
+
+    def post_stats(self):
+        """
+        Fire an event with the queues of the pools every
+        ``master_stats_event_iter`` seconds if ``master_stats`` is enabled
+        """
+        if not self.opts.get("master_stats"):
+            return
+        now = time.time()
+        if now - self.stat_clock <= self.opts["master_stats_event_iter"]:
+            return
+        if self.event is None:
+            self.event = salt.utils.event.get_master_event(
+                self.opts, self.opts["sock_dir"], listen=False
+            )
+        pools = {}
+        for pool, stats in self.stats.items():
+            pools[pool] = dict(stats, queued=self.queued[pool])
+        self.event.fire_event(
+            {"time": now - self.stat_clock, "pools": pools},
+            salt.utils.event.tagify("MWorkerQueue", "stats"),
+        )
+        self.stats = self._new_stats()
+        self.stat_clock = now
+
+
 class ZeroMQPubServerChannel(salt.transport.server.PubServerChannel):
     """
     Encapsulate synchronous operations for a publisher channel
@@ -1024,7 +1248,10 @@ class ZeroMQPubServerChannel(salt.transport.server.PubServerChannel):
                     unpacked_package = salt.transport.frame.decode_embedded_strs(
                         unpacked_package
                     )
-                    payload = unpacked_package["payload"]
+                    if "unsigned" in unpacked_package:
+                        payload = self._sign_payload(unpacked_package["unsigned"])
+                    else:
+                        payload = unpacked_package["payload"]
                     log.trace("Accepted unpacked package from puller")
                     if self.opts["zmq_filtering"]:
                         # if you have a specific topic list, use that
@@ -1080,6 +1307,16 @@ class ZeroMQPubServerChannel(salt.transport.server.PubServerChannel):
         if context.closed is False:
             context.term()
 
+    def _sign_payload(self, payload):
+        """
+        Sign a payload which was passed to the publish daemon unsigned and
+        serialize it
+        """
+        master_pem_path = os.path.join(self.opts["pki_dir"], "master.pem")
+        log.trace("Signing data packet")
+        payload["sig"] = salt.crypt.sign_message(master_pem_path, payload["load"])
+        return self.serial.dumps(payload)
+
     def pre_fork(self, process_manager, kwargs=None):
         """
         Do anything necessary pre-fork. Since this is on the master side this will
@@ -1142,15 +1379,14 @@ class ZeroMQPubServerChannel(salt.transport.server.PubServerChannel):
         :param dict load: A load to be sent across the wire to minions
         """
         payload = {"enc": "aes"}
-        crypticle = salt.crypt.Crypticle(
-            self.opts, salt.master.SMaster.secrets["aes"]["secret"].value
-        )
-        payload["load"] = crypticle.dumps(load)
+        crypticle = self._publish_crypticle()
+        payload["load"] = self._encrypt_load(crypticle, load)
         if self.opts["sign_pub_messages"]:
-            master_pem_path = os.path.join(self.opts["pki_dir"], "master.pem")
-            log.debug("Signing data packet")
-            payload["sig"] = salt.crypt.sign_message(master_pem_path, payload["load"])
-        int_payload = {"payload": self.serial.dumps(payload)}
+            # The publish daemon signs the payload, so the worker does not
+            # wait for the RSA signature
+            int_payload = {"unsigned": payload}
+        else:
+            int_payload = {"payload": self.serial.dumps(payload)}
 
         # add some targeting stuff for lists only (for now)
         if load["tgt_type"] == "list":
@@ -1322,6 +1558,17 @@ class AsyncReqMessageClient:
             def mark_future(msg):
                 if not future.done():
                     data = self.serial.loads(msg[0])
+                    if isinstance(data, dict) and RETRY_LATER in data:
+                        # The master shed the request, the timeout of the
+                        # message still applies
+                        log.debug(
+                            "Master is busy, sending request again in %s seconds",
+                            data[RETRY_LATER],
+                        )
+                        self.io_loop.call_later(
+                            data[RETRY_LATER], self._send_again, message, future
+                        )
+                        return
                     future.set_result(data)
 
             self.stream.on_recv(mark_future)
@@ -1338,6 +1585,15 @@ class AsyncReqMessageClient:
             self.send_future_map.pop(message, None)
             self.remove_message_timeout(message)
 
+    def _send_again(self, message, future):
+        """
+        Send a request the master asked to send again, unless it timed out
+        or the socket was reset in the meantime
+        """
+        if self._closing or future.done() or self.send_queue[:1] != [message]:
+            return
+        self.stream.send(message)
+
     def remove_message_timeout(self, message):
         if message not in self.send_timeout_map:
             return
@@ -0,0 +1,174 @@
+"""
+Compression of transport payloads
+
+Payloads are compressed after serialization and before encryption. A
+compressed payload starts with the name of its algorithm, so it can be told
+apart from an uncompressed one once it is decrypted. Which algorithms a
+master and a minion may use is negotiated when the minion authenticates, so
+peers which do not know about compression never receive compressed data.
+
+.. versionadded:: 3004
+"""
+
+import logging
+import uuid
+import zlib
+
+import salt.utils.stringutils
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import lz4.frame
+
+    HAS_LZ4 = True
+except ImportError:
+    HAS_LZ4 = False
+
+log = logging.getLogger(__name__)
+
+CACHE_BANK = "compression"
+# The cache bank holding the algorithms each minion accepts
+MINIONS_BANK = "compression/minions"
+# Changed in CACHE_BANK whenever what a minion accepts changes
+UPDATED_KEY = "updated"
+
+
+def available():
+    """
+    Return the compression algorithms usable with the installed libraries,
+    fastest first
+    """
+    algorithms = []
+    if HAS_ZSTD:
+        algorithms.append("zstd")
+    if HAS_LZ4:
+        algorithms.append("lz4")
+    algorithms.append("zlib")
+    return algorithms
+
+
+def enabled(opts):
+    """
+    Return the algorithms listed in ``transport_compression`` which can be
+    used here, in the configured order of preference
+    """
+    usable = available()
+    return [
+        algorithm
+        for algorithm in opts.get("transport_compression") or []
+        if algorithm in usable
+    ]
+
+
+def negotiate(preferred, offered):
+    """
+    Return the first algorithm in ``preferred`` which is also in ``offered``,
+    or None
+    """
+    for algorithm in preferred:
+        if algorithm in (offered or ()):
+            return algorithm
+    return None
+
+
+def _prefix(algorithm):
+    return salt.utils.stringutils.to_bytes("{}::".format(algorithm))
+
+
+def pack(data, algorithm):
+    """
+    Compress the serialized ``data`` with ``algorithm`` and prefix it with the
+    algorithm name
+    """
+    if algorithm == "zstd":
+        compressed = zstandard.ZstdCompressor().compress(data)
+    elif algorithm == "lz4":
+        compressed = lz4.frame.compress(data)
+    elif algorithm == "zlib":
+        compressed = zlib.compress(data)
+    else:
+        raise ValueError("Unknown compression algorithm '{}'".format(algorithm))
+    return _prefix(algorithm) + compressed
+
+
+def unpack(data):
+    """
+    Decompress data produced by :py:func:`pack`. Return None if ``data`` was
+    not compressed with a known algorithm.
+    """
+    for algorithm in available():
+        prefix = _prefix(algorithm)
+        if not data.startswith(prefix):
+            continue
+        data = data[len(prefix) :]
+        if algorithm == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        if algorithm == "lz4":
+            return lz4.frame.decompress(data)
+        return zlib.decompress(data)
+    return None
+
+
+def store_minion_algorithms(cache, minion_id, algorithms):
+    """
+    Record in ``cache`` which algorithms ``minion_id`` accepts. An empty list
+    is recorded for minions which do not support compression.
+    """
+    algorithms = list(algorithms)
+    if cache.fetch(MINIONS_BANK, minion_id) != algorithms:
+        cache.store(MINIONS_BANK, minion_id, algorithms)
+        cache.store(CACHE_BANK, UPDATED_KEY, uuid.uuid4().hex)
+
+
+def forget_minion(cache, minion_id):
+    """
+    Drop what ``cache`` records for ``minion_id``, for instance after its
+    key was deleted
+    """
+    cache.flush(MINIONS_BANK, minion_id)
+    cache.store(CACHE_BANK, UPDATED_KEY, uuid.uuid4().hex)
+
+
+class PublishNegotiator:
+    """
+    Tracks the algorithms every known minion accepts, so a publication can be
+    compressed without looking up its targets. The minions are only read back
+    from the cache after an authentication changed what they accept.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._updated = None
+        self._accepted = []
+
+    def _refresh(self):
+        updated = self.cache.fetch(CACHE_BANK, UPDATED_KEY) or None
+        if updated is not None and updated == self._updated:
+            return
+        self._updated = updated
+        accepted = None
+        for minion_id in self.cache.list(MINIONS_BANK) or []:
+            algorithms = self.cache.fetch(MINIONS_BANK, minion_id) or []
+            if accepted is None:
+                accepted = list(algorithms)
+            else:
+                accepted = [
+                    algorithm for algorithm in accepted if algorithm in algorithms
+                ]
+            if not accepted:
+                break
+        self._accepted = accepted or []
+
+    def algorithm(self, preferred):
+        """
+        Return the first algorithm in ``preferred`` which every known minion
+        accepts, or None
+        """
+        self._refresh()
+        return negotiate(preferred, self._accepted)
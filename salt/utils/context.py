@@ -238,3 +238,125 @@ class NamespacedDictWrapper(MutableMapping, dict):
 
     def __str__(self):
         return self._dict().__str__()
+
+
+class TrackedDict(dict):
+    """
+    A copy of the dict ``data`` telling ``tracker`` what is read from it:
+    ``tracker.read(name, key, value)`` for a key, with ``MISSING`` as the
+    value of a missing key, and ``tracker.read_all(name, data)`` when the
+    whole dict is used. Changes are applied to ``data`` too, after calling
+    ``tracker.write(name)``.
+
+    .. versionadded:: 3004
+    """
+
+    # The value read for a missing key
+    MISSING = object()
+
+    def __init__(self, name, data, tracker):
+        super().__init__(data)
+        self._name = name
+        self._data = data
+        self._tracker = tracker
+
+    def _read(self, key):
+        value = super().get(key, self.MISSING)
+        self._tracker.read(self._name, key, value)
+        return value
+
+    def _read_all(self):
+        self._tracker.read_all(self._name, dict(dict.items(self)))
+
+    def _write(self):
+        self._tracker.write(self._name)
+
+    def __getitem__(self, key):
+        if self._read(key) is self.MISSING:
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        value = self._read(key)
+        return default if value is self.MISSING else value
+
+    def __contains__(self, key):
+        return self._read(key) is not self.MISSING
+
+    def __iter__(self):
+        self._read_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._read_all()
+        return super().__len__()
+
+    def __eq__(self, other):
+        self._read_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        self._read_all()
+        return super().__ne__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._read_all()
+        return super().__repr__()
+
+    def __reduce_ex__(self, protocol):
+        self._read_all()
+        return (dict, (dict(dict.items(self)),))
+
+    def keys(self):
+        self._read_all()
+        return super().keys()
+
+    def values(self):
+        self._read_all()
+        return super().values()
+
+    def items(self):
+        self._read_all()
+        return super().items()
+
+    def copy(self):
+        self._read_all()
+        return dict(dict.items(self))
+
+    def __setitem__(self, key, value):
+        self._write()
+        self._data[key] = value
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._write()
+        del self._data[key]
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        self._write()
+        self._data.setdefault(key, default)
+        return super().setdefault(key, default)
+
+    def pop(self, key, *args):
+        self._write()
+        self._data.pop(key, *args)
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self._write()
+        key, value = super().popitem()
+        self._data.pop(key, None)
+        return key, value
+
+    def update(self, *args, **kwargs):
+        self._write()
+        self._data.update(*args, **kwargs)
+        super().update(*args, **kwargs)
+
+    def clear(self):
+        self._write()
+        self._data.clear()
+        super().clear()
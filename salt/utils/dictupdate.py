@@ -64,6 +64,34 @@ def update(dest, upd, recursive_update=True, merge_lists=False):
     return dest
 
 
+def update_shared(dest, upd, merge_lists=False):
+    """
+    Return the result of :py:func:`update` on a deep copy of ``dest``, without
+    copying it: only the mappings and lists which change are copied, the
+    rest is shared with ``dest`` and ``upd``. Neither of them is modified.
+
+    .. versionadded:: 3004
+    """
+    if (not isinstance(dest, Mapping)) or (not isinstance(upd, Mapping)):
+        raise TypeError("Cannot update using non-dict types in dictupdate.update()")
+    ret = copy.copy(dest)
+    for key in upd:
+        val = upd[key]
+        try:
+            dest_subkey = dest.get(key, None)
+        except AttributeError:
+            dest_subkey = None
+        if isinstance(dest_subkey, Mapping) and isinstance(val, Mapping):
+            ret[key] = update_shared(dest_subkey, val, merge_lists=merge_lists)
+        elif merge_lists and isinstance(dest_subkey, list) and isinstance(val, list):
+            merged = copy.copy(dest_subkey)
+            merged.extend([x for x in val if x not in merged])
+            ret[key] = merged
+        else:
+            ret[key] = val
+    return ret
+
+
 def merge_list(obj_a, obj_b):
     ret = {}
     for key, val in obj_a.items():
@@ -74,7 +102,9 @@ def merge_list(obj_a, obj_b):
     return ret
 
 
-def merge_recurse(obj_a, obj_b, merge_lists=False):
+def merge_recurse(obj_a, obj_b, merge_lists=False, shared=False):
+    if shared:
+        return update_shared(obj_a, obj_b, merge_lists=merge_lists)
     copied = copy.deepcopy(obj_a)
     return update(copied, obj_b, merge_lists=merge_lists)
 
@@ -85,14 +115,33 @@ def merge_aggregate(obj_a, obj_b):
     return _yamlex_merge_recursive(obj_a, obj_b, level=1)
 
 
-def merge_overwrite(obj_a, obj_b, merge_lists=False):
+def merge_overwrite(obj_a, obj_b, merge_lists=False, shared=False):
+    if shared:
+        # The keys of obj_b replace the ones of obj_a, without merging
+        ret = copy.copy(obj_a)
+        ret.update(obj_b)
+        return ret
     for obj in obj_b:
         if obj in obj_a:
             obj_a[obj] = obj_b[obj]
     return merge_recurse(obj_a, obj_b, merge_lists=merge_lists)
 
 
-def merge(obj_a, obj_b, strategy="smart", renderer="yaml", merge_lists=False):
+def merge(
+    obj_a, obj_b, strategy="smart", renderer="yaml", merge_lists=False, shared=False
+):
+    """
+    Merge ``obj_b`` into ``obj_a`` with ``strategy``.
+
+    With ``shared=True``, the result shares the data which did not change with
+    ``obj_a`` and ``obj_b`` instead of being a copy of ``obj_a``, and
+    ``obj_a`` is not modified. This is much faster when merging into a large
+    ``obj_a`` many times, but the result, ``obj_a`` and ``obj_b`` must not be
+    modified in place afterwards.
+
+    .. versionchanged:: 3004
+        The ``shared`` argument was added.
+    """
     if strategy == "smart":
         if renderer.split("|")[-1] == "yamlex" or renderer.startswith("yamlex_"):
             strategy = "aggregate"
@@ -102,19 +151,19 @@ def merge(obj_a, obj_b, strategy="smart", renderer="yaml", merge_lists=False):
     if strategy == "list":
         merged = merge_list(obj_a, obj_b)
     elif strategy == "recurse":
-        merged = merge_recurse(obj_a, obj_b, merge_lists)
+        merged = merge_recurse(obj_a, obj_b, merge_lists, shared=shared)
     elif strategy == "aggregate":
         #: level = 1 merge at least root data
         merged = merge_aggregate(obj_a, obj_b)
     elif strategy == "overwrite":
-        merged = merge_overwrite(obj_a, obj_b, merge_lists)
+        merged = merge_overwrite(obj_a, obj_b, merge_lists, shared=shared)
     elif strategy == "none":
         # If we do not want to merge, there is only one pillar passed, so we can safely use the default recurse,
         # we just do not want to log an error
-        merged = merge_recurse(obj_a, obj_b)
+        merged = merge_recurse(obj_a, obj_b, shared=shared)
     else:
         log.warning("Unknown merging strategy '%s', fallback to recurse", strategy)
-        merged = merge_recurse(obj_a, obj_b)
+        merged = merge_recurse(obj_a, obj_b, shared=shared)
 
     return merged
 
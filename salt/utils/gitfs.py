@@ -3,6 +3,7 @@ Classes which provide the shared base for GitFS, git_pillar, and winrepo
 """
 
 
+import concurrent.futures
 import contextlib
 import copy
 import errno
@@ -21,6 +22,7 @@ from datetime import datetime
 
 import salt.ext.tornado.ioloop
 import salt.fileserver
+import salt.utils.atomicfile
 import salt.utils.configparser
 import salt.utils.data
 import salt.utils.files
@@ -51,6 +53,10 @@ GLOBAL_ONLY = ()
 
 SYMLINK_RECURSE_DEPTH = 100
 
+# Tree indexes which have not been used in this many seconds are removed from
+# the cache when a new index is written for the same remote.
+TREE_INDEX_MAX_AGE = 86400
+
 # Auth support (auth params can be global or per-remote, too)
 AUTH_PROVIDERS = ("pygit2",)
 AUTH_PARAMS = ("user", "password", "pubkey", "privkey", "passphrase", "insecure_auth")
@@ -458,6 +464,10 @@ class GitProvider:
         self.cachedir_basename = getattr(self, "name", self.hash)
         self.cachedir = salt.utils.path.join(cache_root, self.cachedir_basename)
         self.linkdir = salt.utils.path.join(cache_root, "links", self.cachedir_basename)
+        self.indexdir = salt.utils.path.join(
+            cache_root, "index", self.cachedir_basename
+        )
+        self._tree_indexes = {}
 
         if not os.path.isdir(self.cachedir):
             os.makedirs(self.cachedir)
@@ -1099,6 +1109,109 @@ class GitProvider:
         # No matches found
         return None
 
+    def get_tree_index(self, tgt_env):
+        """
+        Return a flat index of the tree for the specified environment. The
+        index is a dict with two keys: ``files``, mapping each file path in
+        the tree to a tuple of (blob SHA, filemode, symlink target), and
+        ``dirs``, a list of the directories in the tree.
+
+        Indexes are keyed on the SHA of the tree and persisted to the cache,
+        so the tree is only traversed again when the ref's contents change.
+        This requires that build_tree_index() and tree_sha() be implemented
+        in a sub-class.
+        """
+        tree = self.get_tree(tgt_env)
+        if not tree:
+            return None
+        tree_sha = self.tree_sha(tree)
+        cached = self._tree_indexes.get(tgt_env)
+        if cached is not None and cached[0] == tree_sha:
+            return cached[1]
+        index = self._read_tree_index(tree_sha)
+        if index is None:
+            start = time.time()
+            index = self.build_tree_index(tree)
+            log.profile(
+                "%s tree index rebuild remote=%s tree=%s duration=%s seconds",
+                self.role,
+                self.id,
+                tree_sha,
+                time.time() - start,
+            )
+            self._write_tree_index(tree_sha, index)
+        self._tree_indexes[tgt_env] = (tree_sha, index)
+        return index
+
+    def _read_tree_index(self, tree_sha):
+        """
+        Load a persisted tree index, returning None if there is none
+        """
+        index_path = salt.utils.path.join(self.indexdir, "{}.p".format(tree_sha))
+        serial = salt.payload.Serial(self.opts)
+        try:
+            with salt.utils.files.fopen(index_path, "rb") as fp_:
+                index = serial.load(fp_)
+            # Track usage so that pruning only removes stale indexes
+            os.utime(index_path, None)
+        except OSError as exc:
+            if exc.errno != errno.ENOENT:
+                log.error(
+                    "Unable to read %s tree index %s: %s", self.role, index_path, exc,
+                )
+            return None
+        except Exception as exc:  # pylint: disable=broad-except
+            log.warning(
+                "Invalid %s tree index %s, it will be rebuilt: %s",
+                self.role,
+                index_path,
+                exc,
+            )
+            return None
+        if not isinstance(index, dict) or "files" not in index:
+            return None
+        return index
+
+    def _write_tree_index(self, tree_sha, index):
+        """
+        Persist a tree index, and remove indexes for this remote which have
+        not been used recently
+        """
+        index_path = salt.utils.path.join(self.indexdir, "{}.p".format(tree_sha))
+        serial = salt.payload.Serial(self.opts)
+        try:
+            if not os.path.isdir(self.indexdir):
+                os.makedirs(self.indexdir)
+            with salt.utils.atomicfile.atomic_open(index_path, "wb") as fp_:
+                fp_.write(serial.dumps(index))
+        except OSError as exc:
+            log.error(
+                "Unable to write %s tree index %s: %s", self.role, index_path, exc,
+            )
+            return
+        log.trace("Wrote %s tree index %s", self.role, index_path)
+
+        now = time.time()
+        for filename in os.listdir(self.indexdir):
+            path = salt.utils.path.join(self.indexdir, filename)
+            try:
+                if now - os.path.getmtime(path) > TREE_INDEX_MAX_AGE:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def build_tree_index(self, tree):
+        """
+        This function must be overridden in a sub-class
+        """
+        raise NotImplementedError()
+
+    def tree_sha(self, tree):
+        """
+        This function must be overridden in a sub-class
+        """
+        raise NotImplementedError()
+
     def get_url(self):
         """
         Examine self.id and assign self.url (and self.branch, for git_pillar)
@@ -1779,58 +1892,72 @@ class Pygit2(GitProvider):
 
         return new
 
-    def dir_list(self, tgt_env):
+    def build_tree_index(self, tree):
         """
-        Get a list of directories for the target environment using pygit2
+        Traverse a pygit2 Tree object once, building the flat index used by
+        get_tree_index()
         """
+        files = {}
+        dirs = []
 
-        def _traverse(tree, blobs, prefix):
-            """
-            Traverse through a pygit2 Tree object recursively, accumulating all
-            the empty directories within it in the "blobs" list
-            """
+        def _traverse(tree, prefix):
             for entry in iter(tree):
                 if entry.oid not in self.repo:
                     # Entry is a submodule, skip it
                     continue
-                blob = self.repo[entry.oid]
-                if not isinstance(blob, pygit2.Tree):
-                    continue
-                blobs.append(
-                    salt.utils.path.join(prefix, entry.name, use_posixpath=True)
-                )
-                if blob:
-                    _traverse(
-                        blob,
-                        blobs,
-                        salt.utils.path.join(prefix, entry.name, use_posixpath=True),
-                    )
+                path = salt.utils.path.join(prefix, entry.name, use_posixpath=True)
+                obj = self.repo[entry.oid]
+                if isinstance(obj, pygit2.Tree):
+                    dirs.append(path)
+                    _traverse(obj, path)
+                elif isinstance(obj, pygit2.Blob):
+                    link_tgt = None
+                    if stat.S_ISLNK(entry.filemode):
+                        link_tgt = salt.utils.stringutils.to_unicode(obj.data)
+                    files[path] = (obj.hex, entry.filemode, link_tgt)
+
+        _traverse(tree, "")
+        return {"files": files, "dirs": dirs}
 
+    def tree_sha(self, tree):
+        """
+        Return the SHA of a pygit2 Tree object
+        """
+        return tree.hex
+
+    def _index_root(self, tgt_env, index):
+        """
+        Return the root for the target environment, with a trailing slash, or
+        None if the root is not a directory in the index
+        """
+        root = self.root(tgt_env).strip("/")
+        if not root:
+            return ""
+        if root not in index["dirs"]:
+            return None
+        return root + "/"
+
+    def dir_list(self, tgt_env):
+        """
+        Get a list of directories for the target environment using pygit2
+        """
         ret = set()
-        tree = self.get_tree(tgt_env)
-        if not tree:
+        index = self.get_tree_index(tgt_env)
+        if index is None:
             return ret
-        if self.root(tgt_env):
-            try:
-                oid = tree[self.root(tgt_env)].oid
-                tree = self.repo[oid]
-            except KeyError:
-                return ret
-            if not isinstance(tree, pygit2.Tree):
-                return ret
-            relpath = lambda path: os.path.relpath(path, self.root(tgt_env))
-        else:
-            relpath = lambda path: path
-        blobs = []
-        if tree:
-            _traverse(tree, blobs, self.root(tgt_env))
-        add_mountpoint = lambda path: salt.utils.path.join(
-            self.mountpoint(tgt_env), path, use_posixpath=True
-        )
-        for blob in blobs:
-            ret.add(add_mountpoint(relpath(blob)))
-        if self.mountpoint(tgt_env):
-            ret.add(self.mountpoint(tgt_env))
+        prefix = self._index_root(tgt_env, index)
+        if prefix is None:
+            return ret
+        mountpoint = self.mountpoint(tgt_env)
+        for path in index["dirs"]:
+            if path.startswith(prefix):
+                ret.add(
+                    salt.utils.path.join(
+                        mountpoint, path[len(prefix) :], use_posixpath=True
+                    )
+                )
+        if mountpoint:
+            ret.add(mountpoint)
         return ret
 
     def envs(self):
@@ -1917,102 +2044,57 @@ class Pygit2(GitProvider):
         """
         Get file list for the target environment using pygit2
         """
-
-        def _traverse(tree, blobs, prefix):
-            """
-            Traverse through a pygit2 Tree object recursively, accumulating all
-            the file paths and symlink info in the "blobs" dict
-            """
-            for entry in iter(tree):
-                if entry.oid not in self.repo:
-                    # Entry is a submodule, skip it
-                    continue
-                obj = self.repo[entry.oid]
-                if isinstance(obj, pygit2.Blob):
-                    repo_path = salt.utils.path.join(
-                        prefix, entry.name, use_posixpath=True
-                    )
-                    blobs.setdefault("files", []).append(repo_path)
-                    if stat.S_ISLNK(tree[entry.name].filemode):
-                        link_tgt = self.repo[tree[entry.name].oid].data
-                        blobs.setdefault("symlinks", {})[repo_path] = link_tgt
-                elif isinstance(obj, pygit2.Tree):
-                    _traverse(
-                        obj,
-                        blobs,
-                        salt.utils.path.join(prefix, entry.name, use_posixpath=True),
-                    )
-
         files = set()
         symlinks = {}
-        tree = self.get_tree(tgt_env)
-        if not tree:
+        index = self.get_tree_index(tgt_env)
+        if index is None:
             # Not found, return empty objects
             return files, symlinks
-        if self.root(tgt_env):
-            try:
-                # This might need to be changed to account for a root that
-                # spans more than one directory
-                oid = tree[self.root(tgt_env)].oid
-                tree = self.repo[oid]
-            except KeyError:
-                return files, symlinks
-            if not isinstance(tree, pygit2.Tree):
-                return files, symlinks
-            relpath = lambda path: os.path.relpath(path, self.root(tgt_env))
-        else:
-            relpath = lambda path: path
-        blobs = {}
-        if tree:
-            _traverse(tree, blobs, self.root(tgt_env))
-        add_mountpoint = lambda path: salt.utils.path.join(
-            self.mountpoint(tgt_env), path, use_posixpath=True
-        )
-        for repo_path in blobs.get("files", []):
-            files.add(add_mountpoint(relpath(repo_path)))
-        for repo_path, link_tgt in blobs.get("symlinks", {}).items():
-            symlinks[add_mountpoint(relpath(repo_path))] = link_tgt
+        prefix = self._index_root(tgt_env, index)
+        if prefix is None:
+            return files, symlinks
+        mountpoint = self.mountpoint(tgt_env)
+        for repo_path, (_, _, link_tgt) in index["files"].items():
+            if not repo_path.startswith(prefix):
+                continue
+            path = salt.utils.path.join(
+                mountpoint, repo_path[len(prefix) :], use_posixpath=True
+            )
+            files.add(path)
+            if link_tgt is not None:
+                symlinks[path] = link_tgt
         return files, symlinks
 
     def find_file(self, path, tgt_env):
         """
         Find the specified file in the specified environment
         """
-        tree = self.get_tree(tgt_env)
-        if not tree:
+        index = self.get_tree_index(tgt_env)
+        if index is None:
             # Branch/tag/SHA not found in repo
             return None, None, None
-        blob = None
-        mode = None
         depth = 0
         while True:
             depth += 1
             if depth > SYMLINK_RECURSE_DEPTH:
-                blob = None
-                break
+                return None, None, None
             try:
-                entry = tree[path]
-                mode = entry.filemode
-                if stat.S_ISLNK(mode):
-                    # Path is a symlink. The blob data corresponding to this
-                    # path's object ID will be the target of the symlink. Follow
-                    # the symlink and set path to the location indicated
-                    # in the blob data.
-                    link_tgt = self.repo[entry.oid].data
-                    path = salt.utils.path.join(
-                        os.path.dirname(path), link_tgt, use_posixpath=True
-                    )
-                else:
-                    blob = self.repo[entry.oid]
-                    if isinstance(blob, pygit2.Tree):
-                        # Path is a directory, not a file.
-                        blob = None
-                    break
+                blob_sha, mode, link_tgt = index["files"][path]
             except KeyError:
-                blob = None
+                return None, None, None
+            if link_tgt is None:
                 break
+            # Path is a symlink. Follow the symlink and set path to the
+            # location indicated in the blob data.
+            path = salt.utils.path.join(
+                os.path.dirname(path), link_tgt, use_posixpath=True
+            )
+        try:
+            blob = self.repo[blob_sha]
+        except KeyError:
+            return None, None, None
         if isinstance(blob, pygit2.Blob):
-            return blob, blob.hex, mode
+            return blob, blob_sha, mode
         return None, None, None
 
     def get_tree_from_branch(self, ref):
@@ -2285,6 +2367,10 @@ class GitBase:
             self.cache_root = salt.utils.path.join(self.opts["cachedir"], self.role)
             self.remote_root = salt.utils.path.join(self.cache_root, "remotes")
         self.env_cache = salt.utils.path.join(self.cache_root, "envs.p")
+        self.fetch_durations_cache = salt.utils.path.join(
+            self.cache_root, "fetch_durations.p"
+        )
+        self.fetch_durations = {}
         self.hash_cachedir = salt.utils.path.join(self.cache_root, "hash")
         self.file_list_cachedir = salt.utils.path.join(
             self.opts["cachedir"], "file_lists", self.role
@@ -2444,7 +2530,7 @@ class GitBase:
                 pass
         to_remove = []
         for item in cachedir_ls:
-            if item in ("hash", "refs"):
+            if item in ("hash", "refs", "index"):
                 continue
             path = salt.utils.path.join(self.cache_root, item)
             if os.path.isdir(path):
@@ -2523,29 +2609,122 @@ class GitBase:
             )
             remotes = []
 
-        changed = False
+        to_fetch = []
         for repo in self.remotes:
             name = getattr(repo, "name", None)
             if not remotes or (repo.id, name) in remotes or name in remotes:
-                try:
-                    if repo.fetch():
-                        # We can't just use the return value from repo.fetch()
-                        # because the data could still have changed if old
-                        # remotes were cleared above. Additionally, we're
-                        # running this in a loop and later remotes without
-                        # changes would override this value and make it
-                        # incorrect.
-                        changed = True
-                except Exception as exc:  # pylint: disable=broad-except
-                    log.error(
-                        "Exception caught while fetching %s remote '%s': %s",
-                        self.role,
-                        repo.id,
-                        exc,
-                        exc_info=True,
-                    )
+                to_fetch.append(repo)
+
+        workers = self.fetch_workers
+        changed = False
+        if workers > 1 and len(to_fetch) > 1:
+            # Each remote has its own update lock, so it is safe to fetch
+            # different remotes concurrently. The fetches themselves spend
+            # nearly all of their time waiting on the network.
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(workers, len(to_fetch))
+            ) as executor:
+                results = list(executor.map(self._fetch_remote, to_fetch))
+            changed = any(results)
+        else:
+            for repo in to_fetch:
+                # We can't just use the return value from repo.fetch()
+                # because the data could still have changed if old remotes
+                # were cleared above. Additionally, we're running this in a
+                # loop and later remotes without changes would override this
+                # value and make it incorrect.
+                if self._fetch_remote(repo):
+                    changed = True
+
+        if to_fetch:
+            self.write_fetch_durations()
         return changed
 
+    def _fetch_remote(self, repo):
+        """
+        Fetch a single remote, recording how long the fetch took. Returns
+        True if the remote was updated.
+        """
+        time_start = time.time()
+        try:
+            return bool(repo.fetch())
+        except Exception as exc:  # pylint: disable=broad-except
+            log.error(
+                "Exception caught while fetching %s remote '%s': %s",
+                self.role,
+                repo.id,
+                exc,
+                exc_info=True,
+            )
+            return False
+        finally:
+            duration = time.time() - time_start
+            log.debug(
+                "Fetch of %s remote '%s' took %.3f seconds",
+                self.role,
+                repo.id,
+                duration,
+            )
+            self.fetch_durations[repo.id] = {
+                "duration": round(duration, 3),
+                "timestamp": time_start,
+            }
+
+    @property
+    def fetch_workers(self):
+        """
+        Number of remotes which may be fetched concurrently, as defined by the
+        ``<role>_fetch_workers`` config option.
+        """
+        try:
+            workers = int(self.opts.get("{}_fetch_workers".format(self.role), 1))
+        except (TypeError, ValueError):
+            log.error(
+                "Invalid %s_fetch_workers value, fetching remotes serially", self.role,
+            )
+            workers = 1
+        return max(workers, 1)
+
+    def write_fetch_durations(self):
+        """
+        Write the durations of the most recent fetch of each remote to the
+        cache, so that they can be reported by the fileserver runner.
+        """
+        durations = self.read_fetch_durations()
+        durations.update(self.fetch_durations)
+        # Don't report on remotes which are no longer configured
+        remote_ids = {repo.id for repo in self.remotes}
+        durations = {x: y for x, y in durations.items() if x in remote_ids}
+        serial = salt.payload.Serial(self.opts)
+        try:
+            if not os.path.isdir(self.cache_root):
+                os.makedirs(self.cache_root)
+            with salt.utils.files.fopen(self.fetch_durations_cache, "wb+") as fp_:
+                fp_.write(serial.dumps(durations))
+        except OSError as exc:
+            log.error(
+                "Unable to write %s fetch durations to %s: %s",
+                self.role,
+                self.fetch_durations_cache,
+                exc,
+            )
+        else:
+            log.trace(
+                "Wrote %s fetch durations to %s", self.role, self.fetch_durations_cache,
+            )
+
+    def read_fetch_durations(self):
+        """
+        Return the durations of the most recent fetch of each remote, as
+        written by write_fetch_durations()
+        """
+        serial = salt.payload.Serial(self.opts)
+        try:
+            with salt.utils.files.fopen(self.fetch_durations_cache, "rb") as fp_:
+                return salt.utils.data.decode(serial.load(fp_)) or {}
+        except (OSError, ValueError, TypeError):
+            return {}
+
     def lock(self, remote=None):
         """
         Place an update.lk
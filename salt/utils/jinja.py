@@ -4,6 +4,7 @@ Jinja loading utils to enable a more powerful backend for jinja templates
 
 
 import atexit
+import hashlib
 import logging
 import os.path
 import pipes
@@ -18,7 +19,9 @@ from xml.dom import minidom
 from xml.etree.ElementTree import Element, SubElement, tostring
 
 import jinja2
+import jinja2.bccache
 import salt.fileclient
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.files
 import salt.utils.json
@@ -36,12 +39,67 @@ from salt.utils.versions import LooseVersion
 
 log = logging.getLogger(__name__)
 
-__all__ = ["SaltCacheLoader", "SerializerExtension"]
+__all__ = ["SaltBytecodeCache", "SaltCacheLoader", "SerializerExtension"]
 
 GLOBAL_UUID = uuid.UUID("91633EBF-1C86-5E33-935A-28061F4B480E")
 JINJA_VERSION = LooseVersion(jinja2.__version__)
 
 
+class SaltBytecodeCache(jinja2.bccache.FileSystemBytecodeCache):
+    """
+    A jinja bytecode cache storing the compiled templates in a directory of
+    the salt cachedir. Jinja only uses a cached template when the checksum of
+    its source matches, so a changed template is compiled again.
+
+    Several processes share the directory, so files are replaced atomically
+    and a file which cannot be read is treated like a missing one.
+
+    The code compiled by jinja depends on the settings of the environment,
+    like ``trim_blocks`` or the extensions, so ``settings`` is part of the
+    cache key of every template.
+    """
+
+    def __init__(self, directory, settings=""):
+        super().__init__(directory, "%s.jinja")
+        self.settings = settings
+
+    def get_cache_key(self, name, filename=None):
+        key = super().get_cache_key(name, filename)
+        return hashlib.sha1(
+            salt.utils.stringutils.to_bytes("{}|{}".format(key, self.settings))
+        ).hexdigest()
+
+    def load_bytecode(self, bucket):
+        try:
+            super().load_bytecode(bucket)
+        except Exception:  # pylint: disable=broad-except
+            log.debug("Unable to load the cached jinja template %s", bucket.key)
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory, 0o700)
+            with salt.utils.atomicfile.atomic_open(
+                self._get_cache_filename(bucket), "wb"
+            ) as ofile:
+                bucket.write_bytecode(ofile)
+        except OSError as exc:
+            log.debug("Unable to cache the jinja template %s: %s", bucket.key, exc)
+
+    def compile(self, environment, name, source):
+        """
+        Return the code of the template ``source`` named ``name``, compiling
+        it only if it is not cached yet. Like ``Environment.from_string``,
+        the code refers to ``<template>`` in tracebacks.
+        """
+        bucket = self.get_bucket(environment, name, None, source)
+        if bucket.code is None:
+            bucket.code = environment.compile(source)
+            self.set_bucket(bucket)
+        return bucket.code
+
+
 class SaltCacheLoader(BaseLoader):
     """
     A special jinja Template Loader for salt.
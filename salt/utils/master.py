@@ -7,8 +7,10 @@
 """
 
 
+import collections
 import logging
 import os
+import re
 import signal
 from threading import Event, Thread
 
@@ -872,6 +874,53 @@ def get_master_key(key_user, opts, skip_perm_errors=False):
         return ""
 
 
+def mworker_pools(opts):
+    """
+    Return the pools of MWorkers configured in ``mworker_pools``, in the order
+    their commands are matched. Each pool maps to the globs of the request
+    commands it serves, its number of workers, the number of requests it may
+    queue and the delay after which shed requests are sent again. The
+    ``default`` pool serves all other commands with ``worker_threads``
+    workers unless configured otherwise.
+
+    An empty dict is returned when no pools are configured or the request
+    server can not use them.
+    """
+    configured = opts.get("mworker_pools") or {}
+    if not configured:
+        return {}
+    import salt.transport
+
+    transports = [
+        transport for transport, _ in salt.transport.iter_transport_opts(opts)
+    ]
+    if "zeromq" not in transports or opts.get("ipc_mode", "") == "tcp":
+        log.warning(
+            "mworker_pools need the zeromq transport and ipc_mode ipc, ignoring them"
+        )
+        return {}
+    pools = collections.OrderedDict()
+    for name, pool in configured.items():
+        if not re.match(r"^[\w-]+$", name) or not isinstance(pool, dict):
+            log.error("Invalid mworker_pools entry %s, ignoring mworker_pools", name)
+            return {}
+        pools[name] = {
+            "commands": list(pool.get("commands") or []),
+            "workers": int(pool.get("workers", 1)),
+            "max_queue": int(pool.get("max_queue", 0)),
+            "retry_delay": pool.get("retry_delay", 1),
+        }
+    default = configured.get("default", {})
+    pools.pop("default", None)
+    pools["default"] = {
+        "commands": ["*"],
+        "workers": int(default.get("workers", opts["worker_threads"])),
+        "max_queue": int(default.get("max_queue", 0)),
+        "retry_delay": default.get("retry_delay", 1),
+    }
+    return pools
+
+
 def get_values_of_matching_keys(pattern_dict, user_name):
     """
     Check a whitelist and/or blacklist to see if the value matches it.
@@ -4,12 +4,18 @@ Utility functions for minions
 
 # Import Python Libs
 
+import collections
+import functools
 import logging
+import multiprocessing
 import os
 import threading
 
 # Import Salt Libs
+import salt.ext.tornado.gen
+import salt.ext.tornado.locks
 import salt.payload
+import salt.utils.crypt
 import salt.utils.files
 import salt.utils.platform
 import salt.utils.process
@@ -146,3 +152,195 @@ def _check_cmdline(data):
                 return True
     except OSError:
         return False
+
+
+def _job_worker(target, minion_instance, opts, conn):
+    """
+    Main loop of a pooled job worker. Jobs are read from ``conn`` and run
+    with ``target`` until the pool sends ``None`` or closes the pipe.
+    """
+    salt.utils.process.appendproctitle("JobWorker")
+    title = None
+    if salt.utils.process.HAS_SETPROCTITLE:
+        title = salt.utils.process.setproctitle.getproctitle()
+    # Load the modules once, the jobs run by this worker all share them
+    minion_instance.gen_modules()
+    minion_instance._job_worker = True
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        data, connected = job
+        minion_instance.connected = connected
+        try:
+            target(minion_instance, opts, data, connected)
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Job %s failed in job worker", data.get("jid"))
+        finally:
+            # The proc file carries our pid, which stays alive after the job
+            fn_ = os.path.join(minion_instance.proc_dir, str(data.get("jid")))
+            try:
+                os.remove(fn_)
+            except OSError:
+                pass
+            if title is not None:
+                salt.utils.process.setproctitle.setproctitle(title)
+        try:
+            conn.send(True)
+        except (EOFError, OSError):
+            break
+
+
+class RunningJob:
+    """
+    A job found in the proc directory, which was started by an earlier
+    minion process and can only be followed by its pid
+    """
+
+    def __init__(self, data):
+        self.jid = data["jid"]
+        self.pid = data["pid"]
+
+    def is_alive(self):
+        return salt.utils.process.os_is_running(self.pid)
+
+
+class _PooledWorker:
+    """
+    Bookkeeping for one process of a :py:class:`JobWorkerPool`
+    """
+
+    def __init__(self, process, conn, generation):
+        self.process = process
+        self.conn = conn
+        self.generation = generation
+        self.jobs = 0
+
+
+class JobWorkerPool:
+    """
+    A pool of pre-forked processes which run minion jobs.
+
+    The workers are forked from the minion once its modules are loaded and
+    receive jobs over a pipe, so a job does not pay for a fork and a fresh
+    loader. The size of the pool caps the number of jobs running at once.
+    Workers are replaced after ``max_jobs`` jobs, when they die, and after
+    :py:meth:`recycle` was called because the modules or pillar changed.
+    """
+
+    def __init__(self, opts, target, minion_instance, io_loop, size, max_jobs=0):
+        self.opts = opts
+        self.target = target
+        self.minion_instance = minion_instance
+        self.io_loop = io_loop
+        self.size = size
+        self.max_jobs = max_jobs
+        self.generation = 0
+        self._idle = collections.deque()
+        self._busy = set()
+        # Workers which were told to exit, joined once they did
+        self._retired = salt.utils.process.SubprocessList()
+        self._semaphore = salt.ext.tornado.locks.Semaphore(size)
+        for _ in range(size):
+            self._idle.append(self._spawn())
+
+    def _spawn(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = salt.utils.process.SignalHandlingProcess(
+            target=_job_worker,
+            name="JobWorker",
+            args=(self.target, self.minion_instance, self.opts, child_conn),
+        )
+        process._after_fork_methods.append((salt.utils.crypt.reinit_crypto, [], {}))
+        process.start()
+        child_conn.close()
+        log.debug("Started job worker with PID %s", process.pid)
+        return _PooledWorker(process, parent_conn, self.generation)
+
+    def _retire(self, worker):
+        log.debug("Retiring job worker with PID %s", worker.process.pid)
+        try:
+            worker.conn.send(None)
+        except (EOFError, OSError):
+            pass
+        worker.conn.close()
+        self._retired.add(worker.process)
+        self._retired.cleanup()
+
+    def _usable(self, worker):
+        if not worker.process.is_alive():
+            return False
+        if worker.generation != self.generation:
+            return False
+        if self.max_jobs > 0 and worker.jobs >= self.max_jobs:
+            return False
+        return True
+
+    @salt.ext.tornado.gen.coroutine
+    def dispatch(self, data, connected):
+        """
+        Hand a job to an idle worker, waiting for one to become available.
+        The coroutine returns as soon as the job was sent to the worker.
+        """
+        yield self._semaphore.acquire()
+        worker = self._idle.popleft()
+        if not self._usable(worker):
+            self._retire(worker)
+            worker = self._spawn()
+        try:
+            worker.conn.send((data, connected))
+        except (EOFError, OSError):
+            self._retire(worker)
+            worker = self._spawn()
+            worker.conn.send((data, connected))
+        self._busy.add(worker)
+        self.io_loop.add_handler(
+            worker.conn.fileno(),
+            functools.partial(self._job_done, worker),
+            self.io_loop.READ,
+        )
+
+    def _job_done(self, worker, fd, events):
+        self.io_loop.remove_handler(fd)
+        self._busy.discard(worker)
+        try:
+            worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died mid-job, e.g. through saltutil.kill_job
+            log.debug("Job worker with PID %s exited", worker.process.pid)
+        worker.jobs += 1
+        if not self._usable(worker):
+            self._retire(worker)
+            worker = self._spawn()
+        else:
+            self._retired.cleanup()
+        self._idle.append(worker)
+        self._semaphore.release()
+
+    def recycle(self):
+        """
+        Mark all workers as stale so they get replaced, and thereby pick up
+        the current state of the minion, before they run another job.
+        """
+        self.generation += 1
+
+    def stop(self):
+        """
+        Terminate all workers and wait for them to exit
+        """
+        processes = list(self._retired.processes)
+        for worker in list(self._idle) + list(self._busy):
+            if worker in self._busy:
+                self.io_loop.remove_handler(worker.conn.fileno())
+            worker.conn.close()
+            if worker.process.is_alive():
+                worker.process.terminate()
+            processes.append(worker.process)
+        for process in processes:
+            process.join(5)
+        self._idle.clear()
+        self._busy.clear()
+        self._retired = salt.utils.process.SubprocessList()
@@ -4,10 +4,13 @@ expected to return
 """
 
 
+import collections
+import copy
 import fnmatch
 import logging
 import os
 import re
+import threading
 
 import salt.auth.ldap
 import salt.cache
@@ -197,6 +200,97 @@ def nodegroup_comp(nodegroup, nodegroups, skip=None, first_call=True):
         return ret
 
 
+# The compound targets parsed by parse_compound, least recently used first
+_COMPOUND_CACHE = collections.OrderedDict()
+_COMPOUND_CACHE_LOCK = threading.Lock()
+COMPOUND_CACHE_SIZE = 1000
+
+
+def _parse_compound(words, nodegroups):
+    """
+    Parse the words of a compound target, see :py:func:`parse_compound`.
+    Returns the parsed words, or None, and whether a nodegroup was expanded.
+    """
+    opers = ["and", "or", "not", "(", ")"]
+    words = list(words)
+    ret = []
+    expanded = False
+    while words:
+        word = words.pop(0)
+        if not isinstance(word, str):
+            word = str(word)
+        if word in opers:
+            if ret:
+                if ret[-1] == "(" and word in ("and", "or"):
+                    log.error('Invalid beginning operator after "(": %s', word)
+                    return None, expanded
+                if word == "not":
+                    if not ret[-1] in ("and", "or", "("):
+                        ret.append("and")
+                ret.append(word)
+            else:
+                # seq start with binary oper, fail
+                if word not in ["(", "not"]:
+                    log.error("Invalid beginning operator: %s", word)
+                    return None, expanded
+                ret.append(word)
+            continue
+        target_info = parse_target(word)
+        if target_info and target_info["engine"] == "N":
+            # Evaluate the nodegroup in-place
+            expanded = True
+            decomposed = nodegroup_comp(target_info["pattern"], nodegroups)
+            if decomposed:
+                words = list(decomposed) + words
+            continue
+        if not target_info or not target_info["engine"]:
+            # The match is not explicitly defined, evaluate it as a glob
+            target_info = {"engine": None, "delimiter": None, "pattern": word}
+        ret.append(target_info)
+    return tuple(ret), expanded
+
+
+def parse_compound(tgt, nodegroups=None):
+    """
+    Return the compound target ``tgt``, a string or a list of words, with its
+    nodegroups expanded from ``nodegroups``. Each word is either one of the
+    operators ``and``, ``or``, ``not``, ``(`` and ``)``, with the implicit
+    ``and`` in front of a ``not`` added, or the dict returned by
+    :py:func:`parse_target` for a target expression. A target expression
+    without an engine is a glob, its engine is None.
+
+    Returns None if the operators of ``tgt`` are invalid. The parsed targets
+    are cached by their expression, so matching the same top file targets for
+    each minion does not parse them again. Do not change the returned tuple
+    or dicts.
+
+    .. versionadded:: 3004
+    """
+    if nodegroups is None:
+        nodegroups = {}
+    if isinstance(tgt, str):
+        key = tgt
+        words = tgt.split()
+    else:
+        key = tuple(str(word) for word in tgt)
+        words = tgt
+    with _COMPOUND_CACHE_LOCK:
+        entry = _COMPOUND_CACHE.get(key)
+        if entry is not None:
+            used_nodegroups, parsed = entry
+            # The expansion of nodegroups is only reused with the same ones
+            if used_nodegroups is None or used_nodegroups == nodegroups:
+                _COMPOUND_CACHE.move_to_end(key)
+                return parsed
+    parsed, expanded = _parse_compound(words, nodegroups)
+    with _COMPOUND_CACHE_LOCK:
+        _COMPOUND_CACHE[key] = (copy.deepcopy(nodegroups) if expanded else None, parsed)
+        _COMPOUND_CACHE.move_to_end(key)
+        while len(_COMPOUND_CACHE) > COMPOUND_CACHE_SIZE:
+            _COMPOUND_CACHE.popitem(last=False)
+    return parsed
+
+
 class CkMinions:
     """
     Used to check what minions should respond from a target
@@ -1046,7 +1046,7 @@ class SubprocessList:
 
     def cleanup(self):
         with self.lock:
-            for proc in self.processes:
+            for proc in list(self.processes):
                 if proc.is_alive():
                     continue
                 proc.join()
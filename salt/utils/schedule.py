@@ -9,9 +9,11 @@ Detailed tutorial about scheduling jobs can be found :ref:`here
 """
 
 
+import collections
 import copy
 import datetime
 import errno
+import heapq
 import itertools
 import logging
 import os
@@ -184,6 +186,18 @@ class Schedule:
             self._subprocess_list = salt.utils.process.SubprocessList()
         else:
             self._subprocess_list = _subprocess_list
+        # Jobs which do not need to be evaluated before their next fire time,
+        # mapped to that time and their schedule data, and a heap of those
+        # times to find the jobs which are due
+        self._deferred = {}
+        self._eval_heap = []
+        self._last_eval = None
+        self._last_eval_settings = None
+        # The thread pool for jobs with run_mode thread, created on first use,
+        # and the number of queued or running runs of each of those jobs
+        self._thread_pool = None
+        self._thread_jobs = collections.Counter()
+        self._thread_jobs_lock = threading.Lock()
 
     def __getnewargs__(self):
         return self.opts, self.functions, self.returners, self.intervals, None
@@ -274,6 +288,88 @@ class Schedule:
                             return data
         return data
 
+    def _invalidate(self, name=None):
+        """
+        Make eval() look at the job ``name``, or at all jobs, on its next run
+        """
+        if name is None:
+            self._deferred = {}
+            self._eval_heap = []
+        else:
+            self._deferred.pop(name, None)
+
+    def _due_jobs(self, schedule, now, hidden):
+        """
+        Return the names of the jobs eval() has to look at: the new or
+        modified ones and the ones whose next fire time has come. All other
+        jobs are skipped without parsing their schedule again.
+        """
+        settings = (
+            self.enabled,
+            self.skip_function,
+            self.skip_during_range,
+            self.splay,
+        )
+        if (
+            self._last_eval is not None
+            and now < self._last_eval
+            or settings != self._last_eval_settings
+        ):
+            # The clock went backwards or the global settings changed
+            self._invalidate()
+        self._last_eval = now
+        self._last_eval_settings = settings
+
+        while self._eval_heap and self._eval_heap[0][0] <= now:
+            fire_time, name = heapq.heappop(self._eval_heap)
+            if self._deferred.get(name, (None,))[0] == fire_time:
+                del self._deferred[name]
+
+        due = set()
+        for job, data in schedule.items():
+            if job in hidden:
+                continue
+            deferred = self._deferred.get(job)
+            if deferred is None or deferred[1] is not data:
+                due.add(job)
+        return due
+
+    @staticmethod
+    def _next_eval_time(data):
+        """
+        Return the time until which eval() can skip a job, or None if the job
+        has to be looked at every time. Only jobs with a plain interval, cron
+        or once schedule and a known next fire time are skipped.
+        """
+        if not isinstance(data, dict):
+            return None
+        if "_seconds" not in data and "cron" not in data and "once" not in data:
+            return None
+        for item in ("when", "run_explicit", "_run_on_start", "_splay", "splay"):
+            if data.get(item):
+                return None
+        if data.get("_continue") or data.get("_error"):
+            return None
+        next_fire_time = data.get("_next_fire_time")
+        if not isinstance(next_fire_time, datetime.datetime):
+            return None
+        return next_fire_time - datetime.timedelta(
+            microseconds=next_fire_time.microsecond
+        )
+
+    def _defer_jobs(self, schedule, jobs):
+        """
+        Remember until when the evaluated ``jobs`` can be skipped
+        """
+        for job in jobs:
+            data = schedule.get(job)
+            fire_time = self._next_eval_time(data)
+            if fire_time is None:
+                self._deferred.pop(job, None)
+                continue
+            self._deferred[job] = (fire_time, data)
+            heapq.heappush(self._eval_heap, (fire_time, job))
+
     def persist(self):
         """
         Persist the modified schedule into <<configdir>>/<<default_include>>/_schedule.conf
@@ -318,6 +414,7 @@ class Schedule:
         Deletes a job from the scheduler. Ignore jobs from pillar
         """
         # ensure job exists, then delete it
+        self._invalidate(name)
         if name in self.opts["schedule"]:
             del self.opts["schedule"][name]
         elif name in self._get_schedule(include_opts=False):
@@ -346,6 +443,7 @@ class Schedule:
         self.enabled = True
         self.splay = None
         self.opts["schedule"] = {}
+        self._invalidate()
 
     def delete_job_prefix(self, name, persist=True):
         """
@@ -395,6 +493,7 @@ class Schedule:
                 data[job]["enabled"] = True
 
         new_job = next(iter(data.keys()))
+        self._invalidate(new_job)
 
         if new_job in self._get_schedule(include_opts=False):
             log.warning("Cannot update job %s, it's in the pillar!", new_job)
@@ -422,6 +521,7 @@ class Schedule:
         Enable a job in the scheduler. Ignores jobs from pillar
         """
         # ensure job exists, then enable it
+        self._invalidate(name)
         if name in self.opts["schedule"]:
             self.opts["schedule"][name]["enabled"] = True
             log.info("Enabling job %s in scheduler", name)
@@ -443,6 +543,7 @@ class Schedule:
         Disable a job in the scheduler. Ignores jobs from pillar
         """
         # ensure job exists, then disable it
+        self._invalidate(name)
         if name in self.opts["schedule"]:
             self.opts["schedule"][name]["enabled"] = False
             log.info("Disabling job %s in scheduler", name)
@@ -464,6 +565,7 @@ class Schedule:
         Modify a job in the scheduler. Ignores jobs from pillar
         """
         # ensure job exists, then replace it
+        self._invalidate(name)
         if name in self.opts["schedule"]:
             self.delete_job(name, persist)
         elif name in self._get_schedule(include_opts=False):
@@ -547,6 +649,7 @@ class Schedule:
         """
         # Remove all jobs from self.intervals
         self.intervals = {}
+        self._invalidate()
 
         if "schedule" in schedule:
             schedule = schedule["schedule"]
@@ -590,6 +693,7 @@ class Schedule:
         time_fmt = data.get("time_fmt", "%Y-%m-%dT%H:%M:%S")
 
         # ensure job exists, then disable it
+        self._invalidate(name)
         if name in self.opts["schedule"]:
             if "skip_explicit" not in self.opts["schedule"][name]:
                 self.opts["schedule"][name]["skip_explicit"] = []
@@ -622,6 +726,7 @@ class Schedule:
         time_fmt = data.get("time_fmt", "%Y-%m-%dT%H:%M:%S")
 
         # ensure job exists, then disable it
+        self._invalidate(name)
         if name in self.opts["schedule"]:
             if "skip_explicit" not in self.opts["schedule"][name]:
                 self.opts["schedule"][name]["skip_explicit"] = []
@@ -683,7 +788,11 @@ class Schedule:
         """
         Execute this method in a multiprocess or thread
         """
-        if salt.utils.platform.is_windows() or self.opts.get("transport") == "zeromq":
+        if data.get("run_mode") == "thread" and self.opts["__role"] != "master":
+            # Jobs on the thread pool run in the process of the scheduler
+            # and use its loaded modules
+            pass
+        elif salt.utils.platform.is_windows() or self.opts.get("transport") == "zeromq":
             # Since function references can't be pickled and pickling
             # is required when spawning new processes on Windows, regenerate
             # the functions and returners.
@@ -1450,13 +1559,21 @@ class Schedule:
         if "splay" in schedule:
             self.splay = schedule["splay"]
 
+        if not now:
+            now = datetime.datetime.now()
+
         _hidden = ["enabled", "skip_function", "skip_during_range", "splay"]
+        due = self._due_jobs(schedule, now, _hidden)
         for job, data in schedule.items():
 
             # Skip anything that is a global setting
             if job in _hidden:
                 continue
 
+            # Skip the jobs which are known not to fire yet
+            if job not in due:
+                continue
+
             # Clear these out between runs
             for item in [
                 "_continue",
@@ -1568,6 +1685,7 @@ class Schedule:
             seconds = int(
                 (_chop_ms(data["_next_fire_time"]) - _chop_ms(now)).total_seconds()
             )
+            scheduled_time = data["_next_fire_time"]
 
             # If there is no job specific splay available,
             # grab the global which defaults to None.
@@ -1744,6 +1862,10 @@ class Schedule:
                 # Check run again, just in case _check_max_running
                 # set run to False
                 if run:
+                    # How late the job starts compared to its schedule
+                    lag = max((now - scheduled_time).total_seconds(), 0)
+                    data["_lag"] = lag
+                    data["_max_lag"] = max(data.get("_max_lag", 0), lag)
                     jid = salt.utils.jid.gen_jid(self.opts)
                     jids.append(jid)
                     log.info(
@@ -1772,6 +1894,7 @@ class Schedule:
                         data["_next_fire_time"] = now + datetime.timedelta(
                             seconds=data["_seconds"]
                         )
+        self._defer_jobs(schedule, due)
         return jids
 
     def _run_job(self, func, data, jid=None):
@@ -1790,6 +1913,10 @@ class Schedule:
             self.handle_func(False, func, data, jid)
             return
 
+        if self._run_in_thread(data):
+            self._run_job_in_thread(func, data, jid)
+            return
+
         if multiprocessing_enabled and salt.utils.platform.is_windows():
             # Temporarily stash our function references.
             # You can't pickle function references, and pickling is
@@ -1833,9 +1960,102 @@ class Schedule:
                 self.returners = returners
                 self.utils = utils
 
+    def _run_in_thread(self, data):
+        """
+        Return whether a job runs on the thread pool of the scheduler. Runners
+        are passed the jid and event of their run through their module
+        globals, which threads would share, so on the master jobs always get
+        a process of their own.
+        """
+        if data.get("run_mode") != "thread":
+            return False
+        if self.opts["__role"] == "master":
+            log.warning(
+                "schedule: Job %s can not use run_mode thread on the master, "
+                "running it in a process",
+                data["name"],
+            )
+            return False
+        return True
+
+    def _run_job_in_thread(self, func, data, jid):
+        """
+        Queue a job with run_mode thread on the thread pool of the scheduler
+        """
+        name = data["name"]
+        with self._thread_jobs_lock:
+            maxrunning = data.get("maxrunning")
+            if maxrunning and self._thread_jobs[name] >= maxrunning:
+                log.debug(
+                    "schedule: Job %s was not started, %s already queued or running",
+                    name,
+                    maxrunning,
+                )
+                data["_skip_reason"] = "maxrunning"
+                data["_skipped"] = True
+                data["_skipped_time"] = datetime.datetime.now()
+                return
+            self._thread_jobs[name] += 1
+
+        if self._thread_pool is None:
+            self._thread_pool = salt.utils.process.ThreadPool(
+                self.opts.get("schedule_worker_threads", 4),
+                queue_size=self.opts.get("schedule_worker_hwm", 100),
+            )
+        if not self._thread_pool.fire_async(
+            self._thread_job, args=[func, data, jid, time.time()]
+        ):
+            log.error(
+                "Queue of the schedule thread pool is full, skipping job %s", name
+            )
+            with self._thread_jobs_lock:
+                self._thread_jobs[name] -= 1
+
+    def _thread_job(self, func, data, jid, queued):
+        """
+        Run a job on a thread of the thread pool
+        """
+        name = data["name"]
+        started = time.time()
+        try:
+            waited = started - queued
+            data["_lag"] = data.get("_lag", 0) + waited
+            data["_max_lag"] = max(data.get("_max_lag", 0), data["_lag"])
+            timeout = data.get("timeout")
+            if timeout and waited > timeout:
+                log.warning(
+                    "schedule: Job %s waited %.1f seconds for a thread, longer "
+                    "than its timeout of %s seconds. Not running it.",
+                    name,
+                    waited,
+                    timeout,
+                )
+                return
+            self.handle_func(False, func, data, jid)
+            duration = time.time() - started
+            if timeout and duration > timeout:
+                log.warning(
+                    "schedule: Job %s ran for %.1f seconds, longer than its "
+                    "timeout of %s seconds",
+                    name,
+                    duration,
+                    timeout,
+                )
+        finally:
+            with self._thread_jobs_lock:
+                self._thread_jobs[name] -= 1
+
     def cleanup_subprocesses(self):
         self._subprocess_list.cleanup()
 
+    def running_job_count(self):
+        """
+        Return the number of scheduled jobs which are still running
+        """
+        return len(
+            [proc for proc in self._subprocess_list.processes if proc.is_alive()]
+        )
+
 
 def clean_proc_dir(opts):
 
@@ -0,0 +1,168 @@
+"""
+Per process pools of SQL connections
+
+The SQL ext_pillars and returners used to open a new connection to their
+database for each pillar compilation or return. They now take it from a pool
+of the process, which keeps up to ``sql_pool_size`` idle connections for
+``sql_pool_max_idle`` seconds, and checks that a connection is still usable
+before handing it out again.
+
+.. versionadded:: 3004
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# The pools of this process, keyed by get_pool
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def ping(conn):
+    """
+    Check that a DB-API connection still reaches its database
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class ConnectionPool:
+    """
+    Keeps up to ``size`` idle DB-API connections made by ``connect``. An
+    idle connection is closed once it was not used for ``max_idle`` seconds,
+    or when ``check`` raises or returns False for it. With a size of 0, every
+    connection is closed once it is released.
+    """
+
+    def __init__(self, connect, size=5, max_idle=300, check=None):
+        self.connect = connect
+        self.size = size
+        self.max_idle = max_idle
+        self.check = check
+        # The idle connections and when they were released, oldest first
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug("Failed to close a pooled SQL connection: %s", exc)
+
+    def _expired(self):
+        """
+        Remove the connections idle for too long and return them
+        """
+        if not self.max_idle:
+            return []
+        limit = time.time() - self.max_idle
+        with self._lock:
+            idx = 0
+            while idx < len(self._idle) and self._idle[idx][1] < limit:
+                idx += 1
+            expired = [conn for conn, _ in self._idle[:idx]]
+            del self._idle[:idx]
+        return expired
+
+    def acquire(self):
+        """
+        Return an idle connection which passed the check, or a new one
+        """
+        for conn in self._expired():
+            self._close(conn)
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, _ = self._idle.pop()
+            if self.check is not None:
+                try:
+                    alive = self.check(conn) is not False
+                except Exception as exc:  # pylint: disable=broad-except
+                    log.debug("Pooled SQL connection failed its check: %s", exc)
+                    alive = False
+                if not alive:
+                    self._close(conn)
+                    continue
+            return conn
+        return self.connect()
+
+    def release(self, conn, discard=False):
+        """
+        Give back a connection returned by :py:meth:`acquire`. Whatever it
+        did not commit is rolled back. It is closed when ``discard`` is True,
+        when it cannot be rolled back or when the pool is full.
+        """
+        if not discard and self.size:
+            try:
+                conn.rollback()
+            except Exception as exc:  # pylint: disable=broad-except
+                log.debug("Failed to roll back a pooled SQL connection: %s", exc)
+                discard = True
+        if not discard and self.size:
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append((conn, time.time()))
+                    return
+        self._close(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Yield a connection of the pool, which is closed instead of released
+        if an exception is raised
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:  # pylint: disable=broad-except
+            self.release(conn, discard=True)
+            raise
+        else:
+            self.release(conn)
+
+    def close(self):
+        """
+        Close the idle connections
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+
+def get_pool(opts, connect, check=ping, **kwargs):
+    """
+    Return the pool of this process for the connections made by calling
+    ``connect`` with ``kwargs``, sized by the ``sql_pool_size`` and
+    ``sql_pool_max_idle`` options
+    """
+    size = opts.get("sql_pool_size", 5)
+    max_idle = opts.get("sql_pool_max_idle", 300)
+    # A forked process does not use the connections of its parent
+    key = (
+        os.getpid(),
+        connect,
+        repr(sorted(kwargs.items())),
+        size,
+        max_idle,
+    )
+    with _POOLS_LOCK:
+        if key not in _POOLS:
+            _POOLS[key] = ConnectionPool(
+                functools.partial(connect, **kwargs),
+                size=size,
+                max_idle=max_idle,
+                check=check,
+            )
+        return _POOLS[key]
@@ -2,16 +2,20 @@
 Template render systems
 """
 import codecs
+import copy
 import logging
 import os
 import sys
 import tempfile
+import threading
 import traceback
 from pathlib import Path
 
 import jinja2
 import jinja2.ext
 import jinja2.sandbox
+import salt.loader_context
+import salt.utils.context
 import salt.utils.data
 import salt.utils.dateutils
 import salt.utils.files
@@ -50,6 +54,12 @@ TEMPLATE_DIRNAME = os.path.join(saltpath[0], "templates")
 SLS_ENCODING = "utf-8"  # this one has no BOM.
 SLS_ENCODER = codecs.getencoder(SLS_ENCODING)
 
+# The jinja environments reused by render_jinja_tmpl. They are kept per
+# thread, since rendering a template changes the globals of its environment.
+_JINJA_ENVS = threading.local()
+# The number of jinja environments kept by each thread
+JINJA_ENV_CACHE_SIZE = 16
+
 
 class AliasedLoader:
     """
@@ -93,6 +103,149 @@ class AliasedModule:
         return getattr(self.wrapped, name)
 
 
+class TemplateInputs:
+    """
+    Records what the templates rendered with it read from the ``grains``,
+    ``pillar`` and ``opts`` of their context, so the result of the render can
+    be reused for another context holding the same values. A render which
+    reaches for anything else, like the salt functions, is not reusable.
+
+    Pass an instance as the ``_render_inputs`` keyword argument of
+    :py:func:`salt.template.compile_template`.
+
+    .. versionadded:: 3004
+    """
+
+    # The context entries whose reads are recorded
+    TRACKED = ("grains", "pillar", "opts")
+    # The context entries which make a render not reusable
+    UNTRACKED = ("salt", "proxy")
+    # The renderers whose output only depends on their input and on what
+    # TemplateInputs records
+    RENDERERS = ("jinja", "yaml", "json", "yamlex", "gpg")
+    # The key of a read of a whole context entry
+    ALL = object()
+
+    def __init__(self):
+        # (context entry, key) -> value read, the key is ALL for a whole read
+        self.reads = {}
+        # path -> sha256 of the files read by the templates
+        self.files = {}
+        self.reusable = True
+
+    def read(self, name, key, value):
+        """
+        Record that ``key`` of the context entry ``name`` held ``value``
+        """
+        if (name, key) in self.reads:
+            return
+        if value is salt.utils.context.TrackedDict.MISSING:
+            self.reads[(name, key)] = value
+            return
+        try:
+            self.reads[(name, key)] = copy.deepcopy(value)
+        except Exception:  # pylint: disable=broad-except
+            self.reusable = False
+
+    def read_all(self, name, data):
+        """
+        Record that the whole context entry ``name`` was read
+        """
+        self.read(name, self.ALL, data)
+
+    def write(self, name):
+        """
+        Record that the context entry ``name`` was changed
+        """
+        self.reusable = False
+
+    def renderer(self, name):
+        """
+        Record that the renderer ``name`` was used
+        """
+        if name not in self.RENDERERS:
+            self.reusable = False
+
+    def file(self, path):
+        """
+        Record that a template read the file at ``path``
+        """
+        try:
+            self.files[path] = salt.utils.hashutils.get_hash(path)
+        except OSError:
+            self.reusable = False
+
+    def wrap(self, context):
+        """
+        Return a copy of the template ``context`` recording what is read from
+        it into this object
+        """
+        context = dict(context)
+        for name in self.TRACKED:
+            data = context.get(name)
+            if isinstance(data, salt.loader_context.NamedLoaderContext):
+                data = data.value()
+            if isinstance(data, dict):
+                context[name] = salt.utils.context.TrackedDict(name, data, self)
+            elif data is not None:
+                self.reusable = False
+        for name in self.UNTRACKED:
+            if context.get(name) is not None:
+                context[name] = _Untracked(context[name], self)
+        return context
+
+    def matches(self, sources, digests=None):
+        """
+        Return True if the context entries in ``sources`` hold the values
+        recorded and the files read did not change since. ``digests`` keeps
+        the hashes of the files computed by a previous call.
+        """
+        if digests is None:
+            digests = {}
+        for (name, key), value in self.reads.items():
+            source = sources.get(name) or {}
+            if key is self.ALL:
+                if source != value:
+                    return False
+            elif source.get(key, salt.utils.context.TrackedDict.MISSING) != value:
+                return False
+        for path, digest in self.files.items():
+            if path not in digests:
+                try:
+                    digests[path] = salt.utils.hashutils.get_hash(path)
+                except OSError:
+                    digests[path] = None
+            if digests[path] != digest:
+                return False
+        return True
+
+
+class _Untracked:
+    """
+    Wraps a template context entry whose use makes a render not reusable
+    """
+
+    def __init__(self, wrapped, inputs):
+        self._wrapped = wrapped
+        self._inputs = inputs
+
+    def __getitem__(self, name):
+        self._inputs.reusable = False
+        return self._wrapped[name]
+
+    def __getattr__(self, name):
+        self._inputs.reusable = False
+        return getattr(self._wrapped, name)
+
+    def __contains__(self, name):
+        self._inputs.reusable = False
+        return name in self._wrapped
+
+    def __iter__(self):
+        self._inputs.reusable = False
+        return iter(self._wrapped)
+
+
 def _generate_sls_context_legacy(tmplpath, sls):
     """
     Legacy version of generate_sls_context, this method should be remove in the
@@ -377,6 +530,57 @@ def _get_jinja_error(trace, context=None):
     return line, out
 
 
+def _jinja_environment(opts, env_args):
+    """
+    Return the key and a sandboxed jinja environment created with
+    ``env_args``. Unless ``jinja_bytecode_cache`` is disabled, the compiled
+    templates are cached in the cachedir.
+
+    An environment given back with :py:func:`_release_jinja_environment` is
+    reused by the next render of the current thread with the same settings,
+    with its globals reset and the templates it loaded forgotten. A template
+    rendered while rendering another one gets an environment of its own.
+    """
+    cache_dir = None
+    if opts.get("jinja_bytecode_cache", True) and opts.get("cachedir"):
+        cache_dir = os.path.join(opts["cachedir"], "jinja")
+    settings = dict(env_args)
+    loader = settings.pop("loader")
+    settings_key = repr(sorted(settings.items()))
+    key = repr((settings_key, cache_dir))
+
+    jinja_env = getattr(_JINJA_ENVS, "envs", {}).pop(key, None)
+    if jinja_env is None:
+        if cache_dir:
+            settings["bytecode_cache"] = salt.utils.jinja.SaltBytecodeCache(
+                cache_dir, settings_key
+            )
+        jinja_env = jinja2.sandbox.SandboxedEnvironment(**settings)
+    else:
+        jinja_env.globals.clear()
+        jinja_env.globals.update(jinja2.defaults.DEFAULT_NAMESPACE)
+        if jinja_env.cache is not None:
+            jinja_env.cache.clear()
+    jinja_env.loader = loader
+    return key, jinja_env
+
+
+def _release_jinja_environment(key, jinja_env):
+    """
+    Keep an environment returned by :py:func:`_jinja_environment` for the
+    next renders of the current thread
+    """
+    envs = getattr(_JINJA_ENVS, "envs", None)
+    if envs is None:
+        envs = _JINJA_ENVS.envs = OrderedDict()
+    # Do not hold on to the file client of the loader
+    jinja_env.loader = None
+    envs.pop(key, None)
+    while len(envs) >= JINJA_ENV_CACHE_SIZE:
+        envs.popitem(last=False)
+    envs[key] = jinja_env
+
+
 def render_jinja_tmpl(tmplstr, context, tmplpath=None):
     opts = context["opts"]
     saltenv = context["saltenv"]
@@ -453,12 +657,10 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
     else:
         opt_jinja_env_helper(opt_jinja_env, "jinja_env")
 
-    if opts.get("allow_undefined", False):
-        jinja_env = jinja2.sandbox.SandboxedEnvironment(**env_args)
-    else:
-        jinja_env = jinja2.sandbox.SandboxedEnvironment(
-            undefined=jinja2.StrictUndefined, **env_args
-        )
+    if not opts.get("allow_undefined", False):
+        env_args["undefined"] = jinja2.StrictUndefined
+
+    env_key, jinja_env = _jinja_environment(opts, env_args)
 
     indent_filter = jinja_env.filters.get("indent")
     jinja_env.tests.update(JinjaTest.salt_jinja_tests)
@@ -475,7 +677,10 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
     jinja_env.tests["list"] = salt.utils.data.is_list
 
     decoded_context = {}
+    inputs = context.get("_render_inputs")
     for key, value in context.items():
+        if key == "_render_inputs":
+            continue
         if not isinstance(value, str):
             decoded_context[key] = value
             continue
@@ -492,9 +697,24 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
             decoded_context[key] = salt.utils.data.decode(value)
 
     try:
-        template = jinja_env.from_string(tmplstr)
+        if jinja_env.bytecode_cache is not None and tmplpath:
+            template = jinja_env.template_class.from_code(
+                jinja_env,
+                jinja_env.bytecode_cache.compile(jinja_env, tmplpath, tmplstr),
+                jinja_env.make_globals(None),
+            )
+        else:
+            template = jinja_env.from_string(tmplstr)
+        if inputs is not None:
+            decoded_context = inputs.wrap(decoded_context)
         template.globals.update(decoded_context)
         output = template.render(**decoded_context)
+        if inputs is not None and isinstance(loader, salt.utils.jinja.SaltCacheLoader):
+            for name in loader.cached:
+                for spath in loader.searchpath:
+                    if os.path.isfile(os.path.join(spath, name)):
+                        inputs.file(os.path.join(spath, name))
+                        break
     except jinja2.exceptions.UndefinedError as exc:
         trace = traceback.extract_tb(sys.exc_info()[2])
         out = _get_jinja_error(trace, context=decoded_context)[1]
@@ -542,6 +762,8 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
         raise SaltRenderError(
             "Jinja error: {}{}".format(exc, out), line, tmplstr, trace=tracestr
         )
+    finally:
+        _release_jinja_environment(env_key, jinja_env)
 
     # Workaround a bug in Jinja that removes the final newline
     # (https://github.com/mitsuhiko/jinja2/issues/75)
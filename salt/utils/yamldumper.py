@@ -89,6 +89,12 @@ SafeOrderedDumper.add_representer(
     salt.utils.context.NamespacedDictWrapper,
     yaml.representer.SafeRepresenter.represent_dict,
 )
+OrderedDumper.add_representer(
+    salt.utils.context.TrackedDict, yaml.representer.SafeRepresenter.represent_dict,
+)
+SafeOrderedDumper.add_representer(
+    salt.utils.context.TrackedDict, yaml.representer.SafeRepresenter.represent_dict,
+)
 
 OrderedDumper.add_representer(
     "tag:yaml.org,2002:timestamp", OrderedDumper.represent_scalar
@@ -24,6 +24,10 @@ except Exception:  # pylint: disable=broad-except
 
 __all__ = ["SaltYamlSafeLoader", "load", "safe_load"]
 
+# yaml.SafeLoader is replaced by the libyaml based loader above when libyaml is
+# available, the pure Python loader stays in yaml.loader
+HAS_LIBYAML = yaml.SafeLoader is not yaml.loader.SafeLoader
+
 
 class DuplicateKeyWarning(RuntimeWarning):
     """
@@ -35,15 +39,16 @@ warnings.simplefilter("always", category=DuplicateKeyWarning)
 
 
 # with code integrated from https://gist.github.com/844388
-class SaltYamlSafeLoader(yaml.SafeLoader):
+class SaltYamlConstructor(object):
     """
-    Create a custom YAML loader that uses the custom constructor. This allows
-    for the YAML loading defaults to be manipulated based on needs within salt
-    to make things like sls file more intuitive.
+    The custom constructor of the salt YAML loaders, to be combined with a
+    PyYAML loader. This allows for the YAML loading defaults to be
+    manipulated based on needs within salt to make things like sls file more
+    intuitive.
     """
 
     def __init__(self, stream, dictclass=dict):
-        super(SaltYamlSafeLoader, self).__init__(stream)
+        super().__init__(stream)
         if dictclass is not dict:
             # then assume ordered dict and use it for both !map and !omap
             self.add_constructor("tag:yaml.org,2002:map", type(self).construct_yaml_map)
@@ -118,7 +123,7 @@ class SaltYamlSafeLoader(yaml.SafeLoader):
                 # an empty string. Change it to '0'.
                 if node.value == "":
                     node.value = "0"
-        return super(SaltYamlSafeLoader, self).construct_scalar(node)
+        return super().construct_scalar(node)
 
     def construct_yaml_str(self, node):
         value = self.construct_scalar(node)
@@ -174,6 +179,20 @@ class SaltYamlSafeLoader(yaml.SafeLoader):
             node.value = mergeable_items + node.value
 
 
+class SaltYamlSafeLoader(SaltYamlConstructor, yaml.SafeLoader):
+    """
+    Create a custom YAML loader that uses the custom constructor. The YAML is
+    parsed by libyaml when it is available.
+    """
+
+
+class SaltYamlPureSafeLoader(SaltYamlConstructor, yaml.loader.SafeLoader):
+    """
+    Like :py:class:`SaltYamlSafeLoader`, but always parses the YAML in pure
+    Python
+    """
+
+
 def load(stream, Loader=SaltYamlSafeLoader):
     return yaml.load(stream, Loader=Loader)
 
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Measure how fast salt.utils.dictupdate.merge builds a pillar from the data of
+many pillar SLS files, like Pillar.render_pillar does, with and without
+sharing the data which does not change between merges.
+
+.. code-block:: bash
+
+    python tests/mergebench.py -f 50 -f 100 -k 200
+"""
+
+import copy
+import optparse
+import time
+
+import salt.utils.dictupdate
+
+
+def parse():
+    """
+    Parse the command line options
+    """
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "-f",
+        "--files",
+        dest="files",
+        default=[],
+        type="int",
+        action="append",
+        help="The number of pillar SLS files merged, can be repeated",
+    )
+    parser.add_option(
+        "-k",
+        "--keys",
+        dest="keys",
+        default=100,
+        type="int",
+        help="The number of top level keys in each pillar SLS file",
+    )
+    parser.add_option(
+        "-r",
+        "--rounds",
+        dest="rounds",
+        default=3,
+        type="int",
+        help="Build each pillar this many times and keep the fastest",
+    )
+    options, _ = parser.parse_args()
+    if not options.files:
+        options.files = [10, 50]
+    return options
+
+
+def pillar_file(idx, keys):
+    """
+    Return the data of a pillar SLS file. Every file sets its own keys, and
+    adds to the users and packages shared by all the files.
+    """
+    data = {
+        "sls{}_key{}".format(idx, key): {
+            "name": "value{}".format(key),
+            "settings": {"port": key, "enabled": True, "tags": ["a", "b", "c"]},
+        }
+        for key in range(keys)
+    }
+    data["users"] = {"user{}".format(idx): {"uid": 1000 + idx, "groups": ["users"]}}
+    data["packages"] = ["package{}".format(idx)]
+    return data
+
+
+def measure(files, strategy, merge_lists, shared, rounds):
+    """
+    Return the fastest time it took to merge ``files``
+    """
+    best = None
+    for _ in range(rounds):
+        # Merging does not modify the files when sharing, but does otherwise
+        data = files if shared else copy.deepcopy(files)
+        start = time.time()
+        pillar = {}
+        for pstate in data:
+            pillar = salt.utils.dictupdate.merge(
+                pillar, pstate, strategy, merge_lists=merge_lists, shared=shared
+            )
+        took = time.time() - start
+        if best is None or took < best:
+            best = took
+    return best
+
+
+def main():
+    options = parse()
+    print(
+        "{:>6} {:>10} {:>6} {:>8} {:>10} {:>10}".format(
+            "files", "strategy", "lists", "shared", "seconds", "merges/s"
+        )
+    )
+    for count in options.files:
+        files = [pillar_file(idx, options.keys) for idx in range(count)]
+        for strategy in ("recurse", "overwrite"):
+            for merge_lists in (False, True):
+                for shared in (False, True):
+                    took = measure(files, strategy, merge_lists, shared, options.rounds)
+                    print(
+                        "{:>6} {:>10} {:>6} {:>8} {:>10.3f} {:>10.1f}".format(
+                            count,
+                            strategy,
+                            str(merge_lists),
+                            str(shared),
+                            took,
+                            count / took if took else float("inf"),
+                        )
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+Measure how many publications per second the ZeroMQ publisher channel of the
+master can hand to its publish daemon, with and without sign_pub_messages,
+for list targets of various sizes. The publish daemon is replaced by a socket
+which drains the publications, and which signs them like the daemon does when
+the workers leave the signature to it.
+
+.. code-block:: bash
+
+    python tests/pubbench.py -n 500 -t 1000 -t 10000
+"""
+# pylint: disable=resource-leakage
+
+import ctypes
+import multiprocessing
+import optparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import salt.config
+import salt.crypt
+import salt.master
+import salt.payload
+import salt.transport.zeromq
+import salt.utils.stringutils
+import zmq
+
+
+def parse():
+    """
+    Parse the command line options
+    """
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "-n",
+        "--publishes",
+        dest="publishes",
+        default=500,
+        type="int",
+        help="The number of publications sent for each measurement",
+    )
+    parser.add_option(
+        "-t",
+        "--targets",
+        dest="targets",
+        default=[],
+        type="int",
+        action="append",
+        help="The number of minions in the list target, can be repeated",
+    )
+    options, _ = parser.parse_args()
+    if not options.targets:
+        options.targets = [1000, 10000]
+    return options
+
+
+class PubBench:
+    """
+    Send publications through ZeroMQPubServerChannel.publish and count them
+    on the other side of the publish daemon socket
+    """
+
+    def __init__(self):
+        self.root_dir = tempfile.mkdtemp(prefix="pubbench-")
+        pki_dir = os.path.join(self.root_dir, "pki")
+        os.makedirs(pki_dir)
+        salt.crypt.gen_keys(pki_dir, "master", 2048)
+        self.opts = salt.config.master_config(None)
+        self.opts.update(
+            {
+                "root_dir": self.root_dir,
+                "pki_dir": pki_dir,
+                "sock_dir": self.root_dir,
+                "cachedir": os.path.join(self.root_dir, "cache"),
+                "ipc_mode": "ipc",
+                "transport_compression": [],
+            }
+        )
+        salt.master.SMaster.secrets["aes"] = {
+            "secret": multiprocessing.Array(
+                ctypes.c_char,
+                salt.utils.stringutils.to_bytes(
+                    salt.crypt.Crypticle.generate_key_string()
+                ),
+            ),
+        }
+
+    def _drain(self, opts, count, ready):
+        """
+        Receive ``count`` publications like the publish daemon, signing the
+        ones which were sent unsigned
+        """
+        channel = salt.transport.zeromq.ZeroMQPubServerChannel(opts)
+        context = zmq.Context()
+        pull_sock = context.socket(zmq.PULL)
+        pull_sock.bind(
+            "ipc://{}".format(os.path.join(opts["sock_dir"], "publish_pull.ipc"))
+        )
+        ready.set()
+        for _ in range(count):
+            package = salt.payload.unpackage(pull_sock.recv())
+            if "unsigned" in package:
+                channel._sign_payload(package["unsigned"])
+        self.finished = time.time()
+        pull_sock.close()
+        context.term()
+
+    def run(self, publishes, targets, sign):
+        """
+        Return the publications per second handed to the publish daemon by
+        the workers and handled by the publish daemon
+        """
+        opts = dict(self.opts, sign_pub_messages=sign)
+        ready = threading.Event()
+        drain = threading.Thread(target=self._drain, args=(opts, publishes, ready))
+        drain.start()
+        ready.wait()
+        channel = salt.transport.zeromq.ZeroMQPubServerChannel(opts)
+        load = {
+            "fun": "test.ping",
+            "arg": [],
+            "tgt_type": "list",
+            "tgt": ["minion{}".format(idx) for idx in range(targets)],
+            "ret": "",
+            "user": "root",
+        }
+        start = time.time()
+        for idx in range(publishes):
+            load["jid"] = str(idx)
+            channel.publish(load)
+        sent = time.time()
+        drain.join()
+        channel.pub_close()
+        return publishes / (sent - start), publishes / (self.finished - start)
+
+    def close(self):
+        shutil.rmtree(self.root_dir, ignore_errors=True)
+
+
+def main():
+    options = parse()
+    bench = PubBench()
+    try:
+        print(
+            "{:>8} {:>8} {:>16} {:>16}".format(
+                "targets", "signed", "worker pub/s", "daemon pub/s"
+            )
+        )
+        for targets in options.targets:
+            for sign in (False, True):
+                worker, daemon = bench.run(options.publishes, targets, sign)
+                print(
+                    "{:>8} {:>8} {:>16.1f} {:>16.1f}".format(
+                        targets, str(sign), worker, daemon
+                    )
+                )
+    finally:
+        bench.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
+import os
+
 import pytest
 import salt.client.ssh.client
+import salt.client.ssh.shell
+import salt.client.ssh.state
+import salt.utils.hashutils
 import salt.utils.msgpack
 from salt.client import ssh
 from tests.support.mock import MagicMock, patch
@@ -78,6 +83,9 @@ def test_cmd_block_python_version_error(ssh_target):
         ("ssh_remote_port_forwards", "test", True),
         ("ssh_options", ["test1", "test2"], True),
         ("ssh_max_procs", 2, True),
+        ("ssh_executor", "asyncio", False),
+        ("ssh_async_max_sessions", 10, False),
+        ("ssh_control_persist", "10m", False),
         ("ssh_askpass", True, True),
         ("ssh_key_deploy", True, True),
         ("ssh_update_roster", True, True),
@@ -133,3 +141,168 @@ def test_ssh_kwargs(test_opts):
     with patch("salt.roster.get_roster_file", MagicMock(return_value="")):
         ssh_obj = client._prep_ssh(**opts)
         assert ssh_obj.opts.get(opt_key, None) == opt_value
+
+
+@pytest.fixture
+def ssh_client(ssh_target):
+    opts, target = ssh_target
+    opts.update({"ssh_executor": "asyncio", "ssh_max_procs": 2})
+    with patch.object(ssh.SSH, "__init__", MagicMock(return_value=None)):
+        client = ssh.SSH(opts)
+    client.opts = opts
+    client.targets = {
+        "host1": dict(target, host="host1"),
+        "host2": dict(target, host="host2"),
+        "host3": dict(target, host="host3"),
+    }
+    client.defaults = {}
+    client.mods = {}
+    client.fsclient = None
+    client.thin = salt.utils.thin.thin_path(opts["cachedir"])
+    return client
+
+
+@pytest.mark.skip_on_windows(reason="SSH_PY_SHIM not set on windows")
+def test_handle_ssh_asyncio(ssh_client):
+    """
+    test that the asyncio executor runs the routines for all of the targets
+    and streams their returns
+    """
+    stdout = '{"local": {"return": true, "retcode": 0}}'
+    with patch("salt.client.ssh.Single.run", MagicMock(return_value=(stdout, "", 0))):
+        rets = list(ssh_client.handle_ssh())
+    assert sorted(rets, key=lambda x: next(iter(x))) == [
+        {"host1": {"return": True, "retcode": 0}},
+        {"host2": {"return": True, "retcode": 0}},
+        {"host3": {"return": True, "retcode": 0}},
+    ]
+
+
+@pytest.mark.skip_on_windows(reason="SSH_PY_SHIM not set on windows")
+@pytest.mark.skip_if_binaries_missing("echo")
+def test_handle_ssh_asyncio_raw_shell(ssh_client):
+    """
+    test that raw shell calls are run as subprocesses on the event loop
+    """
+    ssh_client.opts["raw_shell"] = True
+    for target in ssh_client.targets.values():
+        target["passwd"] = None
+    run = MagicMock()
+    with patch(
+        "salt.client.ssh.shell.Shell._cmd_str", MagicMock(return_value="echo hello")
+    ), patch("salt.client.ssh.Single.run", run):
+        rets = list(ssh_client.handle_ssh())
+    run.assert_not_called()
+    assert len(rets) == 3
+    for ret in rets:
+        # ssh is told to fail rather than prompt for anything
+        assert next(iter(ret.values())) == {
+            "stdout": "-o BatchMode=yes hello\n",
+            "stderr": "",
+            "retcode": 0,
+        }
+
+
+@pytest.mark.skip_on_windows(reason="SSH_PY_SHIM not set on windows")
+def test_handle_ssh_asyncio_raw_shell_priv_passwd(ssh_client):
+    """
+    test that raw shell calls to targets with an encrypted key are not run
+    on the event loop, which cannot answer the passphrase prompt
+    """
+    ssh_client.opts["raw_shell"] = True
+    for target in ssh_client.targets.values():
+        target["passwd"] = None
+        target["priv_passwd"] = "secret"
+    stdout = '{"local": {"return": true, "retcode": 0}}'
+    run = MagicMock(return_value=(stdout, "", 0))
+    with patch("salt.client.ssh.Single.run", run):
+        rets = list(ssh_client.handle_ssh())
+    assert run.call_count == 3
+    assert len(rets) == 3
+
+
+def test_shell_control_persist(tmpdir):
+    """
+    test that the ControlMaster options are only added when
+    ssh_control_persist is set, and that the control path is per host
+    """
+    opts = {"cachedir": tmpdir.strpath, "_ssh_version": (8, 0)}
+    shell = salt.client.ssh.shell.Shell(
+        opts, "host1", user="root", port="22", priv="/tmp/salt-ssh.rsa"
+    )
+    assert "ControlPath" not in shell._cmd_str("true")
+
+    opts["ssh_control_persist"] = "10m"
+    cmd = shell._cmd_str("true")
+    control_path = shell._control_path()
+    assert "-o ControlMaster=auto" in cmd
+    assert "-o ControlPath={}".format(control_path) in cmd
+    assert "-o ControlPersist=10m" in cmd
+    assert os.path.dirname(control_path) == tmpdir.join("ssh_control").strpath
+    assert "-o ControlPath={}".format(control_path) in shell._cmd_str(
+        "/tmp/a host1:/tmp/a", ssh="scp"
+    )
+
+    other = salt.client.ssh.shell.Shell(
+        opts, "host2", user="root", port="22", priv="/tmp/salt-ssh.rsa"
+    )
+    assert other._control_path() != control_path
+
+
+@pytest.mark.skip_on_windows(reason="salt-ssh does not run on windows")
+def test_shell_control_persist_off(tmpdir):
+    """
+    test that false values of ssh_control_persist, including the strings a
+    salt-api call may pass, turn connection reuse off, and that connection
+    reuse is refused when the control directory is shared
+    """
+    opts = {"cachedir": tmpdir.strpath, "_ssh_version": (8, 0)}
+    shell = salt.client.ssh.shell.Shell(
+        opts, "host1", user="root", port="22", priv="/tmp/salt-ssh.rsa"
+    )
+    for persist in (False, "False", "no", "0", 0, ""):
+        opts["ssh_control_persist"] = persist
+        assert "Control" not in shell._control_opts()
+
+    for persist in (True, "True", "yes"):
+        opts["ssh_control_persist"] = persist
+        assert "-o ControlPersist=yes" in shell._control_opts()
+
+    control_dir = tmpdir.join("ssh_control")
+    control_dir.chmod(0o755)
+    assert shell._control_path() is None
+    assert shell._control_opts() == ""
+
+
+@pytest.mark.parametrize(
+    "value,expected", [(False, "no"), (True, "yes"), (600, "600"), ("10m", "10m")]
+)
+def test_sanitize_kwargs_control_persist(value, expected):
+    """
+    test that bool and int values of ssh_control_persist are turned into
+    values ssh understands
+    """
+    client = salt.client.ssh.client.SSHClient(disable_custom_roster=True)
+    sane = client.sanitize_kwargs({"ssh_control_persist": value})
+    assert sane["ssh_control_persist"] == expected
+
+
+def test_prep_trans_tar_reproducible():
+    """
+    test that the state tarball only changes when its contents do
+    """
+    file_client = MagicMock()
+    file_client.cache_file.return_value = ""
+    file_client.cache_dir.return_value = ""
+    chunks = [{"state": "test", "fun": "nop", "name": "foo", "__id__": "foo"}]
+    sums = []
+    for pillar in ({"foo": "bar"}, {"foo": "bar"}, {"foo": "baz"}):
+        trans_tar = salt.client.ssh.state.prep_trans_tar(
+            file_client, chunks, {"base": []}, pillar, "minion"
+        )
+        try:
+            sums.append(salt.utils.hashutils.get_hash(trans_tar, "sha256"))
+        finally:
+            os.remove(trans_tar)
+    assert sums[0] == sums[1]
+    assert sums[0] != sums[2]
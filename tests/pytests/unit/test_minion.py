@@ -1,5 +1,7 @@
 import pytest
+import salt.config
 import salt.ext.tornado.gen
+import salt.master
 import salt.minion
 from tests.support.mock import MagicMock, patch
 
@@ -100,3 +102,85 @@ def test_mine_send_tries(req_channel_factory):
 
         rtn = minion._mine_send(tag, data)
         assert rtn == 20
+
+
+def test_syndic_batch_job_rets():
+    """
+    Syndic job returns are split into bounded batches and the job load is
+    only forwarded with the first one
+    """
+    opts = salt.config.DEFAULT_MASTER_OPTS.copy()
+    opts["syndic_forward_batch_size"] = 2
+    opts["syndic_forward_max_bytes"] = 0
+    syndic = salt.minion.SyndicManager.__new__(salt.minion.SyndicManager)
+    syndic.opts = opts
+    jdict = {
+        "__fun__": "test.ping",
+        "__jid__": "20210101000000000000",
+        "__load__": {"tgt": "*"},
+    }
+    for idx in range(5):
+        jdict["minion{}".format(idx)] = {"return": True}
+
+    batches = syndic._batch_job_rets([jdict])
+    assert [len(batch) for batch in batches] == [1, 1, 1]
+    assert batches[0][0]["__load__"] == {"tgt": "*"}
+    assert all(batch[0]["__load__"] == {} for batch in batches[1:])
+    assert all(batch[0]["__jid__"] == jdict["__jid__"] for batch in batches)
+    minions = [key for batch in batches for key in batch[0] if key.startswith("m")]
+    assert minions == ["minion{}".format(idx) for idx in range(5)]
+
+    opts["syndic_forward_batch_size"] = 0
+    opts["syndic_forward_max_bytes"] = 1
+    batches = syndic._batch_job_rets([jdict])
+    assert len(batches) == 5
+
+
+def test_syndic_return_pub_multi_compress():
+    """
+    The master can read the compressed returns of a syndic
+    """
+    opts = {
+        "random_startup_delay": 0,
+        "grains": {},
+        "id": "syndic",
+        "multiprocessing": False,
+        "cache_jobs": False,
+        "syndic_forward_compress": True,
+    }
+    with patch("salt.loader.grains"):
+        minion = salt.minion.Minion(opts)
+    minion.functions = {}
+    minion.pub_channel = MagicMock()
+    minion.pub_channel.auth.creds = {"syndic_return_gz": True}
+    rets = [
+        {
+            "__fun__": "test.ping",
+            "__jid__": "20210101000000000000",
+            "__load__": {},
+            "minion": {"return": True},
+        }
+    ]
+    with patch.object(minion, "_send_req_sync") as send_req:
+        minion._return_pub_multi(rets, "_syndic_return")
+    load = send_req.call_args[0][0]
+    assert "load" not in load
+
+    aes_funcs = salt.master.AESFuncs.__new__(salt.master.AESFuncs)
+    aes_funcs.opts = {"cachedir": "/nonexistent", "master_job_cache": "local_cache"}
+    with patch.object(aes_funcs, "_return", create=True) as ret, patch(
+        "os.path.exists", return_value=True
+    ):
+        aes_funcs._syndic_return(load)
+    ret.assert_called_once()
+    assert ret.call_args[0][0]["id"] == "minion"
+    assert ret.call_args[0][0]["return"] is True
+
+    # Masters which do not announce that they read compressed returns would
+    # drop them
+    minion.pub_channel.auth.creds = {}
+    with patch.object(minion, "_send_req_sync") as send_req:
+        minion._return_pub_multi(rets, "_syndic_return")
+    load = send_req.call_args[0][0]
+    assert "load_gz" not in load
+    assert load["load"][0]["return"] == {"minion": {"return": True}}
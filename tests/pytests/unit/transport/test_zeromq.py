@@ -3,19 +3,25 @@
 """
 
 import hashlib
+import os
+import time
 
 import salt.config
+import salt.crypt
 import salt.exceptions
 import salt.ext.tornado.gen
 import salt.ext.tornado.ioloop
 import salt.log.setup
+import salt.payload
 import salt.transport.client
 import salt.transport.server
+import salt.transport.zeromq
+import salt.utils.master
 import salt.utils.platform
 import salt.utils.process
 import salt.utils.stringutils
-from salt.transport.zeromq import AsyncReqMessageClientPool
-from tests.support.mock import MagicMock, call, patch
+from salt.transport.zeromq import AsyncReqMessageClient, AsyncReqMessageClientPool
+from tests.support.mock import MagicMock, PropertyMock, call, patch
 
 
 def test_master_uri():
@@ -251,3 +257,173 @@ def test_zeromq_async_pub_channel_filtering_decode_message(
             res = channel._decode_messages(message)
 
     assert res.result()["enc"] == "aes"
+
+
+def test_zeromq_pub_server_channel_publish_signing(temp_salt_master):
+    """
+    test that ZeroMQPubServerChannel leaves signing to the publish daemon
+    """
+    opts = dict(
+        temp_salt_master.config.copy(),
+        sign_pub_messages=True,
+        transport_compression=[],
+    )
+    key = salt.crypt.Crypticle.generate_key_string()
+    secrets = {"aes": {"secret": MagicMock(value=key)}}
+    pub_sock = MagicMock()
+    with patch("salt.master.SMaster.secrets", secrets), patch(
+        "salt.crypt.sign_message", MagicMock(return_value=b"\xffsig")
+    ) as sign_message, patch.object(
+        salt.transport.zeromq.ZeroMQPubServerChannel,
+        "pub_sock",
+        new_callable=PropertyMock,
+        return_value=pub_sock,
+    ):
+        channel = salt.transport.zeromq.ZeroMQPubServerChannel(opts)
+        load = {"fun": "test.ping", "tgt_type": "glob", "tgt": "*", "jid": "1"}
+        channel.publish(load)
+        channel.publish(load)
+        sign_message.assert_not_called()
+
+        int_payload = channel.serial.loads(pub_sock.send.call_args[0][0])
+        assert "payload" not in int_payload
+        payload = channel.serial.loads(channel._sign_payload(int_payload["unsigned"]))
+        assert payload["sig"] == b"\xffsig"
+        sign_message.assert_called_once_with(
+            os.path.join(opts["pki_dir"], "master.pem"), payload["load"]
+        )
+        crypticle = channel._publish_crypticle()
+        assert crypticle.loads(payload["load"]) == load
+
+        # The Crypticle is only made again when the AES key changes
+        assert channel._publish_crypticle() is crypticle
+        secrets["aes"]["secret"].value = salt.crypt.Crypticle.generate_key_string()
+        assert channel._publish_crypticle() is not crypticle
+
+
+def test_request_pool_router(temp_salt_master):
+    """
+    test that RequestPoolRouter routes requests to the pools serving their
+    command and sheds requests for full pools
+    """
+    opts = dict(
+        temp_salt_master.config.copy(),
+        transport="zeromq",
+        ipc_mode="ipc",
+        worker_threads=3,
+        mworker_pools={
+            "auth": {"commands": ["_auth"], "workers": 2},
+            "bulk": {
+                "commands": ["_pillar", "_file_*"],
+                "max_queue": 1,
+                "retry_delay": 5,
+            },
+        },
+    )
+    pools = salt.utils.master.mworker_pools(opts)
+    assert list(pools) == ["auth", "bulk", "default"]
+    assert pools["auth"]["workers"] == 2
+    assert pools["default"]["workers"] == 3
+
+    key = salt.crypt.Crypticle.generate_key_string()
+    crypticle = salt.crypt.Crypticle(opts, key)
+    serial = salt.payload.Serial(opts)
+
+    def request(client, enc, load, retry=True, hint=True):
+        package = {"enc": enc, "load": load}
+        if enc == "aes":
+            package["load"] = crypticle.dumps(load)
+            if hint:
+                package["cmd"] = load["cmd"]
+        if retry:
+            package[salt.transport.zeromq.RETRY_LATER] = True
+        return [client, b"", serial.dumps(package)]
+
+    router = salt.transport.zeromq.RequestPoolRouter(opts, pools)
+    # The requests are routed without decrypting them
+    with patch("salt.crypt.Crypticle.loads", MagicMock(side_effect=Exception)):
+        assert router.admit(request(b"1", "clear", {"cmd": "_auth"})) == ("auth", True,)
+        assert router.admit(request(b"2", "aes", {"cmd": "_return"})) == (
+            "default",
+            True,
+        )
+        assert router.admit(request(b"3", "aes", {"cmd": "_file_list"})) == (
+            "bulk",
+            True,
+        )
+        assert router.admit([b"4", b"", b"garbage"]) == ("default", True)
+        # Older clients do not tell the command of AES requests
+        assert router.admit(
+            request(b"7", "aes", {"cmd": "_pillar"}, retry=False, hint=False)
+        ) == ("default", True)
+
+    # The bulk pool is full until it replied to its request
+    assert router.admit(request(b"5", "aes", {"cmd": "_pillar"})) == ("bulk", False,)
+    assert serial.loads(router.retry_reply("bulk")) == {
+        salt.transport.zeromq.RETRY_LATER: 5
+    }
+    # Clients which do not understand the retry reply are never shed
+    assert router.admit(request(b"8", "aes", {"cmd": "_pillar"}, retry=False)) == (
+        "bulk",
+        True,
+    )
+    router.done([b"8", b"", b"reply"])
+    router.done([b"3", b"", b"reply"])
+    assert router.queued["bulk"] == 0
+    assert router.admit(request(b"5", "aes", {"cmd": "_pillar"})) == ("bulk", True,)
+    assert router.stats["bulk"] == {
+        "requests": 4,
+        "rejected": 1,
+        "max_queued": 2,
+    }
+
+    # Requests whose worker never replied are not counted forever
+    with patch("time.time", MagicMock(return_value=time.time() + 3600)):
+        router.admit(request(b"6", "clear", {"cmd": "_auth"}))
+    assert router.queued["bulk"] == 0
+    assert router.queued["default"] == 0
+
+
+def test_mworker_pools_ignored():
+    """
+    test that mworker_pools are ignored where they can not be used
+    """
+    opts = dict(
+        salt.config.DEFAULT_MASTER_OPTS.copy(),
+        mworker_pools={"auth": {"commands": ["_auth"]}},
+    )
+    assert salt.utils.master.mworker_pools(dict(opts, transport="tcp")) == {}
+    assert salt.utils.master.mworker_pools(dict(opts, ipc_mode="tcp")) == {}
+    assert salt.utils.master.mworker_pools(dict(opts, mworker_pools={})) == {}
+    assert "auth" in salt.utils.master.mworker_pools(opts)
+
+
+def test_async_req_message_client_retry_later():
+    """
+    test that AsyncReqMessageClient sends a request again when the master
+    asks it to
+    """
+    io_loop = salt.ext.tornado.ioloop.IOLoop()
+    serial = salt.payload.Serial({})
+    with patch.object(AsyncReqMessageClient, "_init_socket"):
+        client = AsyncReqMessageClient({}, "tcp://127.0.0.1:4506", io_loop=io_loop)
+    client.stream = MagicMock()
+
+    @salt.ext.tornado.gen.coroutine
+    def run():
+        future = client.send({"cmd": "_pillar"})
+        yield salt.ext.tornado.gen.moment
+        mark_future = client.stream.on_recv.call_args[0][0]
+        mark_future([serial.dumps({salt.transport.zeromq.RETRY_LATER: 0})])
+        assert not future.done()
+        yield salt.ext.tornado.gen.sleep(0.01)
+        assert client.stream.send.call_count == 2
+        mark_future([serial.dumps({"ret": True})])
+        ret = yield future
+        raise salt.ext.tornado.gen.Return(ret)
+
+    try:
+        assert io_loop.run_sync(run) == {"ret": True}
+    finally:
+        client.close()
+        io_loop.close()
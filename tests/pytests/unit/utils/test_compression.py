@@ -0,0 +1,74 @@
+import salt.crypt
+import salt.utils.compression
+from tests.support.mock import MagicMock
+
+
+def test_pack_unpack():
+    data = b"x" * 4096
+    for algorithm in salt.utils.compression.available():
+        packed = salt.utils.compression.pack(data, algorithm)
+        assert len(packed) < len(data)
+        assert salt.utils.compression.unpack(packed) == data
+    assert salt.utils.compression.unpack(b"pickle::" + data) is None
+
+
+def test_enabled_skips_unavailable():
+    opts = {"transport_compression": ["nonexistent", "zlib"]}
+    assert salt.utils.compression.enabled(opts) == ["zlib"]
+    assert salt.utils.compression.enabled({"transport_compression": []}) == []
+
+
+def test_negotiate():
+    assert salt.utils.compression.negotiate(["zstd", "zlib"], ["zlib"]) == "zlib"
+    assert salt.utils.compression.negotiate(["zlib"], None) is None
+    assert salt.utils.compression.negotiate([], ["zlib"]) is None
+
+
+def test_publish_negotiator():
+    banks = {
+        "compression": {},
+        "compression/minions": {"new": ["zstd", "zlib"]},
+    }
+    cache = MagicMock()
+    cache.fetch.side_effect = lambda bank, key: banks[bank].get(key, {})
+    cache.list.side_effect = lambda bank: list(banks[bank])
+    cache.store.side_effect = lambda bank, key, data: banks[bank].__setitem__(key, data)
+    cache.flush.side_effect = lambda bank, key: banks[bank].pop(key)
+
+    salt.utils.compression.store_minion_algorithms(cache, "newer", ["zlib"])
+    negotiator = salt.utils.compression.PublishNegotiator(cache)
+    assert negotiator.algorithm(["zstd", "zlib"]) == "zlib"
+
+    # The minions are not read again until an authentication changes them
+    cache.list.reset_mock()
+    assert negotiator.algorithm(["zstd", "zlib"]) == "zlib"
+    cache.list.assert_not_called()
+
+    # A minion which does not support compression disables it
+    salt.utils.compression.store_minion_algorithms(cache, "old", [])
+    assert negotiator.algorithm(["zstd", "zlib"]) is None
+
+    salt.utils.compression.forget_minion(cache, "old")
+    salt.utils.compression.forget_minion(cache, "newer")
+    assert negotiator.algorithm(["zstd", "zlib"]) == "zstd"
+
+
+def test_store_minion_algorithms_only_on_change():
+    cache = MagicMock()
+    cache.fetch.return_value = ["zlib"]
+    salt.utils.compression.store_minion_algorithms(cache, "minion", ["zlib"])
+    cache.store.assert_not_called()
+    salt.utils.compression.store_minion_algorithms(cache, "minion", [])
+    cache.store.assert_any_call("compression/minions", "minion", [])
+
+
+def test_crypticle_compression():
+    opts = {"serial": "msgpack"}
+    crypticle = salt.crypt.Crypticle(opts, salt.crypt.Crypticle.generate_key_string())
+    load = {"fun": "test.arg", "arg": ["x" * 4096]}
+    plain = crypticle.dumps(load)
+    compressed = crypticle.dumps(load, "zlib", 1024)
+    assert len(compressed) < len(plain)
+    assert crypticle.loads(compressed) == load
+    # Below the threshold the load is not compressed
+    assert len(crypticle.dumps(load, "zlib", 1024 * 1024)) == len(plain)
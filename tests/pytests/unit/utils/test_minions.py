@@ -1,6 +1,6 @@
 import salt.utils.minions
 import salt.utils.network
-from tests.support.mock import patch
+from tests.support.mock import MagicMock, patch
 
 
 def test_connected_ids():
@@ -20,3 +20,39 @@ def test_connected_ids():
         with patch_net, patch_list, patch_fetch:
             ret = ckminions.connected_ids()
             assert ret == {minion}
+
+
+def test_parse_compound():
+    """
+    test that compound targets are parsed once, with their nodegroups expanded
+    """
+    nodegroups = {"web": "L@web1,web2", "all": "N@web or db*"}
+    assert salt.utils.minions.parse_compound("G@os:Ubuntu not N@all", nodegroups) == (
+        {"engine": "G", "delimiter": None, "pattern": "os:Ubuntu"},
+        "and",
+        "not",
+        "(",
+        "(",
+        {"engine": "L", "delimiter": None, "pattern": "web1,web2"},
+        ")",
+        "or",
+        {"engine": None, "delimiter": None, "pattern": "db*"},
+        ")",
+    )
+    assert salt.utils.minions.parse_compound("and web*") is None
+
+    with patch(
+        "salt.utils.minions._parse_compound",
+        MagicMock(side_effect=salt.utils.minions._parse_compound),
+    ) as parse:
+        for _ in range(3):
+            salt.utils.minions.parse_compound("G@os:Ubuntu and web*")
+            salt.utils.minions.parse_compound("N@web", nodegroups)
+        assert parse.call_count == 2
+        # Targets with nodegroups are parsed again when the nodegroups change
+        nodegroups = dict(nodegroups, web="L@web3")
+        assert salt.utils.minions.parse_compound("N@web", nodegroups) == (
+            {"engine": "L", "delimiter": None, "pattern": "web3"},
+        )
+        salt.utils.minions.parse_compound("G@os:Ubuntu and web*", nodegroups)
+        assert parse.call_count == 3
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+
+import salt.utils.sqlpool
+from tests.support.mock import MagicMock, patch
+
+
+def test_pool_reuses_connections(tmp_path):
+    database = str(tmp_path / "pool.db")
+    connect = MagicMock(side_effect=sqlite3.connect)
+    pool = salt.utils.sqlpool.ConnectionPool(
+        lambda: connect(database), size=1, check=salt.utils.sqlpool.ping
+    )
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+    with pool.connection() as conn:
+        # What is not committed is rolled back on release
+        conn.execute("INSERT INTO t VALUES (1)")
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first.execute("SELECT COUNT(*) FROM t").fetchall() == [(0,)]
+    assert connect.call_count == 2
+    # Only one idle connection is kept
+    pool.release(first)
+    pool.release(second)
+    assert pool.acquire() is first
+    pool.close()
+
+
+def test_pool_discards_broken_connections(tmp_path):
+    database = str(tmp_path / "pool.db")
+    pool = salt.utils.sqlpool.ConnectionPool(
+        lambda: sqlite3.connect(database), check=salt.utils.sqlpool.ping
+    )
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    assert pool.acquire() is not conn
+
+    # A connection which raised in the block is closed
+    try:
+        with pool.connection() as conn:
+            raise sqlite3.OperationalError("lost")
+    except sqlite3.OperationalError:
+        pass
+    assert pool.acquire() is not conn
+
+
+def test_pool_expires_idle_connections(tmp_path):
+    database = str(tmp_path / "pool.db")
+    pool = salt.utils.sqlpool.ConnectionPool(
+        lambda: sqlite3.connect(database), max_idle=60
+    )
+    conn = pool.acquire()
+    pool.release(conn)
+    with patch("time.time", MagicMock(return_value=os.path.getmtime(database) + 3600)):
+        assert pool.acquire() is not conn
+
+
+def test_pool_size_zero_closes(tmp_path):
+    database = str(tmp_path / "pool.db")
+    pool = salt.utils.sqlpool.get_pool(
+        {"sql_pool_size": 0}, sqlite3.connect, database=database
+    )
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is not conn
+
+
+def test_get_pool():
+    opts = {"sql_pool_size": 2, "sql_pool_max_idle": 10}
+    pool = salt.utils.sqlpool.get_pool(opts, sqlite3.connect, database=":memory:")
+    assert pool.size == 2
+    assert pool.max_idle == 10
+    assert (
+        salt.utils.sqlpool.get_pool(opts, sqlite3.connect, database=":memory:") is pool
+    )
+    assert (
+        salt.utils.sqlpool.get_pool(opts, sqlite3.connect, database="other") is not pool
+    )
+    # A forked process gets its own pools
+    with patch("os.getpid", MagicMock(return_value=-1)):
+        assert (
+            salt.utils.sqlpool.get_pool(opts, sqlite3.connect, database=":memory:")
+            is not pool
+        )
@@ -8,6 +8,7 @@ from __future__ import absolute_import
 from salt.client.ssh.wrapper import state
 
 # Import Salt Testing libs
+from tests.support.mock import MagicMock
 from tests.support.unit import TestCase
 
 # Import python libs
@@ -23,3 +24,49 @@ class StateTests(TestCase):
 
         actual = state._parse_mods(mods)
         self.assertEqual(expected, actual)
+
+    def test_trans_tar_path(self):
+        """
+        Test _trans_tar_path
+        """
+        opts = {"thin_dir": "/tmp/thin"}
+        self.assertEqual(state._trans_tar_path(opts, "abc"), "/tmp/thin/salt_state.tgz")
+        opts["ssh_state_tarball_cache"] = True
+        self.assertEqual(
+            state._trans_tar_path(opts, "abc"), "/tmp/thin/salt_state_abc.tgz"
+        )
+
+    def test_send_trans_tar_cached(self):
+        """
+        Test that a state tarball which is cached on the target is not sent
+        """
+        opts = {"thin_dir": "/tmp/thin", "ssh_state_tarball_cache": True}
+        single = MagicMock()
+        single.shell.exec_cmd.return_value = ("", "", 0)
+        state._send_trans_tar(single, "/tmp/local.tgz", "/tmp/thin/x.tgz", opts)
+        single.shell.send.assert_not_called()
+
+        single.shell.exec_cmd.side_effect = [("", "", 1), ("", "", 0)]
+        state._send_trans_tar(single, "/tmp/local.tgz", "/tmp/thin/x.tgz", opts)
+        # The tarball is sent under a temporary name, and only then moved to
+        # the name the cache looks for
+        single.shell.send.assert_called_once_with(
+            "/tmp/local.tgz", "/tmp/thin/x.part.tgz"
+        )
+        single.shell.exec_cmd.assert_called_with(
+            "mv -f /tmp/thin/x.part.tgz /tmp/thin/x.tgz"
+        )
+
+    def test_send_trans_tar_no_cache(self):
+        """
+        Test that the state tarball is always sent without the cache
+        """
+        opts = {"thin_dir": "/tmp/thin"}
+        single = MagicMock()
+        state._send_trans_tar(
+            single, "/tmp/local.tgz", "/tmp/thin/salt_state.tgz", opts
+        )
+        single.shell.exec_cmd.assert_not_called()
+        single.shell.send.assert_called_once_with(
+            "/tmp/local.tgz", "/tmp/thin/salt_state.tgz"
+        )
@@ -1,3 +1,4 @@
+import copy
 import os
 from subprocess import PIPE
 from textwrap import dedent
@@ -214,10 +215,10 @@ class GPGTestCase(TestCase, LoaderModuleMockMixin, AdaptedConfigurationTestCaseM
             !@#$%^&*()_+
             -----END PGP MESSAGE-----
             -----BEGIN PGP MESSAGE-----
-            !@#$%^&*()_+
+            !@#$%^&*()_-
             -----END PGP MESSAGE-----
             -----BEGIN PGP MESSAGE-----
-            !@#$%^&*()_+
+            !@#$%^&*()_=
             -----END PGP MESSAGE-----
         """
         )
@@ -313,3 +314,34 @@ class GPGTestCase(TestCase, LoaderModuleMockMixin, AdaptedConfigurationTestCaseM
                                     )
                                 ]
                             )
+
+    def test_render_decrypts_once(self):
+        key_dir = "/etc/salt/gpgkeys"
+        crypted = {
+            "first": "-----BEGIN PGP MESSAGE-----\nfirst\n-----END PGP MESSAGE-----",
+            "second": [
+                "-----BEGIN PGP MESSAGE-----\nsecond\n-----END PGP MESSAGE-----",
+                "-----BEGIN PGP MESSAGE-----\nfirst\n-----END PGP MESSAGE-----",
+            ],
+        }
+
+        def popen(*args, **kwargs):
+            return Mock(
+                communicate=lambda input: (input.split(b"\n")[1].upper(), None,)
+            )
+
+        for workers in (1, 4):
+            with patch.dict(gpg.__opts__, {"gpg_decrypt_workers": workers}), patch(
+                "salt.renderers.gpg.Popen", MagicMock(side_effect=popen)
+            ) as popen_mock, patch(
+                "salt.renderers.gpg._get_gpg_exec",
+                MagicMock(return_value="/usr/bin/gpg"),
+            ), patch(
+                "salt.renderers.gpg._get_key_dir", MagicMock(return_value=key_dir)
+            ):
+                self.assertEqual(
+                    gpg.render(copy.deepcopy(crypted)),
+                    {"first": "FIRST", "second": ["SECOND", "FIRST"]},
+                )
+                # The same ciphertext is only decrypted once
+                self.assertEqual(popen_mock.call_count, 2)
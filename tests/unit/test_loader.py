@@ -13,9 +13,12 @@ import inspect
 import logging
 import os
 import shutil
+import subprocess
 import sys
 import tempfile
 import textwrap
+import threading
+import time
 
 import pytest
 import salt.config
@@ -1679,6 +1682,221 @@ class LoaderLoadCachedGrainsTest(TestCase):
         assert isinstance(osrelease_info, tuple), osrelease_info
 
 
+class LoaderGrainsFuncTTLTest(TestCase):
+    """
+    Test the caching of the results of grains functions with a TTL
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.opts = {
+            "cachedir": self.cache_dir,
+            "grains_func_ttl": {"core.slow": 3600, "custom.*": 3600},
+        }
+        self.calls = collections.Counter()
+
+        def slow():
+            self.calls["slow"] += 1
+            return {"slow": self.calls["slow"]}
+
+        def fast():
+            self.calls["fast"] += 1
+            return {"fast": self.calls["fast"] // 2}
+
+        def dep(grains):
+            self.calls["dep"] += 1
+            return {"dep": grains["fast"]}
+
+        self.funcs = {"core.slow": slow, "core.fast": fast, "custom.dep": dep}
+
+    def tearDown(self):
+        del self.opts
+        del self.calls
+        del self.funcs
+
+    def _grains(self, **kwargs):
+        with patch("salt.loader.grain_funcs", MagicMock(return_value=self.funcs)):
+            return salt.loader.grains(self.opts, **kwargs)
+
+    def test_grains_func_ttl(self):
+        grains = self._grains()
+        self.assertEqual(grains, {"slow": 1, "fast": 0, "dep": 0})
+        self.assertEqual(self.calls, {"slow": 1, "fast": 1, "dep": 1})
+
+        # The grains passed to dep changed
+        grains = self._grains()
+        self.assertEqual(grains, {"slow": 1, "fast": 1, "dep": 1})
+        self.assertEqual(self.calls, {"slow": 1, "fast": 2, "dep": 2})
+
+        # The grains passed to dep did not change
+        grains = self._grains()
+        self.assertEqual(grains, {"slow": 1, "fast": 1, "dep": 1})
+        self.assertEqual(self.calls, {"slow": 1, "fast": 3, "dep": 2})
+
+        grains = self._grains(refresh_funcs=["core.slow"])
+        self.assertEqual(grains, {"slow": 2, "fast": 2, "dep": 2})
+        self.assertEqual(self.calls, {"slow": 2, "fast": 4, "dep": 3})
+
+        # The TTLs expired
+        with patch("time.time", MagicMock(return_value=time.time() + 3600)):
+            self._grains()
+        self.assertEqual(self.calls, {"slow": 3, "fast": 5, "dep": 4})
+
+        timings = salt.loader.grains_func_timings(self.opts)
+        self.assertEqual(sorted(timings), ["core.fast", "core.slow", "custom.dep"])
+        self.assertEqual(timings["core.slow"]["ttl"], 3600)
+        self.assertEqual(timings["core.fast"]["ttl"], 0)
+
+    def test_grains_func_ttl_tuples(self):
+        def slow():
+            self.calls["slow"] += 1
+            return {"osrelease_info": (10, 1)}
+
+        self.funcs["core.slow"] = slow
+        self._grains()
+        grains = self._grains()
+        self.assertEqual(self.calls["slow"], 1)
+        self.assertEqual(grains["osrelease_info"], (10, 1))
+
+    def test_grains_func_ttl_unset(self):
+        del self.opts["grains_func_ttl"]
+        self._grains()
+        self._grains()
+        self.assertEqual(self.calls, {"slow": 2, "fast": 2, "dep": 2})
+        # The timings are recorded without any TTL
+        timings = salt.loader.grains_func_timings(self.opts)
+        self.assertEqual(sorted(timings), ["core.fast", "core.slow", "custom.dep"])
+        self.assertEqual(timings["core.slow"]["ttl"], 0)
+
+    def test_expire_grains_funcs(self):
+        self._grains()
+        salt.loader.expire_grains_funcs(self.opts, ["core.slow"])
+        self.assertEqual(self.calls["slow"], 1)
+        self.assertIn("core.slow", salt.loader.grains_func_timings(self.opts))
+        grains = self._grains()
+        self.assertEqual(grains["slow"], 2)
+        self.assertEqual(self.calls["slow"], 2)
+
+
+class LoaderParallelGrainsTest(TestCase):
+    """
+    Test gathering grains with grains functions run in parallel
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.opts = {"cachedir": self.cache_dir}
+
+        def sleep(seconds, ret):
+            def func():
+                time.sleep(seconds)
+                return ret
+
+            return func
+
+        def dep(grains):
+            return {"dep": sorted(grains)}
+
+        self.funcs = collections.OrderedDict(
+            [
+                ("core.a", sleep(0.2, {"a": 1, "shared": "a"})),
+                ("core.b", sleep(0, {"b": 1, "shared": "b"})),
+                ("custom.c", sleep(0.2, {"c": 1, "shared": "c"})),
+                ("custom.dep", dep),
+                ("custom.d", sleep(0, {"d": 1, "shared": "d"})),
+            ]
+        )
+
+    def tearDown(self):
+        del self.opts
+        del self.funcs
+
+    def _grains(self):
+        with patch("salt.loader.grain_funcs", MagicMock(return_value=self.funcs)):
+            return salt.loader.grains(self.opts)
+
+    def test_parallel_grains_match_sequential(self):
+        expected = self._grains()
+        self.assertEqual(expected["shared"], "d")
+        self.assertEqual(expected["dep"], ["a", "b", "c", "shared"])
+
+        self.opts["grains_parallel_workers"] = 4
+        self.assertEqual(self._grains(), expected)
+
+    def test_parallel_grains_proxy(self):
+        def proxy_func(proxy):
+            return {"proxy_thread": threading.current_thread().name}
+
+        self.funcs["custom.proxy"] = proxy_func
+        self.opts["grains_parallel_workers"] = 4
+        grains = self._grains()
+        self.assertEqual(grains["proxy_thread"], threading.current_thread().name)
+
+    def test_parallel_grains_timeout(self):
+        self.opts["grains_parallel_workers"] = 4
+        self.opts["grains_func_timeout"] = 0.05
+        grains = self._grains()
+        self.assertNotIn("a", grains)
+        self.assertNotIn("c", grains)
+        self.assertEqual(grains["dep"], ["b", "shared"])
+
+    def test_parallel_grains_hung(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        threads = []
+
+        def hung():
+            threads.append(threading.current_thread())
+            release.wait()
+            return {"hung": True}
+
+        self.funcs["custom.hung"] = hung
+        self.opts["grains_parallel_workers"] = 4
+        self.opts["grains_func_timeout"] = 0.3
+        self.opts["grains_func_ttl"] = {"custom.*": 3600}
+        grains = self._grains()
+        self.assertNotIn("hung", grains)
+        self.assertEqual(grains["c"], 1)
+        # The thread stuck in the grains function does not keep the process
+        # from exiting
+        self.assertTrue(threads[0].daemon)
+
+        # The result of the function once it returns is not recorded
+        release.set()
+        threads[0].join(10)
+        timings = salt.loader.grains_func_timings(self.opts)
+        self.assertIn("custom.c", timings)
+        self.assertNotIn("custom.hung", timings)
+
+    def test_parallel_grains_hung_exit(self):
+        script = textwrap.dedent(
+            """
+            import threading
+            import salt.loader
+            from unittest.mock import MagicMock, patch
+
+            funcs = {{"custom.hung": lambda: threading.Event().wait()}}
+            opts = {{
+                "cachedir": {!r},
+                "grains_parallel_workers": 2,
+                "grains_func_timeout": 0.1,
+            }}
+            with patch("salt.loader.grain_funcs", MagicMock(return_value=funcs)):
+                print(salt.loader.grains(opts))
+            """
+        ).format(self.cache_dir)
+        proc = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=RUNTIME_VARS.CODE_DIR,
+            stdout=subprocess.PIPE,
+            timeout=120,
+            check=True,
+        )
+        self.assertEqual(proc.stdout.strip(), b"{}")
+
+
 class LazyLoaderRefreshFileMappingTest(TestCase):
     """
     Test that _refresh_file_mapping is called using acquiring LazyLoader._lock
@@ -273,10 +273,13 @@ class MinionTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
         ), patch(
             "salt.utils.process.SignalHandlingProcess.join",
             MagicMock(return_value=True),
+        ), patch(
+            "salt.utils.process.SignalHandlingProcess.is_alive",
+            MagicMock(return_value=True),
         ), patch(
             "salt.utils.minion.running", MagicMock(return_value=[])
         ), patch(
-            "salt.ext.tornado.gen.sleep",
+            "salt.ext.tornado.locks.Condition.wait",
             MagicMock(return_value=salt.ext.tornado.concurrent.Future()),
         ):
             process_count_max = 10
@@ -289,15 +292,15 @@ class MinionTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
             minion = salt.minion.Minion(mock_opts, jid_queue=[], io_loop=io_loop)
             try:
 
-                # mock gen.sleep to throw a special Exception when called, so that we detect it
+                # mock the wait for a finished job to throw a special Exception when called, so that we detect it
                 class SleepCalledException(Exception):
                     """Thrown when sleep is called"""
 
-                salt.ext.tornado.gen.sleep.return_value.set_exception(
+                salt.ext.tornado.locks.Condition.wait.return_value.set_exception(
                     SleepCalledException()
                 )
 
-                # up until process_count_max: gen.sleep does not get called, processes are started normally
+                # up until process_count_max: the minion does not wait, processes are started normally
                 for i in range(process_count_max):
                     mock_data = {"fun": "foo.bar", "jid": i}
                     io_loop.run_sync(
@@ -307,9 +310,12 @@ class MinionTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
                         salt.utils.process.SignalHandlingProcess.start.call_count, i + 1
                     )
                     self.assertEqual(len(minion.jid_queue), i + 1)
-                    salt.utils.minion.running.return_value += [i]
+                    self.assertEqual(len(minion.running_jobs), i + 1)
+
+                # the proc dir is only scanned at startup
+                salt.utils.minion.running.assert_called_once_with(minion.opts)
 
-                # above process_count_max: gen.sleep does get called, JIDs are created but no new processes are started
+                # above process_count_max: the minion waits, JIDs are created but no new processes are started
                 mock_data = {"fun": "foo.bar", "jid": process_count_max + 1}
 
                 self.assertRaises(
@@ -323,8 +329,82 @@ class MinionTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
                     process_count_max,
                 )
                 self.assertEqual(len(minion.jid_queue), process_count_max + 1)
+
+                # a finished job frees its slot
+                salt.utils.process.SignalHandlingProcess.is_alive.return_value = False
+                self.assertEqual(minion._running_job_count(), 0)
+                self.assertEqual(minion.running_jobs, {})
+            finally:
+                minion.destroy()
+
+    def test_process_count_max_running_jobs(self):
+        """
+        Tests that jobs which outlived the previous minion process and
+        scheduled jobs count towards process_count_max, and that the io_loop
+        stops watching finished jobs.
+        """
+        with patch("salt.minion.Minion.ctx", MagicMock(return_value={})), patch(
+            "salt.utils.minion.running",
+            MagicMock(return_value=[{"jid": "1", "pid": 1234}]),
+        ), patch("salt.utils.process.os_is_running", MagicMock(return_value=True)):
+            mock_opts = salt.config.DEFAULT_MINION_OPTS.copy()
+            mock_opts["process_count_max"] = 10
+            io_loop = MagicMock()
+            minion = salt.minion.Minion(mock_opts, jid_queue=[], io_loop=io_loop)
+            try:
+                minion.schedule = MagicMock()
+                minion.schedule.running_job_count.return_value = 2
+                process = MagicMock(sentinel=42)
+                process.is_alive.return_value = True
+                minion._track_job("2", process)
+                io_loop.add_handler.assert_called_once()
+                self.assertEqual(minion._running_job_count(), 4)
+
+                process.is_alive.return_value = False
+                salt.utils.process.os_is_running.return_value = False
+                self.assertEqual(minion._running_job_count(), 2)
+                self.assertEqual(minion.running_jobs, {})
+                io_loop.remove_handler.assert_called_once_with(42)
+            finally:
+                minion.schedule = None
+                minion.destroy()
+
+    @pytest.mark.slow_test
+    def test_job_worker_pool(self):
+        """
+        Tests that jobs are handed to the job worker pool when it is enabled
+        and that its size is capped by process_count_max.
+        """
+        dispatch = salt.ext.tornado.concurrent.Future()
+        dispatch.set_result(None)
+        pool = MagicMock()
+        pool.dispatch.return_value = dispatch
+        with patch("salt.minion.Minion.ctx", MagicMock(return_value={})), patch(
+            "salt.utils.process.SignalHandlingProcess.start",
+            MagicMock(return_value=True),
+        ), patch(
+            "salt.utils.minion.JobWorkerPool", MagicMock(return_value=pool)
+        ), patch(
+            "salt.utils.platform.is_windows", MagicMock(return_value=False)
+        ):
+            mock_opts = salt.config.DEFAULT_MINION_OPTS.copy()
+            mock_opts["__role"] = "minion"
+            mock_opts["job_worker_pool_size"] = 8
+            mock_opts["process_count_max"] = 4
+
+            io_loop = salt.ext.tornado.ioloop.IOLoop()
+            minion = salt.minion.Minion(mock_opts, jid_queue=[], io_loop=io_loop)
+            try:
+                mock_data = {"fun": "foo.bar", "jid": 123}
+                io_loop.run_sync(lambda: minion._handle_decoded_payload(mock_data))
+                self.assertEqual(salt.utils.minion.JobWorkerPool.call_args[0][4], 4)
+                pool.dispatch.assert_called_once_with(mock_data, False)
+                self.assertEqual(
+                    salt.utils.process.SignalHandlingProcess.start.call_count, 0
+                )
             finally:
                 minion.destroy()
+            pool.stop.assert_called_once_with()
 
     @pytest.mark.slow_test
     def test_beacons_before_connect(self):
@@ -12,6 +12,7 @@ import os
 import shutil
 import tempfile
 import textwrap
+import threading
 
 import salt.config
 import salt.exceptions
@@ -376,6 +377,211 @@ class PillarTestCase(TestCase):
         finally:
             shutil.rmtree(tempdir, ignore_errors=True)
 
+    def test_ext_pillar_parallel(self):
+        """
+        test that ext_pillars run concurrently, except the serial ones, and
+        are merged in the configured order
+        """
+        opts = {
+            "optimization_order": [0, 1, 2],
+            "renderer": "yaml",
+            "renderer_blacklist": [],
+            "renderer_whitelist": [],
+            "state_top": "",
+            "pillar_roots": {"base": []},
+            "extension_modules": "",
+            "saltenv": "base",
+            "file_roots": {"base": []},
+            "ext_pillar": [
+                {"first": "one"},
+                {"second": "two"},
+                {"serial": "three"},
+                {"broken": "four"},
+            ],
+            "ext_pillar_parallel_workers": 4,
+            "ext_pillar_serial": ["serial"],
+        }
+        barrier = threading.Barrier(2, timeout=10)
+
+        def first(minion_id, pillar, arg):
+            # Only returns if second runs at the same time
+            barrier.wait()
+            return {"key": arg, "first": "seen" in pillar}
+
+        def second(minion_id, pillar, arg):
+            barrier.wait()
+            pillar["seen"] = True
+            return {"key": arg}
+
+        def serial(minion_id, pillar, arg):
+            return {"previous": pillar["key"]}
+
+        def broken(minion_id, pillar, arg):
+            raise Exception("broken")
+
+        ext_pillars = {
+            "first": first,
+            "second": second,
+            "serial": serial,
+            "broken": broken,
+        }
+        with patch("salt.loader.pillars", MagicMock(return_value=ext_pillars)):
+            pillar = salt.pillar.Pillar(opts, {}, "mocked-minion", "base")
+        ret, errors = pillar.ext_pillar({})
+        self.assertEqual(ret, {"key": "two", "first": False, "previous": "two"})
+        self.assertEqual(errors, ["Failed to load ext_pillar broken: broken"])
+        self.assertEqual(
+            sorted(name for name, _ in pillar.ext_pillar_timings),
+            ["broken", "first", "second", "serial"],
+        )
+
+    @with_tempdir()
+    def test_ext_pillar_cache(self, tempdir):
+        """
+        test that the cached ext_pillars are only run once their data expired
+        """
+        opts = {
+            "optimization_order": [0, 1, 2],
+            "renderer": "yaml",
+            "renderer_blacklist": [],
+            "renderer_whitelist": [],
+            "state_top": "",
+            "pillar_roots": {"base": []},
+            "extension_modules": "",
+            "saltenv": "base",
+            "file_roots": {"base": []},
+            "cachedir": tempdir,
+            "cache": "localfs",
+            "ext_pillar": [{"static": "one"}, {"shared": "two"}, {"volatile": "three"}],
+            "ext_pillar_cache": {
+                "static": {"ttl": 3600},
+                "shared": {"ttl": 3600, "key": "{grains[os]}"},
+            },
+        }
+        calls = []
+
+        def ext_pillar(name):
+            def func(minion_id, pillar, arg):
+                calls.append((name, minion_id))
+                return {name: minion_id}
+
+            return func
+
+        ext_pillars = {
+            name: ext_pillar(name) for name in ("static", "shared", "volatile")
+        }
+
+        def compile_ext_pillar(minion_id):
+            pillar = salt.pillar.Pillar(opts, {"os": "Ubuntu"}, minion_id, "base")
+            return pillar.ext_pillar({})
+
+        with patch("salt.loader.pillars", MagicMock(return_value=ext_pillars)):
+            self.assertEqual(
+                compile_ext_pillar("minion1"),
+                ({"static": "minion1", "shared": "minion1", "volatile": "minion1"}, []),
+            )
+            self.assertEqual(
+                compile_ext_pillar("minion1"),
+                ({"static": "minion1", "shared": "minion1", "volatile": "minion1"}, []),
+            )
+            # The shared data is cached for all the minions with the same os
+            self.assertEqual(
+                compile_ext_pillar("minion2"),
+                ({"static": "minion2", "shared": "minion1", "volatile": "minion2"}, []),
+            )
+            self.assertEqual(
+                calls,
+                [
+                    ("static", "minion1"),
+                    ("shared", "minion1"),
+                    ("volatile", "minion1"),
+                    ("volatile", "minion1"),
+                    ("static", "minion2"),
+                    ("volatile", "minion2"),
+                ],
+            )
+
+            # Expired data is fetched again
+            del calls[:]
+            opts["ext_pillar_cache"]["static"]["ttl"] = 0
+            compile_ext_pillar("minion1")
+            self.assertEqual(calls, [("static", "minion1"), ("volatile", "minion1")])
+
+        # The key can depend on the pillar data given to the ext_pillar
+        opts["ext_pillar_cache"]["static"]["key"] = "{pillar[role]}"
+        pillar = salt.pillar.Pillar(opts, {}, "minion1", "base")
+        web = pillar._ext_pillar_cache_key("static", "one", {"role": "web"})
+        db = pillar._ext_pillar_cache_key("static", "one", {"role": "db"})
+        self.assertNotEqual(web, db)
+        self.assertEqual(
+            web, pillar._ext_pillar_cache_key("static", "one", {"role": "web"})
+        )
+        self.assertIsNone(pillar._ext_pillar_cache_key("static", "one", {}))
+
+    @with_tempdir()
+    def test_profile_pillar(self, tempdir):
+        """
+        test that profile_pillar measures every SLS file and ext_pillar
+        """
+        opts = {
+            "optimization_order": [0, 1, 2],
+            "renderer": "yaml",
+            "renderer_blacklist": [],
+            "renderer_whitelist": [],
+            "state_top": "top.sls",
+            "pillar_roots": {"base": [tempdir]},
+            "extension_modules": "",
+            "saltenv": "base",
+            "file_roots": [],
+            "file_ignore_regex": None,
+            "file_ignore_glob": None,
+            "cachedir": tempdir,
+            "ext_pillar": [{"big": None}, {"broken": None}],
+        }
+        join = os.path.join
+        with fopen(join(tempdir, "top.sls"), "w") as f:
+            print("base:\n  '*':\n    - small\n    - large", file=f)
+        with fopen(join(tempdir, "small.sls"), "w") as f:
+            print("include:\n  - included\nsmall: 1", file=f)
+        with fopen(join(tempdir, "included.sls"), "w") as f:
+            print("included: 1", file=f)
+        with fopen(join(tempdir, "large.sls"), "w") as f:
+            print("large: {}".format(list(range(100))), file=f)
+
+        def broken(minion_id, pillar, arg):
+            raise Exception("broken")
+
+        ext_pillars = {
+            "big": lambda minion_id, pillar, arg: {"big": "x" * 1000},
+            "broken": broken,
+        }
+        with patch("salt.loader.pillars", MagicMock(return_value=ext_pillars)):
+            pillar = salt.pillar.Pillar(opts, {}, "minion", "base")
+            # Make sure that confirm_top.confirm_top returns True
+            pillar.matchers["confirm_top.confirm_top"] = lambda *x, **y: True
+            profile = pillar.profile_pillar()
+            self.assertEqual(sorted(profile), sorted(salt.pillar.PROFILE_KEYS))
+            self.assertEqual(
+                [item["sls"] for item in profile["sls"]],
+                ["large", "small", "included"],
+            )
+            for item in profile["sls"]:
+                self.assertGreater(item["size"], 0)
+                self.assertGreaterEqual(item["render_time"], 0)
+                self.assertGreaterEqual(item["merge_time"], 0)
+            self.assertEqual(profile["ext_pillar"][0]["name"], "big")
+            self.assertGreater(profile["ext_pillar"][0]["size"], 1000)
+            self.assertEqual(
+                profile["ext_pillar"][1], {"name": "broken", "error": "broken"}
+            )
+            self.assertGreater(profile["size"], profile["ext_pillar"][0]["size"])
+            self.assertEqual(
+                profile["errors"], ["Failed to load ext_pillar broken: broken"]
+            )
+            # Profiling leaves the pillar compiler as it was
+            self.assertIsNone(pillar._profile)
+            self.assertIn("big", pillar.compile_pillar())
+
     def test_dynamic_pillarenv(self):
         opts = {
             "optimization_order": [0, 1, 2],
@@ -1087,6 +1293,150 @@ sub_with_slashes:
             "simple_include.missing_include" in compiled_pillar["_errors"][0]
         )
 
+    @with_tempdir()
+    def test_render_cache(self, tempdir):
+        opts = {
+            "optimization_order": [0, 1, 2],
+            "renderer": "jinja|yaml",
+            "renderer_blacklist": [],
+            "renderer_whitelist": [],
+            "state_top": "top.sls",
+            "pillar_roots": {"base": [tempdir]},
+            "extension_modules": "",
+            "saltenv": "base",
+            "file_roots": [],
+            "file_ignore_regex": None,
+            "file_ignore_glob": None,
+            "cachedir": tempdir,
+            "pillar_render_cache": True,
+        }
+        join = os.path.join
+        with fopen(join(tempdir, "top.sls"), "w") as f:
+            print("base:\n  '*':\n    - common\n    - minion", file=f)
+        with fopen(join(tempdir, "common.sls"), "w") as f:
+            print(
+                textwrap.dedent(
+                    """
+                    {% from "map.jinja" import port %}
+                    os: {{ grains['os'] }}
+                    port: {{ port }}
+                    {% if grains.get('virtual') %}
+                    virtual: True
+                    {% endif %}
+                    """
+                ),
+                file=f,
+            )
+        with fopen(join(tempdir, "minion.sls"), "w") as f:
+            print("id: {{ grains['id'] }}", file=f)
+        with fopen(join(tempdir, "map.jinja"), "w") as f:
+            print("{% set port = 80 %}", file=f)
+
+        def compile_pillar(minion_id, os_):
+            grains = {"id": minion_id, "os": os_}
+            pillar = salt.pillar.Pillar(opts, grains, minion_id, "base")
+            # Make sure that confirm_top.confirm_top returns True
+            pillar.matchers["confirm_top.confirm_top"] = lambda *x, **y: True
+            return pillar.compile_pillar()
+
+        with patch.object(salt.pillar, "RENDER_CACHE", None):
+            self.assertEqual(
+                compile_pillar("minion1", "Ubuntu"),
+                {"os": "Ubuntu", "port": 80, "id": "minion1"},
+            )
+            cache = salt.pillar.RENDER_CACHE
+            self.assertEqual(cache.stats()["misses"], 3)
+
+            # The top file and common.sls are reused, minion.sls read the
+            # minion ID
+            self.assertEqual(
+                compile_pillar("minion2", "Ubuntu"),
+                {"os": "Ubuntu", "port": 80, "id": "minion2"},
+            )
+            self.assertEqual(cache.stats()["hits"], 2)
+            self.assertEqual(
+                compile_pillar("minion3", "CentOS"),
+                {"os": "CentOS", "port": 80, "id": "minion3"},
+            )
+            self.assertEqual(cache.stats()["hits"], 3)
+
+            # A change to an imported template is picked up
+            with fopen(join(tempdir, "map.jinja"), "w") as f:
+                print("{% set port = 8080 %}", file=f)
+            os.utime(join(tempdir, "map.jinja"), (0, 0))
+            self.assertEqual(
+                compile_pillar("minion4", "Ubuntu"),
+                {"os": "Ubuntu", "port": 8080, "id": "minion4"},
+            )
+            self.assertEqual(
+                cache.stats(reset=True),
+                {"hits": 4, "misses": 8, "uncacheable": 0, "renders": 8},
+            )
+
+    @with_tempdir()
+    def test_render_cache_top(self, tempdir):
+        opts = {
+            "optimization_order": [0, 1, 2],
+            "renderer": "jinja|yaml",
+            "renderer_blacklist": [],
+            "renderer_whitelist": [],
+            "state_top": "top.sls",
+            "pillar_roots": {"base": [tempdir]},
+            "extension_modules": "",
+            "saltenv": "base",
+            "file_roots": [],
+            "file_ignore_regex": None,
+            "file_ignore_glob": None,
+            "cachedir": tempdir,
+            "pillar_render_cache": True,
+        }
+        join = os.path.join
+        with fopen(join(tempdir, "top.sls"), "w") as f:
+            print(
+                textwrap.dedent(
+                    """
+                    base:
+                      '*':
+                        - {{ grains['os'] }}
+                    """
+                ),
+                file=f,
+            )
+        for os_ in ("Ubuntu", "CentOS"):
+            with fopen(join(tempdir, "{}.sls".format(os_)), "w") as f:
+                print("family: {}".format(os_), file=f)
+
+        def get_top(minion_id, os_):
+            grains = {"id": minion_id, "os": os_}
+            pillar = salt.pillar.Pillar(opts, grains, minion_id, "base")
+            top, errors = pillar.get_top()
+            self.assertEqual(errors, [])
+            return top
+
+        with patch.object(salt.pillar, "RENDER_CACHE", None):
+            self.assertEqual(get_top("minion1", "Ubuntu"), {"base": {"*": ["Ubuntu"]}})
+            cache = salt.pillar.RENDER_CACHE
+            # The top file only read the os grain, so it is shared by every
+            # minion with the same os
+            self.assertEqual(get_top("minion2", "Ubuntu"), {"base": {"*": ["Ubuntu"]}})
+            self.assertEqual(get_top("minion3", "CentOS"), {"base": {"*": ["CentOS"]}})
+            self.assertEqual(get_top("minion4", "CentOS"), {"base": {"*": ["CentOS"]}})
+            self.assertEqual(
+                cache.stats(reset=True),
+                {"hits": 2, "misses": 2, "uncacheable": 0, "renders": 2},
+            )
+
+            # The renders are keyed on the content of the top file, a change
+            # keeping its size and mtime is picked up
+            stat = os.stat(join(tempdir, "top.sls"))
+            with fopen(join(tempdir, "top.sls"), "w") as f:
+                print("base:\n  '*':\n    - CentOS", file=f)
+            with fopen(join(tempdir, "top.sls"), "a") as f:
+                f.write(" " * (stat.st_size - os.path.getsize(f.name)))
+            os.utime(join(tempdir, "top.sls"), (stat.st_atime, stat.st_mtime))
+            self.assertEqual(os.path.getsize(join(tempdir, "top.sls")), stat.st_size)
+            self.assertEqual(get_top("minion5", "Ubuntu"), {"base": {"*": ["CentOS"]}})
+
 
 @patch("salt.transport.client.ReqChannel.factory", MagicMock())
 class RemotePillarTestCase(TestCase):
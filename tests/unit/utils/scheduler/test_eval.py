@@ -262,6 +262,45 @@ class SchedulerEvalTest(SchedulerTestsBase):
         ret = self.schedule.job_status(job_name)
         self.assertEqual(ret["_last_run"], run_time)
 
+    @skipIf(not HAS_CRONITER, "Cannot find croniter python module")
+    def test_eval_cron_skipped_until_due(self):
+        """
+        verify that a cron job is not parsed again before its next fire time
+        unless it is modified
+        """
+        job_name = "test_eval_cron_skipped_until_due"
+        job = {
+            "schedule": {job_name: {"function": "test.ping", "cron": "0 16 29 11 *"}}
+        }
+
+        # Add the job to the scheduler
+        self.schedule.opts.update(job)
+
+        start = dateutil.parser.parse("11/29/2017 3:00pm")
+        run_time = dateutil.parser.parse("11/29/2017 4:00pm")
+        self.schedule.eval(now=start)
+        self.assertEqual(self.schedule._deferred[job_name][0], run_time)
+
+        # The job is not looked at until it is due, eval() would have
+        # cleared _skip_reason otherwise
+        self.schedule.opts["schedule"][job_name]["_skip_reason"] = "untouched"
+        for minute in range(1, 60):
+            self.schedule.eval(now=start + datetime.timedelta(minutes=minute))
+        ret = self.schedule.job_status(job_name)
+        self.assertEqual(ret["_skip_reason"], "untouched")
+
+        # A modified job is evaluated again
+        self.schedule.disable_job(job_name, persist=False)
+        self.schedule.eval(now=run_time - datetime.timedelta(seconds=30))
+        ret = self.schedule.job_status(job_name)
+        self.assertEqual(ret["_skip_reason"], "disabled")
+
+        self.schedule.enable_job(job_name, persist=False)
+        self.schedule.eval(now=run_time)
+
+        ret = self.schedule.job_status(job_name)
+        self.assertEqual(ret["_last_run"], run_time)
+
     @skipIf(not HAS_CRONITER, "Cannot find croniter python module")
     def test_eval_cron_loop_interval(self):
         """
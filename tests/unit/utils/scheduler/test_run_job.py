@@ -3,7 +3,9 @@
 from __future__ import absolute_import
 
 import logging
+import time
 
+from tests.support.mock import MagicMock, patch
 from tests.unit.utils.scheduler.base import SchedulerTestsBase
 
 log = logging.getLogger(__name__)
@@ -32,3 +34,75 @@ class SchedulerRunJobTest(SchedulerTestsBase):
         ret = self.schedule.job_status(job_name)
         expected = {"function": "test.ping", "run": True, "name": "test_run_job"}
         self.assertEqual(ret, expected)
+
+    def test_run_job_thread(self):
+        """
+        verify that a job with run_mode thread is queued on the thread pool
+        and that maxrunning counts the queued runs
+        """
+        job_name = "test_run_job_thread"
+        job = {
+            "schedule": {
+                job_name: {
+                    "function": "test.ping",
+                    "run_mode": "thread",
+                    "maxrunning": 1,
+                }
+            }
+        }
+        self.schedule.opts.update(job)
+
+        pool = MagicMock()
+        pool.fire_async.return_value = True
+        with patch(
+            "salt.utils.process.ThreadPool", MagicMock(return_value=pool)
+        ), patch("salt.utils.process.SignalHandlingProcess.start") as start:
+            self.schedule.run_job(job_name)
+            self.schedule.run_job(job_name)
+        start.assert_not_called()
+        self.assertEqual(pool.fire_async.call_count, 1)
+        ret = self.schedule.job_status(job_name)
+        self.assertEqual(ret["_skip_reason"], "maxrunning")
+
+        target = pool.fire_async.call_args[0][0]
+        args = pool.fire_async.call_args[1]["args"]
+        with patch.object(self.schedule, "handle_func") as handle_func:
+            target(*args)
+        handle_func.assert_called_once_with(False, "test.ping", args[1], None)
+        self.assertEqual(self.schedule._thread_jobs[job_name], 0)
+        self.assertIn("_lag", ret)
+
+    def test_run_job_thread_timeout(self):
+        """
+        verify that a job which waited longer than its timeout for a thread
+        does not run
+        """
+        job_name = "test_run_job_thread_timeout"
+        data = {
+            "function": "test.ping",
+            "run_mode": "thread",
+            "timeout": 5,
+            "name": job_name,
+        }
+        self.schedule._thread_jobs[job_name] = 1
+        with patch.object(self.schedule, "handle_func") as handle_func:
+            self.schedule._thread_job("test.ping", data, None, time.time() - 10)
+        handle_func.assert_not_called()
+        self.assertGreaterEqual(data["_lag"], 10)
+        self.assertEqual(self.schedule._thread_jobs[job_name], 0)
+
+    def test_run_job_thread_master(self):
+        """
+        verify that a job with run_mode thread gets a process on the master
+        """
+        job_name = "test_run_job_thread_master"
+        job = {"schedule": {job_name: {"function": "test.ping", "run_mode": "thread"}}}
+        self.schedule.opts.update(job)
+        self.schedule.opts["__role"] = "master"
+
+        with patch("salt.utils.process.ThreadPool") as pool, patch(
+            "salt.utils.process.SignalHandlingProcess.start"
+        ) as start, patch.object(self.schedule._subprocess_list, "add"):
+            self.schedule.run_job(job_name)
+        pool.assert_not_called()
+        start.assert_called_once_with()
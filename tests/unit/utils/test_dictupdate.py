@@ -201,6 +201,50 @@ class UtilDictMergeTestCase(TestCase):
             {"A": [["B"], ["b", "c"]], "C": {"D": "E", "F": {"I": "J", "G": "H"}}}, ret
         )
 
+    def test_merge_shared(self):
+        """
+        Test that a shared merge gives the same result as a copying one,
+        without modifying the merged dicts
+        """
+        obj_a = OrderedDict(
+            [
+                ("A", "B"),
+                ("C", {"D": "E", "F": {"G": "H", "I": ["J"]}}),
+                ("K", {"L": "M"}),
+                ("N", ["O"]),
+            ]
+        )
+        updates = [
+            {"C": {"F": {"I": ["j", "J"], "P": "Q"}}, "N": ["o"]},
+            {"A": {"R": "S"}, "C": "T"},
+            {"K": {"L": {"U": "V"}}, "W": "X"},
+            {},
+        ]
+        for strategy in ("smart", "recurse", "overwrite", "none", "aggregate"):
+            for merge_lists in (False, True):
+                for obj_b in updates:
+                    before_a = copy.deepcopy(obj_a)
+                    before_b = copy.deepcopy(obj_b)
+                    expected = dictupdate.merge(
+                        copy.deepcopy(obj_a),
+                        copy.deepcopy(obj_b),
+                        strategy,
+                        merge_lists=merge_lists,
+                    )
+                    ret = dictupdate.merge(
+                        obj_a, obj_b, strategy, merge_lists=merge_lists, shared=True
+                    )
+                    self.assertEqual(ret, expected)
+                    self.assertEqual(type(ret), type(expected))
+                    self.assertEqual(obj_a, before_a)
+                    self.assertEqual(obj_b, before_b)
+
+        # What did not change is not copied
+        ret = dictupdate.merge(obj_a, {"C": {"D": "e"}}, shared=True)
+        self.assertIs(ret["K"], obj_a["K"])
+        self.assertIs(ret["C"]["F"], obj_a["C"]["F"])
+        self.assertIsNot(ret["C"], obj_a["C"])
+
 
 class UtilDeepDictUpdateTestCase(TestCase):
 
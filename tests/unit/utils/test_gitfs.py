@@ -108,6 +108,23 @@ class TestGitBase(TestCase, AdaptedConfigurationTestCaseMixin):
         self.assertTrue(self.main_class.remotes[0].fetched)
         self.assertFalse(self.main_class.remotes[1].fetched)
 
+    def test_update_concurrent(self):
+        with patch.dict(self.main_class.opts, {"gitfs_fetch_workers": 2}):
+            self.main_class.update()
+        self.assertTrue(self.main_class.remotes[0].fetched)
+        self.assertTrue(self.main_class.remotes[1].fetched)
+
+    def test_fetch_durations(self):
+        self.main_class.update("repo2")
+        durations = self.main_class.read_fetch_durations()
+        self.assertEqual(list(durations), ["file://repo2.git"])
+        self.assertIn("duration", durations["file://repo2.git"])
+        self.assertIn("timestamp", durations["file://repo2.git"])
+        # Durations from earlier fetches of other remotes are preserved
+        self.main_class.update([("file://repo1.git", None)])
+        durations = self.main_class.read_fetch_durations()
+        self.assertEqual(sorted(durations), ["file://repo1.git", "file://repo2.git"])
+
 
 class TestGitFSProvider(TestCase):
     def setUp(self):
@@ -319,3 +336,100 @@ class TestPygit2(TestCase):
         self.assertIn(provider.cachedir, provider.checkout())
         provider.branch = "does_not_exist"
         self.assertIsNone(provider.checkout())
+
+    def test_tree_index(self):
+        remote = os.path.join(tests.support.paths.TMP, "pygit2-repo")
+        cache = os.path.join(tests.support.paths.TMP, "pygit2-repo-cache")
+        self._prepare_remote_repository(remote)
+        provider = self._prepare_cache_repository(remote, cache)
+        provider.remotecallbacks = None
+        provider.credentials = None
+        provider.init_remote()
+        provider.fetch()
+        files, symlinks = provider.file_list("base")
+        self.assertEqual(files, {"README"})
+        self.assertEqual(symlinks, {})
+        self.assertEqual(provider.dir_list("base"), set())
+        blob, blob_hexsha, _ = provider.find_file("README", "base")
+        self.assertEqual(blob.hex, blob_hexsha)
+        self.assertEqual(provider.find_file("MISSING", "base"), (None, None, None))
+        # The index was persisted, so a fresh provider does not need to
+        # traverse the tree again.
+        self.assertEqual(len(os.listdir(provider.indexdir)), 1)
+        provider._tree_indexes = {}
+        with patch.object(
+            provider, "build_tree_index", MagicMock(side_effect=AssertionError)
+        ):
+            self.assertEqual(provider.file_list("base")[0], {"README"})
+
+    def _prepare_nested_repository(self, path):
+        """
+        Create a repository whose states live below srv/salt, with symlinks
+        """
+        shutil.rmtree(path, ignore_errors=True)
+        signature = pygit2.Signature(
+            "Dummy Commiter", "dummy@dummy.com", int(time()), 0
+        )
+        repository = pygit2.init_repository(path, False)
+
+        sub = repository.TreeBuilder()
+        sub.insert(
+            "init.sls", repository.create_blob(b"include: []"), pygit2.GIT_FILEMODE_BLOB
+        )
+        states = repository.TreeBuilder()
+        states.insert(
+            "top.sls", repository.create_blob(b"base: {}"), pygit2.GIT_FILEMODE_BLOB
+        )
+        states.insert("sub", sub.write(), pygit2.GIT_FILEMODE_TREE)
+        states.insert(
+            "link.sls",
+            repository.create_blob(b"sub/init.sls"),
+            pygit2.GIT_FILEMODE_LINK,
+        )
+        states.insert(
+            "chain.sls", repository.create_blob(b"link.sls"), pygit2.GIT_FILEMODE_LINK
+        )
+        srv = repository.TreeBuilder()
+        srv.insert("salt", states.write(), pygit2.GIT_FILEMODE_TREE)
+        tree = repository.TreeBuilder()
+        tree.insert("srv", srv.write(), pygit2.GIT_FILEMODE_TREE)
+        tree.insert(
+            "README", repository.create_blob(b"README"), pygit2.GIT_FILEMODE_BLOB
+        )
+        repository.create_commit(
+            "HEAD", signature, signature, "Nested states", tree.write(), []
+        )
+
+    def test_tree_index_root_mountpoint(self):
+        remote = os.path.join(tests.support.paths.TMP, "pygit2-nested-repo")
+        cache = os.path.join(tests.support.paths.TMP, "pygit2-nested-repo-cache")
+        self._prepare_nested_repository(remote)
+        provider = self._prepare_cache_repository(remote, cache)
+        provider.remotecallbacks = None
+        provider.credentials = None
+        provider.init_remote()
+        provider.fetch()
+        provider._root = "srv/salt"
+        provider._mountpoint = "mnt"
+
+        files, symlinks = provider.file_list("base")
+        self.assertEqual(
+            files, {"mnt/top.sls", "mnt/sub/init.sls", "mnt/link.sls", "mnt/chain.sls"},
+        )
+        self.assertEqual(
+            symlinks, {"mnt/link.sls": "sub/init.sls", "mnt/chain.sls": "link.sls"}
+        )
+        self.assertEqual(provider.dir_list("base"), {"mnt", "mnt/sub"})
+
+        # Symlinks are followed, through more than one level
+        for path in ("srv/salt/chain.sls", "srv/salt/link.sls"):
+            blob, blob_hexsha, _ = provider.find_file(path, "base")
+            self.assertEqual(blob.data, b"include: []")
+            self.assertEqual(blob.hex, blob_hexsha)
+        # Directories are not files
+        self.assertEqual(provider.find_file("srv/salt/sub", "base"), (None, None, None))
+
+        # A root which is not in the tree gives empty results
+        provider._root = "srv/missing"
+        self.assertEqual(provider.file_list("base"), (set(), {}))
+        self.assertEqual(provider.dir_list("base"), set())
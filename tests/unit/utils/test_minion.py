@@ -1,13 +1,19 @@
 # Import python libs
 
 import logging
+import os
+import shutil
+import tempfile
 
 # Import Salt Libs
+import salt.ext.tornado.ioloop
+import salt.utils.files
 import salt.utils.minion
+import salt.utils.platform
 from tests.support.mock import MagicMock, mock_open, patch
 
 # Import Salt Testing Libs
-from tests.support.unit import TestCase
+from tests.support.unit import TestCase, skipIf
 
 log = logging.getLogger(__name__)
 
@@ -16,6 +22,23 @@ class FakeThreadingClass:
     name = "thread-name"
 
 
+class FakeMinion:
+    def __init__(self, proc_dir):
+        self.proc_dir = proc_dir
+
+    def gen_modules(self):
+        pass
+
+
+def _record_pid(minion_instance, opts, data, connected):
+    with salt.utils.files.fopen(
+        os.path.join(minion_instance.proc_dir, data["jid"]), "w"
+    ) as fp_:
+        fp_.write(str(os.getpid()))
+    with salt.utils.files.fopen(os.path.join(opts["outdir"], data["jid"]), "w") as fp_:
+        fp_.write(str(os.getpid()))
+
+
 class MinionUtilTestCase(TestCase):
     """
     TestCase for salt.utils.minion
@@ -170,3 +193,68 @@ class MinionUtilTestCase(TestCase):
                                 "/var/cache/salt/minion/proc/20200310230030623022", opts
                             )
                             self.assertEqual(data, None)
+
+
+@skipIf(salt.utils.platform.is_windows(), "Job worker pools are not used on Windows")
+class JobWorkerPoolTestCase(TestCase):
+    """
+    TestCase for salt.utils.minion.JobWorkerPool
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.proc_dir = os.path.join(self.tmpdir, "proc")
+        os.makedirs(self.proc_dir)
+        self.io_loop = salt.ext.tornado.ioloop.IOLoop()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.addCleanup(self.io_loop.close)
+
+    def _run_jobs(self, pool, jids):
+        for jid in jids:
+            self.io_loop.run_sync(lambda jid=jid: pool.dispatch({"jid": jid}, True))
+        # Wait for the last jobs to finish by claiming every worker
+        for _ in range(pool.size):
+            self.io_loop.run_sync(lambda: pool._semaphore.acquire(), timeout=30)
+        for _ in range(pool.size):
+            pool._semaphore.release()
+        pids = {}
+        for jid in jids:
+            with salt.utils.files.fopen(os.path.join(self.tmpdir, jid)) as fp_:
+                pids[jid] = int(fp_.read())
+        return pids
+
+    def test_workers_are_reused_and_recycled(self):
+        """
+        test that a worker runs several jobs and is replaced after max_jobs
+        jobs or after the pool was recycled
+        """
+        pool = salt.utils.minion.JobWorkerPool(
+            {"outdir": self.tmpdir},
+            _record_pid,
+            FakeMinion(self.proc_dir),
+            self.io_loop,
+            1,
+            max_jobs=2,
+        )
+        retired = []
+        add = pool._retired.add
+        pool._retired.add = lambda process: retired.append(process) or add(process)
+        try:
+            pids = self._run_jobs(pool, ["1", "2", "3"])
+            self.assertEqual(pids["1"], pids["2"])
+            self.assertNotEqual(pids["2"], pids["3"])
+            self.assertNotEqual(pids["3"], os.getpid())
+            # The proc files of finished jobs are removed by the worker
+            self.assertEqual(os.listdir(self.proc_dir), [])
+
+            pool.recycle()
+            pids.update(self._run_jobs(pool, ["4"]))
+            self.assertNotEqual(pids["3"], pids["4"])
+        finally:
+            workers = [worker.process for worker in pool._idle]
+            pool.stop()
+        # Replaced and stopped workers have all been joined
+        self.assertEqual(len(retired), 2)
+        for process in retired + workers:
+            self.assertIsNotNone(process.exitcode)
+        self.assertEqual(pool._retired.processes, [])
@@ -9,6 +9,7 @@ import sys
 from collections import OrderedDict
 from pathlib import PurePath, PurePosixPath
 
+import jinja2.sandbox
 import pytest
 import salt.utils.files
 import salt.utils.templates
@@ -83,6 +84,115 @@ class RenderTestCase(TestCase):
 
         assert res == expected
 
+    @with_tempdir()
+    def test_render_jinja_bytecode_cache(self, tempdir):
+        ctx = dict(self.context, opts={"cachedir": tempdir, "__cli": "salt"})
+        tmplpath = os.path.join(tempdir, "init.sls")
+        res = salt.utils.templates.render_jinja_tmpl(
+            "{{ var }}", dict(ctx, var="OK"), tmplpath
+        )
+        self.assertEqual(res, "OK")
+        self.assertEqual(len(os.listdir(os.path.join(tempdir, "jinja"))), 1)
+
+        # The environment is reused, with its globals reset, and the
+        # template is not compiled again
+        for jinja_env in salt.utils.templates._JINJA_ENVS.envs.values():
+            jinja_env.globals["leak"] = True
+        with patch.object(
+            jinja2.sandbox.SandboxedEnvironment,
+            "compile",
+            autospec=True,
+            side_effect=jinja2.sandbox.SandboxedEnvironment.compile,
+        ) as compile_mock:
+            res = salt.utils.templates.render_jinja_tmpl(
+                "{{ var }}", dict(ctx, var="OK"), tmplpath
+            )
+            self.assertEqual(res, "OK")
+            compile_mock.assert_not_called()
+
+            res = salt.utils.templates.render_jinja_tmpl(
+                "{{ leak is defined }}", dict(ctx), tmplpath
+            )
+            self.assertEqual(res, "False")
+            self.assertEqual(compile_mock.call_count, 1)
+
+    @with_tempdir()
+    def test_render_jinja_bytecode_cache_settings(self, tempdir):
+        """
+        The templates compiled with other environment settings are not reused
+        """
+        tmpl = "{% if True %}\nA\n{% endif %}\nB"
+        tmplpath = os.path.join(tempdir, "init.sls")
+        for trim_blocks, expected in (
+            (False, "\nA\n\nB"),
+            (True, "A\nB"),
+            (False, "\nA\n\nB"),
+        ):
+            opts = {
+                "cachedir": tempdir,
+                "__cli": "salt",
+                "jinja_trim_blocks": trim_blocks,
+            }
+            # Only use the cachedir, like a new process
+            getattr(salt.utils.templates._JINJA_ENVS, "envs", {}).clear()
+            res = salt.utils.templates.render_jinja_tmpl(
+                tmpl, dict(self.context, opts=opts), tmplpath
+            )
+            self.assertEqual(res, expected)
+        self.assertEqual(len(os.listdir(os.path.join(tempdir, "jinja"))), 2)
+
+    def test_render_jinja_nested(self):
+        def nested():
+            return salt.utils.templates.render_jinja_tmpl(
+                "{{ var }}", dict(self.context, var="inner")
+            )
+
+        ctx = dict(self.context, var="outer", nested=nested)
+        res = salt.utils.templates.render_jinja_tmpl(
+            "{{ nested() }} {{ var }} {{ nested() }}", ctx
+        )
+        self.assertEqual(res, "inner outer inner")
+
+    @with_tempdir()
+    def test_render_jinja_bytecode_cache_disabled(self, tempdir):
+        opts = {"cachedir": tempdir, "__cli": "salt", "jinja_bytecode_cache": False}
+        ctx = dict(self.context, opts=opts, var="OK")
+        tmplpath = os.path.join(tempdir, "init.sls")
+        res = salt.utils.templates.render_jinja_tmpl("{{ var }}", ctx, tmplpath)
+        self.assertEqual(res, "OK")
+        self.assertFalse(os.path.exists(os.path.join(tempdir, "jinja")))
+
+    def test_render_jinja_inputs(self):
+        inputs = salt.utils.templates.TemplateInputs()
+        ctx = dict(
+            self.context,
+            grains={"os": "Ubuntu", "id": "minion"},
+            _render_inputs=inputs,
+        )
+        res = salt.utils.templates.render_jinja_tmpl(
+            "{{ grains.os }} {{ grains.get('virtual', 'physical') }}", ctx
+        )
+        self.assertEqual(res, "Ubuntu physical")
+        self.assertTrue(inputs.reusable)
+        self.assertTrue(inputs.matches({"grains": {"os": "Ubuntu", "id": "other"}}))
+        self.assertFalse(inputs.matches({"grains": {"os": "CentOS"}}))
+        self.assertFalse(inputs.matches({"grains": {"os": "Ubuntu", "virtual": "kvm"}}))
+
+        # Reading the whole grains or calling salt functions
+        inputs = salt.utils.templates.TemplateInputs()
+        ctx["_render_inputs"] = inputs
+        salt.utils.templates.render_jinja_tmpl("{{ grains | length }}", ctx)
+        self.assertTrue(inputs.reusable)
+        self.assertFalse(inputs.matches({"grains": {"os": "Ubuntu"}}))
+
+        inputs = salt.utils.templates.TemplateInputs()
+        ctx.update(_render_inputs=inputs, salt={"test.echo": lambda x: x})
+        res = salt.utils.templates.render_jinja_tmpl(
+            "{{ salt['test.echo']('OK') }}", ctx
+        )
+        self.assertEqual(res, "OK")
+        self.assertFalse(inputs.reusable)
+
     ### Tests for mako template
     def test_render_mako_sanity(self):
         tmpl = """OK"""
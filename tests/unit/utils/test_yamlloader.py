@@ -2,12 +2,18 @@
     Unit tests for salt.utils.yamlloader.SaltYamlSafeLoader
 """
 
+import glob
+import os
 import textwrap
+from collections import OrderedDict
 
 import salt.utils.files
+import salt.utils.yamlloader
+import yaml
 from salt.utils.yamlloader import SaltYamlSafeLoader
 from tests.support.mock import mock_open, patch
-from tests.support.unit import TestCase
+from tests.support.runtests import RUNTIME_VARS
+from tests.support.unit import TestCase, skipIf
 from yaml.constructor import ConstructorError
 
 
@@ -133,3 +139,52 @@ class YamlLoaderTestCase(TestCase):
             ),
             {"foo": {"b": {"foo": "bar", "one": 1, "list": [1, "two", 3]}}},
         )
+
+    @staticmethod
+    def load_both(data, dictclass=dict):
+        """
+        Return what the libyaml and the pure Python loaders make of the YAML
+        string, or the type of the error they raised
+        """
+        results = []
+        for loader in (
+            SaltYamlSafeLoader,
+            salt.utils.yamlloader.SaltYamlPureSafeLoader,
+        ):
+            try:
+                results.append(loader(data, dictclass=dictclass).get_single_data())
+            except yaml.YAMLError as exc:
+                results.append(type(exc))
+        return results
+
+    @skipIf(not salt.utils.yamlloader.HAS_LIBYAML, "libyaml is not available")
+    def test_yaml_libyaml_conformance(self):
+        """
+        Test that the libyaml loader builds the same data as the pure Python
+        one, for the YAML and SLS files of the test suite and for the
+        constructs salt handles itself
+        """
+        self.assertTrue(
+            issubclass(SaltYamlSafeLoader, yaml.CSafeLoader),
+            "SaltYamlSafeLoader does not use libyaml",
+        )
+        documents = [
+            "mode: 0644\nzero: 0000\nhex: 0x1f\noctal: 0o17",
+            "date: 2021-01-01\ntime: 2021-01-01 12:00:00",
+            "text: !!python/unicode caf\u00e9\nstr: !!str 1",
+            "ordered: !!omap\n  - b: 1\n  - a: 2",
+            "p1: alpha\np1: beta",
+            "p1: &p1\n  v1: alpha\np2:\n  <<: *p1\n  v1: beta",
+            "p1: [unterminated",
+        ]
+        for pattern in ("*.sls", "*.yml", "*.yaml"):
+            for path in glob.glob(
+                os.path.join(RUNTIME_VARS.TESTS_DIR, "**", pattern), recursive=True
+            ):
+                with salt.utils.files.fopen(path, "rb") as fp_:
+                    documents.append(fp_.read().decode("utf-8", "replace"))
+        for document in documents:
+            for dictclass in (dict, OrderedDict):
+                c_result, py_result = self.load_both(document, dictclass)
+                self.assertEqual(c_result, py_result, document)
+                self.assertEqual(type(c_result), type(py_result), document)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Compare how fast the YAML loaders of salt parse a generated SLS document,
+with libyaml and in pure Python. The plain PyYAML safe loaders are measured
+too, to show what the salt constructor adds.
+
+.. code-block:: bash
+
+    python tests/yamlbench.py -s 1000 -s 10000
+"""
+
+import optparse
+import time
+from collections import OrderedDict
+
+import salt.utils.yamlloader
+import yaml
+
+
+def parse():
+    """
+    Parse the command line options
+    """
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "-s",
+        "--states",
+        dest="states",
+        default=[],
+        type="int",
+        action="append",
+        help="The number of states in the SLS document, can be repeated",
+    )
+    parser.add_option(
+        "-r",
+        "--rounds",
+        dest="rounds",
+        default=3,
+        type="int",
+        help="Parse each document this many times and keep the fastest",
+    )
+    options, _ = parser.parse_args()
+    if not options.states:
+        options.states = [1000, 5000]
+    return options
+
+
+def document(states):
+    """
+    Return an SLS document with ``states`` states
+    """
+    return "\n".join(
+        (
+            "state_{0}:\n"
+            "  file.managed:\n"
+            "    - name: /etc/file{0}\n"
+            "    - mode: 0644\n"
+            "    - contents: 'line {0}'\n"
+            "    - require:\n"
+            "      - pkg: pkg{0}\n"
+        ).format(idx)
+        for idx in range(states)
+    )
+
+
+def loaders():
+    """
+    Return the name and the loader factory of every measured loader
+    """
+    ret = [
+        (
+            "salt pure",
+            lambda stream: salt.utils.yamlloader.SaltYamlPureSafeLoader(
+                stream, dictclass=OrderedDict
+            ),
+        ),
+        ("pyyaml pure", yaml.loader.SafeLoader),
+    ]
+    if salt.utils.yamlloader.HAS_LIBYAML:
+        ret[:0] = [
+            (
+                "salt libyaml",
+                lambda stream: salt.utils.yamlloader.SaltYamlSafeLoader(
+                    stream, dictclass=OrderedDict
+                ),
+            ),
+            ("pyyaml libyaml", yaml.CSafeLoader),
+        ]
+    return ret
+
+
+def measure(data, loader, rounds):
+    """
+    Return the fastest time it took ``loader`` to parse ``data``
+    """
+    best = None
+    for _ in range(rounds):
+        start = time.time()
+        yaml.load(data, Loader=loader)
+        took = time.time() - start
+        if best is None or took < best:
+            best = took
+    return best
+
+
+def main():
+    options = parse()
+    print("{:>8} {:>16} {:>10}".format("states", "loader", "seconds"))
+    for states in options.states:
+        data = document(states)
+        for name, loader in loaders():
+            print(
+                "{:>8} {:>16} {:>10.3f}".format(
+                    states, name, measure(data, loader, options.rounds)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()